@@ -1,12 +1,215 @@
 # Hcricket.py
 # Hand Cricket GUI (Tkinter) with Series support and right-side match results panel
 import random
+import time
+from array import array
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
 
+import hcricket_journal
+import hcricket_solver
+import hcricket_winprob
+
+# format -> (max balls per innings, or None for unlimited; max wickets)
+FORMATS = {
+    'T20': (12, 1),
+    'ODI': (30, 3),
+    'TEST': (None, 10),
+}
+
+# ---------- Ball-by-ball record ----------
+class BallRecord:
+    # one row per ball kept in typed arrays; the log text is only built when a row is displayed
+    WICKET = -1
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.innings = array('B')
+        self.computer_batting = array('B')  # 0 = player batting, 1 = computer batting
+        self.ball = array('I')
+        self.player_pick = array('B')
+        self.computer_pick = array('B')
+        self.outcome = array('b')   # runs scored off the ball, or WICKET
+        self.runs = array('I')      # score after the ball
+        self.wickets = array('B')
+
+    def __len__(self):
+        return len(self.ball)
+
+    def add(self, innings, computer_batting, ball, player_pick, computer_pick, outcome, runs, wickets):
+        self.innings.append(innings)
+        self.computer_batting.append(computer_batting)
+        self.ball.append(ball)
+        self.player_pick.append(player_pick)
+        self.computer_pick.append(computer_pick)
+        self.outcome.append(outcome)
+        self.runs.append(runs)
+        self.wickets.append(wickets)
+
+    def text(self, i):
+        p = self.player_pick[i]; c = self.computer_pick[i]
+        score = f"{self.runs[i]}/{self.wickets[i]}"
+        if self.computer_batting[i]:
+            text = f"Ball {self.ball[i]}: Computer {c} vs Player {p}"
+        else:
+            text = f"Ball {self.ball[i]}: Player {p} vs Computer {c}"
+        if self.outcome[i] == self.WICKET:
+            return text + f" -> WICKET! ({score})"
+        batter = 'Computer' if self.computer_batting[i] else 'Player'
+        return text + f" -> {batter} scored {self.outcome[i]}. Score: {score}"
+
+# ---------- Innings analytics ----------
+class InningsAnalytics:
+    # Running numbers for one innings, each updated in O(1) per ball. A wicket is the only
+    # scoreless ball in this game, so the dot-ball streak is also a run of wickets in a row;
+    # `wicketless` counts the other way, balls since the last wicket fell.
+    def __init__(self):
+        self.runs = 0
+        self.balls = 0
+        self.wickets = 0
+        self.over_runs = array('I')     # runs in each over; the last one may still be going
+        self.over_wickets = array('B')
+        self.dot_streak = 0
+        self.best_dot_streak = 0
+        self.wicketless = 0
+        self.best_wicketless = 0
+        self.partnership = 0            # runs since the last wicket
+
+    def add(self, scored, wicket):
+        if self.balls % 6 == 0:
+            self.over_runs.append(0)
+            self.over_wickets.append(0)
+        self.balls += 1
+        self.runs += scored
+        self.over_runs[-1] += scored
+        if wicket:
+            self.wickets += 1
+            self.over_wickets[-1] += 1
+            self.wicketless = 0
+            self.partnership = 0
+        else:
+            self.wicketless += 1
+            self.partnership += scored
+            if self.wicketless > self.best_wicketless:
+                self.best_wicketless = self.wicketless
+        if scored == 0:
+            self.dot_streak += 1
+            if self.dot_streak > self.best_dot_streak:
+                self.best_dot_streak = self.dot_streak
+        else:
+            self.dot_streak = 0
+
+    def run_rate(self):
+        # runs per over
+        return self.runs * 6 / self.balls if self.balls else 0.0
+
+# ---------- Computer opponents ----------
+# An opponent picks the number for one side of the match. pick(game) is called before each
+# ball; observe(batting, other_pick) afterwards with whether the opponent was batting and
+# what the other side played. `side` is 'computer' normally, but an opponent can also play
+# the player's side (AI vs AI).
+class RandomOpponent:
+    def __init__(self, side='computer'):
+        self.side = side
+
+    def pick(self, game):
+        return random.randint(1,6)
+
+    def observe(self, batting, other_pick):
+        pass
+
+class AdaptiveOpponent:
+    # Learns how the other side picks, separately for when they bat and when they bowl:
+    # counts of each pick after their previous pick (bigram) plus plain pick counts.
+    # Rows are halved once they fill up, so memory and per-ball work stay constant and
+    # recent habits weigh more.
+    CAP = 60            # halve a row of counts once its total reaches this
+    EXPLORE = 0.1       # chance of a plain random pick, so it can't be read in turn
+    WICKET_RUNS = 6     # what losing a wicket is worth in runs when choosing a number to bat
+    MIN_SEEN = 4        # play randomly in a role until this many of their picks have been seen
+
+    def __init__(self, side='computer'):
+        self.side = side
+        # rows[role][context] -> counts of picks 1-6; role 0 = other side batting, 1 = bowling;
+        # context 0 = all picks in that role, 1-6 = picks right after that number
+        self.rows = [[[0] * 6 for _ in range(7)] for _ in range(2)]
+        self.prev = [0, 0]
+
+    def predict(self, role):
+        # estimated chance of each pick 1-6 from the other side in this role
+        rows = self.rows[role]
+        uni = rows[0]
+        prior = 2.0 / (sum(uni) + 6)
+        ctx = self.prev[role]
+        if ctx:
+            big = rows[ctx]
+            probs = [big[n] + (uni[n] + 1) * prior for n in range(6)]
+        else:
+            probs = [(uni[n] + 1) * prior for n in range(6)]
+        total = sum(probs)
+        return [p / total for p in probs]
+
+    def pick(self, game):
+        batting = game.current_batting == self.side
+        role = 1 if batting else 0
+        if random.random() < self.EXPLORE or sum(self.rows[role][0]) < self.MIN_SEEN:
+            return random.randint(1,6)
+        probs = self.predict(role)
+        if batting:
+            # most expected runs, counting a wicket as WICKET_RUNS lost
+            scores = [(n + 1) * (1 - p) - self.WICKET_RUNS * p for n, p in enumerate(probs)]
+        else:
+            # bowl the number they are most likely to play
+            scores = probs
+        best = max(scores)
+        return random.choice([n + 1 for n, v in enumerate(scores) if v == best])
+
+    def observe(self, batting, other_pick):
+        role = 1 if batting else 0
+        rows = self.rows[role]
+        n = other_pick - 1
+        ctx = self.prev[role]
+        for row in ((rows[0], rows[ctx]) if ctx else (rows[0],)):
+            row[n] += 1
+            if sum(row) >= self.CAP:
+                for i in range(6):
+                    row[i] //= 2
+        self.prev[role] = other_pick
+
+class ExpertOpponent:
+    # Plays the equilibrium mix from hcricket_solver for the exact match state, so no way of
+    # picking numbers beats it on average. The first match of a format solves the policy (well
+    # under a second) and caches it on disk; later ones just load it.
+    def __init__(self, side='computer'):
+        self.side = side
+
+    def pick(self, game):
+        policy = hcricket_solver.policy(game.max_balls, game.max_wickets)
+        wickets_left = game.max_wickets - game.wickets
+        balls_left = None if game.max_balls is None else game.max_balls - game.balls
+        if game.innings == 1:
+            row = policy.first(game.runs, wickets_left, balls_left)
+        else:
+            row = policy.chase(game.target - game.runs, wickets_left, balls_left)
+        weights = policy.batter(row) if game.current_batting == self.side else policy.bowler(row)
+        return random.choices(range(1, 7), weights)[0]
+
+    def observe(self, batting, other_pick):
+        pass
+
+OPPONENTS = {
+    'random': RandomOpponent,
+    'adaptive': AdaptiveOpponent,
+    'expert': ExpertOpponent,
+}
+
 # ---------- Game logic (single match) ----------
 class HandCricketGame:
     def __init__(self):
+        # optional hcricket_journal.MatchJournal; every state change is written through it
+        self.journal = None
         self.reset_all()
 
     def reset_all(self):
@@ -21,13 +224,18 @@ class HandCricketGame:
         self.batting_first = None
         self.innings = 1  # 1 or 2
         self.current_batting = None  # 'player' or 'computer'
+        self.opponent = RandomOpponent()
 
         # innings counters (for current innings)
         self.runs = 0
         self.wickets = 0
         self.balls = 0
         self.target = None
-        self.logs = []
+        # per-ball history plus the few text notes (toss, innings changes) kept as
+        # (number of balls recorded so far, text) so they can be merged back in order
+        self.record = BallRecord()
+        self.notes = []
+        self.analytics = [InningsAnalytics(), InningsAnalytics()]
 
         # stored innings results for the match (filled when innings end)
         self.first_innings = None
@@ -36,19 +244,28 @@ class HandCricketGame:
     def set_format(self, fmt):
         fmt = fmt.upper()
         self.format = fmt
-        if fmt == 'T20':
-            self.max_balls = 12
-            self.max_wickets = 1
-        elif fmt == 'ODI':
-            self.max_balls = 30
-            self.max_wickets = 3
-        else:
-            # TEST
-            self.max_balls = None
-            self.max_wickets = 10
+        # anything other than T20/ODI plays as TEST
+        self.max_balls, self.max_wickets = FORMATS.get(fmt, FORMATS['TEST'])
+
+    def set_opponent(self, kind):
+        # 'random', 'adaptive' or 'expert'; picks how the computer chooses its numbers this match
+        if kind not in OPPONENTS:
+            raise ValueError(f"Unknown opponent {kind!r}")
+        self.opponent = OPPONENTS[kind]()
 
     def append_log(self, text):
-        self.logs.append(text)
+        self.notes.append((len(self.record), text))
+
+    def log_lines(self):
+        # full match log in order, formatted on demand
+        n = 0
+        for pos, text in self.notes:
+            while n < pos:
+                yield self.record.text(n)
+                n += 1
+            yield text
+        for i in range(n, len(self.record)):
+            yield self.record.text(i)
 
     def do_toss(self, call):
         coin = random.choice(['heads', 'tails'])
@@ -57,14 +274,25 @@ class HandCricketGame:
         if call.lower() == coin:
             self.toss_winner = 'player'
             self.append_log(f"Toss: coin={coin} -> Player won toss")
+            if self.journal is not None:
+                self.journal.write(hcricket_journal.TOSS)
             return {'coin': coin, 'toss_winner': 'player'}
         else:
             self.toss_winner = 'computer'
             comp_pick = random.choice(['bat','bowl'])
             self._comp_pick = comp_pick
             self.append_log(f"Toss: coin={coin} -> Computer won toss and chose {comp_pick}")
+            if self.journal is not None:
+                self.journal.write(hcricket_journal.TOSS)
             return {'coin': coin, 'toss_winner': 'computer', 'computer_choice': comp_pick}
 
+    def auto_toss(self):
+        # random toss call and bat/bowl pick, for auto play and simulations
+        res = self.do_toss(random.choice(['heads', 'tails']))
+        if res['toss_winner'] == 'player':
+            return self.choose_bat_bowl(random.choice(['bat', 'bowl']))
+        return self.choose_bat_bowl(accept_computer=True)
+
     def choose_bat_bowl(self, choice=None, accept_computer=False):
         if self.toss_winner == 'player':
             if choice not in ('bat','bowl'):
@@ -79,12 +307,18 @@ class HandCricketGame:
         # start first innings
         self.innings = 1
         self.current_batting = self.batting_first
-        self.runs = 0; self.wickets = 0; self.balls = 0; self.logs = []
+        self.runs = 0; self.wickets = 0; self.balls = 0
+        self.record.clear(); self.notes = []
+        self.analytics = [InningsAnalytics(), InningsAnalytics()]
         self.first_innings = None; self.second_innings = None
         self.append_log(f"Innings start: {self.current_batting} batting first")
+        if self.journal is not None:
+            self.journal.write(hcricket_journal.CHOICE)
         return self.batting_first
 
-    def play_ball(self, player_num=None):
+    def play_ball(self, player_num=None, quiet=False):
+        # quiet=True skips building the event text (auto play, simulations); the ball is
+        # still recorded and can be shown later with self.record.text(i)
         if player_num is not None:
             if not isinstance(player_num, int) or not (1 <= player_num <= 6):
                 raise ValueError("player_num must be int 1-6 or None")
@@ -94,32 +328,26 @@ class HandCricketGame:
             raise RuntimeError("All wickets down; innings finished")
 
         is_player_batting = (self.current_batting == 'player')
-        comp_num = random.randint(1,6)
+        comp_num = self.opponent.pick(self)
         if player_num is None:
             player_num = random.randint(1,6)
 
         self.balls += 1
-        event = ''
         innings_over = False
 
-        if is_player_batting:
-            event = f"Ball {self.balls}: Player {player_num} vs Computer {comp_num}"
-            if player_num == comp_num:
-                self.wickets += 1
-                event += f" -> WICKET! ({self.runs}/{self.wickets})"
-            else:
-                self.runs += player_num
-                event += f" -> Player scored {player_num}. Score: {self.runs}/{self.wickets}"
+        if player_num == comp_num:
+            self.wickets += 1
+            outcome = BallRecord.WICKET
         else:
-            event = f"Ball {self.balls}: Computer {comp_num} vs Player {player_num}"
-            if comp_num == player_num:
-                self.wickets += 1
-                event += f" -> WICKET! ({self.runs}/{self.wickets})"
-            else:
-                self.runs += comp_num
-                event += f" -> Computer scored {comp_num}. Score: {self.runs}/{self.wickets}"
-
-        self.append_log(event)
+            outcome = player_num if is_player_batting else comp_num
+            self.runs += outcome
+        self.record.add(self.innings, not is_player_batting, self.balls, player_num, comp_num,
+                        outcome, self.runs, self.wickets)
+        self.analytics[self.innings - 1].add(max(0, outcome), outcome == BallRecord.WICKET)
+        self.opponent.observe(not is_player_batting, player_num)
+        event = None if quiet else self.record.text(-1)
+        if self.journal is not None:
+            self.journal.write(hcricket_journal.BALL, player_num, comp_num)
 
         # check end conditions
         if self.innings == 1:
@@ -140,10 +368,16 @@ class HandCricketGame:
             elif (self.max_balls is not None and self.balls >= self.max_balls) or self.wickets >= self.max_wickets:
                 self.second_innings = {'runs': self.runs, 'wickets': self.wickets, 'balls': self.balls}
                 innings_over = True
+        if innings_over and self.journal is not None:
+            self.journal.write(hcricket_journal.INNINGS_END)
 
         return {'event': event, 'runs': self.runs, 'wickets': self.wickets, 'balls': self.balls, 'innings_over': innings_over, 'target': self.target}
 
     def end_innings_early(self):
+        if self.current_batting is None:
+            raise RuntimeError("Match not started")
+        if self.first_innings and self.second_innings:
+            raise RuntimeError("Match is over")
         if self.innings == 1:
             self.first_innings = {'runs': self.runs, 'wickets': self.wickets, 'balls': self.balls}
             self.target = self.runs + 1
@@ -151,10 +385,14 @@ class HandCricketGame:
             self.current_batting = 'computer' if self.batting_first == 'player' else 'player'
             self.runs = 0; self.wickets = 0; self.balls = 0
             self.append_log('--- First innings ended early. Second innings start ---')
+            if self.journal is not None:
+                self.journal.write(hcricket_journal.END_EARLY)
             return {'switched': True, 'target': self.target}
         else:
             self.second_innings = {'runs': self.runs, 'wickets': self.wickets, 'balls': self.balls}
             self.append_log('--- Match ended early by user ---')
+            if self.journal is not None:
+                self.journal.write(hcricket_journal.END_EARLY)
             return {'match_over': True}
 
     def match_winner(self):
@@ -170,6 +408,33 @@ class HandCricketGame:
         else:
             return 'tie'
 
+    def required_rate(self):
+        # runs per over still needed in a limited-overs chase, else None
+        if self.innings != 2 or self.target is None or self.max_balls is None:
+            return None
+        balls_left = self.max_balls - self.balls
+        if balls_left <= 0:
+            return None
+        return max(0, self.target - self.runs) * 6 / balls_left
+
+    def win_probability(self):
+        # chances of 'player', 'computer' and 'tie' from the current state, assuming random
+        # picks from here on; None before the match has started
+        if self.first_innings and self.second_innings:
+            winner = self.match_winner()
+            return {side: (1.0 if side == winner else 0.0) for side in ('player', 'computer', 'tie')}
+        if self.current_batting is None:
+            return None
+        table = hcricket_winprob.table(self.max_balls, self.max_wickets)
+        wickets_left = self.max_wickets - self.wickets
+        balls_left = None if self.max_balls is None else self.max_balls - self.balls
+        if self.innings == 1:
+            bat, tie = table.first(self.runs, wickets_left, balls_left)
+        else:
+            bat, tie = table.chase(self.target - self.runs, wickets_left, balls_left)
+        other = 'computer' if self.current_batting == 'player' else 'player'
+        return {self.current_batting: bat, other: max(0.0, 1.0 - bat - tie), 'tie': tie}
+
     def compute_result_text(self):
         if not (self.first_innings and self.second_innings):
             return "Match incomplete"
@@ -196,7 +461,189 @@ class HandCricketGame:
             else:
                 return f"It's a tie! Both scored {f['runs']} runs."
 
+# ---------- Series logic (best of N matches) ----------
+class HandCricketSeries:
+    def __init__(self, total_games=1):
+        self.reset(total_games)
+
+    def reset(self, total_games=1):
+        self.total_games = total_games
+        self.played = 0
+        self.player_wins = 0
+        self.computer_wins = 0
+        self.player_runs = 0
+        self.computer_runs = 0
+        self.active = False
+
+    def start_match(self, total_games):
+        # called as each match starts; a fresh series (nothing played yet) zeroes the totals
+        if self.played == 0:
+            self.reset(total_games)
+        self.total_games = total_games
+        self.active = total_games > 1
+
+    def majority(self):
+        return (self.total_games // 2) + 1
+
+    def record_match(self, game):
+        # add a finished match to the totals; returns the match winner, runs and summary line
+        f = game.first_innings; s = game.second_innings
+        if not (f and s):
+            return None
+        winner = game.match_winner()  # 'player'/'computer'/'tie'
+        if game.batting_first == 'player':
+            player_runs = f['runs']; computer_runs = s['runs']
+        else:
+            computer_runs = f['runs']; player_runs = s['runs']
+
+        self.played += 1
+        self.player_runs += player_runs
+        self.computer_runs += computer_runs
+        if winner == 'player':
+            self.player_wins += 1
+            text = f"Match {self.played}: You won (You {player_runs} - Computer {computer_runs})"
+        elif winner == 'computer':
+            self.computer_wins += 1
+            text = f"Match {self.played}: Computer won (Computer {computer_runs} - You {player_runs})"
+        else:
+            text = f"Match {self.played}: Tie (You {player_runs} - Computer {computer_runs})"
+        return {'winner': winner, 'player_runs': player_runs, 'computer_runs': computer_runs, 'text': text}
+
+    def is_over(self):
+        # all matches played, or one side already has a majority of wins
+        majority = self.majority()
+        return (self.played >= self.total_games
+                or self.player_wins >= majority or self.computer_wins >= majority)
+
+    def decided_by_runs(self):
+        return self.is_over() and self.player_wins == self.computer_wins and self.player_runs != self.computer_runs
+
+    def winner(self):
+        # 'player', 'computer' or 'tie' once the series is over (level wins go to total runs)
+        if not self.is_over():
+            return None
+        if self.player_wins != self.computer_wins:
+            return 'player' if self.player_wins > self.computer_wins else 'computer'
+        if self.player_runs != self.computer_runs:
+            return 'player' if self.player_runs > self.computer_runs else 'computer'
+        return 'tie'
+
+    def progress_text(self):
+        return f"Series so far: You {self.player_wins} - Computer {self.computer_wins} (Runs: You {self.player_runs} - Comp {self.computer_runs})"
+
+    def result_text(self):
+        if self.player_wins > self.computer_wins:
+            return f"Series Over: You won the series {self.player_wins}-{self.computer_wins} (Total runs You {self.player_runs} - Comp {self.computer_runs})"
+        elif self.computer_wins > self.player_wins:
+            return f"Series Over: Computer won the series {self.computer_wins}-{self.player_wins} (Total runs Comp {self.computer_runs} - You {self.player_runs})"
+        # match-wins tied -> decide by runs
+        if self.player_runs > self.computer_runs:
+            return f"Series Over (by runs): You {self.player_runs} - Comp {self.computer_runs} -> You win the series"
+        elif self.computer_runs > self.player_runs:
+            return f"Series Over (by runs): Computer {self.computer_runs} - You {self.player_runs} -> Computer wins the series"
+        return f"Series Over: It's an exact tie! Both won {self.player_wins} matches and scored {self.player_runs} runs."
+
 # ---------- GUI with Series support ----------
+# fast-forward plays balls for FF_SLICE_MS at a time, then waits FF_FRAME_MS so the window can redraw
+FF_SLICE_MS = 30
+FF_FRAME_MS = 10
+
+class OverChart:
+    # Manhattan (runs per over, bars) and worm (cumulative runs, line) for both innings of the
+    # current match on one canvas. Items are only ever added: a bar per over (resized while its
+    # over is going), a worm segment per finished over. When the worm outgrows its band, all worm
+    # items are rescaled in one canvas call; when the overs outgrow the width, the canvas scrolls.
+    BAR_W = 10                  # pixels per over (both innings' bars side by side)
+    LEFT = 34
+    WORM_TOP, WORM_BASE = 10, 100
+    BARS_TOP, BARS_BASE = 112, 172
+    OVER_MAX = 36               # most runs an over can produce
+    COLORS = ('#4aa3ff', '#ff9f43')
+
+    def __init__(self, parent, width=560, height=180):
+        self.canvas = tk.Canvas(parent, width=width, height=height, background='#081526', highlightthickness=0)
+        self.width = width
+        self.analytics = (None, None)
+        self.clear()
+
+    def clear(self):
+        c = self.canvas
+        c.delete('all')
+        self.worm_max = 60.0            # runs at the top of the worm band
+        self.overs_done = [0, 0]        # finished overs drawn, per innings
+        self.bar = [None, None]         # bar item for the over in progress
+        self.worm_last = [(self.LEFT, self.WORM_BASE), (self.LEFT, self.WORM_BASE)]
+        self.worm_runs = [0, 0]
+        self.extent = self.width
+        c.configure(scrollregion=(0, 0, self.width, int(c.cget('height'))))
+        c.create_text(4, self.WORM_TOP, anchor='nw', fill='gray', text="Worm", tags='axis')
+        c.create_text(4, self.BARS_TOP, anchor='nw', fill='gray', text="Runs/over", tags='axis')
+        c.create_line(self.LEFT, self.WORM_BASE, 100000, self.WORM_BASE, fill='#33475b', tags='axis')
+        c.create_line(self.LEFT, self.BARS_BASE, 100000, self.BARS_BASE, fill='#33475b', tags='axis')
+        self.worm_lbl = c.create_text(self.LEFT + 2, self.WORM_TOP, anchor='nw', fill='gray', text="60")
+
+    def _worm_y(self, runs):
+        return self.WORM_BASE - (self.WORM_BASE - self.WORM_TOP) * runs / self.worm_max
+
+    def sync(self, game):
+        # draw whatever the game's analytics have added since the last call
+        if tuple(game.analytics) != self.analytics:
+            self.analytics = tuple(game.analytics)
+            self.clear()
+        c = self.canvas
+        for inn, a in enumerate(game.analytics):
+            overs = len(a.over_runs)
+            if not overs:
+                continue
+            closed = game.second_innings is not None or (inn == 0 and game.first_innings is not None)
+            while self.overs_done[inn] < overs:
+                i = self.overs_done[inn]
+                x0 = self.LEFT + i * self.BAR_W + inn * self.BAR_W // 2
+                h = (self.BARS_BASE - self.BARS_TOP) * a.over_runs[i] / self.OVER_MAX
+                if self.bar[inn] is None:
+                    self.bar[inn] = c.create_rectangle(x0, self.BARS_BASE - h, x0 + self.BAR_W // 2 - 1, self.BARS_BASE,
+                                                       fill=self.COLORS[inn], outline='', tags='bars')
+                else:
+                    c.coords(self.bar[inn], x0, self.BARS_BASE - h, x0 + self.BAR_W // 2 - 1, self.BARS_BASE)
+                if i == overs - 1 and a.balls % 6 and not closed:
+                    break
+                # over complete (or the innings closed during it): extend the worm, keep the bar
+                if a.over_wickets[i]:
+                    cx = x0 + self.BAR_W // 4
+                    c.create_oval(cx - 2, self.BARS_BASE - h - 6, cx + 2, self.BARS_BASE - h - 2,
+                                  fill='red', outline='', tags='bars')
+                total = self.worm_runs[inn] + a.over_runs[i]
+                self.worm_runs[inn] = total
+                self._grow_worm(total)
+                x = self.LEFT + (i + 1) * self.BAR_W
+                y = self._worm_y(total)
+                px, py = self.worm_last[inn]
+                c.create_line(px, py, x, y, fill=self.COLORS[inn], width=2, tags='worm')
+                self.worm_last[inn] = (x, y)
+                self.bar[inn] = None
+                self.overs_done[inn] += 1
+                self._grow_width(x)
+
+    def _grow_worm(self, runs):
+        if runs <= self.worm_max:
+            return
+        factor = 1.0
+        while runs > self.worm_max:
+            self.worm_max *= 2
+            factor /= 2
+        # squash every worm item towards the baseline at once
+        self.canvas.scale('worm', 0, self.WORM_BASE, 1, factor)
+        self.worm_last = [(x, self.WORM_BASE - (self.WORM_BASE - y) * factor) for x, y in self.worm_last]
+        self.canvas.itemconfigure(self.worm_lbl, text=f"{self.worm_max:.0f}")
+
+    def _grow_width(self, x):
+        if x + self.BAR_W <= self.extent:
+            return
+        self.extent += self.width // 2
+        c = self.canvas
+        c.configure(scrollregion=(0, 0, self.extent, int(c.cget('height'))))
+        c.xview_moveto(1.0)
+
 class HandCricketGUI:
     def __init__(self, root):
         self.root = root
@@ -204,17 +651,21 @@ class HandCricketGUI:
         self.game = HandCricketGame()
 
         # series state
-        self.series_total_games = 1
-        self.series_played = 0
-        self.series_player_wins = 0
-        self.series_computer_wins = 0
-        self.series_player_runs = 0
-        self.series_computer_runs = 0
-        self.series_active = False
+        self.series = HandCricketSeries()
 
         self.build_ui()
         self.refresh_ui()
 
+        # every toss, choice and ball goes to the journal so an unfinished match survives a restart
+        try:
+            self.journal = hcricket_journal.MatchJournal(opponents=OPPONENTS)
+        except (OSError, ValueError):
+            self.journal = None
+        else:
+            self.offer_resume()
+            self.journal.bind(self.game, self.series)
+            self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
     def build_ui(self):
         frm = ttk.Frame(self.root, padding=10)
         frm.grid(sticky="nsew")
@@ -262,6 +713,8 @@ class HandCricketGUI:
         self.balls_lbl.grid(row=0,column=1, padx=12)
         self.target_lbl = ttk.Label(mid, text="Target: -")
         self.target_lbl.grid(row=0,column=2, padx=12)
+        self.winprob_lbl = ttk.Label(mid, text="Win chance: -")
+        self.winprob_lbl.grid(row=0,column=3, padx=12)
 
         controls = ttk.Frame(mid)
         controls.grid(row=1, column=0, columnspan=3, sticky="w", pady=8)
@@ -274,6 +727,24 @@ class HandCricketGUI:
         self.auto_btn.grid(row=0,column=3, padx=6)
         self.end_btn = ttk.Button(controls, text="End Innings", command=self.end_innings)
         self.end_btn.grid(row=0,column=4, padx=6)
+        ttk.Label(controls, text="Computer:").grid(row=0,column=5, padx=(12,0))
+        self.opp_var = tk.StringVar(value="random")
+        ttk.Combobox(controls, textvariable=self.opp_var, values=list(OPPONENTS), state="readonly", width=9).grid(row=0,column=6, padx=6)
+
+        # fast-forward: auto play to the end of the over / innings / match / series
+        ttk.Label(controls, text="Fast-forward:").grid(row=1,column=0, sticky="w", pady=(6,0))
+        self.ff_btns = []
+        for col, (label, until) in enumerate((("Over", 'over'), ("Innings", 'innings'), ("Match", 'match'), ("Series", 'series')), start=1):
+            b = ttk.Button(controls, text=label, command=lambda u=until: self.fast_forward(u))
+            b.grid(row=1, column=col, padx=6, pady=(6,0))
+            self.ff_btns.append(b)
+        self.ff_until = None
+
+        # run rates and streaks, then the worm / Manhattan chart
+        self.stats_lbl = ttk.Label(mid, text="")
+        self.stats_lbl.grid(row=2, column=0, columnspan=4, sticky="w")
+        self.chart = OverChart(mid)
+        self.chart.canvas.grid(row=3, column=0, columnspan=4, sticky="w", pady=(4,0))
 
         # Log area and Series results area side-by-side
         logframe = ttk.Frame(frm)
@@ -335,6 +806,9 @@ class HandCricketGUI:
         except Exception as e:
             messagebox.showinfo("Error", str(e))
             return
+        self.show_toss_choice(res)
+
+    def show_toss_choice(self, res):
         if res['toss_winner'] == 'player':
             self.toss_info.config(text="You won the toss. Choose to bat or bowl.")
             for w in self.choose_frame.winfo_children(): w.destroy()
@@ -351,6 +825,7 @@ class HandCricketGUI:
 
     def start_match_player_choice(self):
         choice = self.pick_var.get()
+        self.apply_match_settings()
         try:
             batting_first = self.game.choose_bat_bowl(choice)
         except Exception as e:
@@ -362,6 +837,7 @@ class HandCricketGUI:
         self.refresh_ui()
 
     def start_match_accept_computer(self):
+        self.apply_match_settings()
         try:
             batting_first = self.game.choose_bat_bowl(accept_computer=True)
         except Exception as e:
@@ -372,17 +848,15 @@ class HandCricketGUI:
         self.after_match_reset_ui_for_play()
         self.refresh_ui()
 
+    def apply_match_settings(self):
+        # series and opponent settings are applied before the match starts, so they are
+        # already in place when the start of the match is written to the journal
+        self.series.start_match(int(self.series_var.get()))
+        self.apply_opponent()
+
     def after_match_reset_ui_for_play(self):
-        # when a match starts, make sure series settings are applied/initialized
-        self.series_total_games = int(self.series_var.get())
-        self.series_active = self.series_total_games > 1
-        # if starting a fresh series, zero counters
-        if self.series_played == 0:
-            self.series_player_wins = 0
-            self.series_computer_wins = 0
-            self.series_player_runs = 0
-            self.series_computer_runs = 0
-            # clear right-side results box
+        # if starting a fresh series, clear right-side results box
+        if self.series.played == 0:
             self.series_results_box.configure(state='normal')
             self.series_results_box.delete('1.0','end')
             self.series_results_box.configure(state='disabled')
@@ -390,12 +864,26 @@ class HandCricketGUI:
         for w in (self.play_btn, self.auto_btn, self.end_btn, self.num_entry):
             w.state(['!disabled'])
 
+    def apply_opponent(self):
+        # keep the same opponent (and what it has learned) across a series unless the choice changed
+        kind = self.opp_var.get()
+        if not isinstance(self.game.opponent, OPPONENTS[kind]):
+            self.game.set_opponent(kind)
+
     def append_log(self, text):
-        self.game.append_log(text)
+        # display only: the game keeps its own compact record of the match
         self.log_box.configure(state='normal')
         self.log_box.insert('1.0', text + "\n")
         self.log_box.configure(state='disabled')
 
+    def append_log_lines(self, lines):
+        # one insert for a whole batch of lines, newest on top like append_log
+        if not lines:
+            return
+        self.log_box.configure(state='normal')
+        self.log_box.insert('1.0', "\n".join(reversed(lines)) + "\n")
+        self.log_box.configure(state='disabled')
+
     def add_series_result(self, text):
         # append a single-line match result to the right-side box
         self.series_results_box.configure(state='normal')
@@ -408,6 +896,13 @@ class HandCricketGUI:
         balls_text = str(self.game.balls) + (f" / {self.game.max_balls}" if self.game.max_balls is not None else "")
         self.balls_lbl.config(text=f"Balls: {balls_text}")
         self.target_lbl.config(text=f"Target: {self.game.target if self.game.target is not None else '-'}")
+        wp = self.game.win_probability()
+        if wp is None:
+            self.winprob_lbl.config(text="Win chance: -")
+        else:
+            self.winprob_lbl.config(text=f"Win chance: You {wp['player']:.0%} | Comp {wp['computer']:.0%} | Tie {wp['tie']:.0%}")
+        self.stats_lbl.config(text=self.stats_text())
+        self.chart.sync(self.game)
         # controls enabled only after innings begun
         started = self.game.current_batting is not None
         if started:
@@ -425,6 +920,19 @@ class HandCricketGUI:
         else:
             self.result_lbl.config(text="")
 
+    def stats_text(self):
+        g = self.game
+        if g.current_batting is None:
+            return ""
+        a = g.analytics[g.innings - 1]
+        text = f"Run rate: {a.run_rate():.2f}"
+        rr = g.required_rate()
+        if rr is not None:
+            text += f" | Required: {rr:.2f}"
+        text += (f" | Partnership: {a.partnership} off {a.wicketless}"
+                 f" | Dot balls in a row: {a.dot_streak} (best {a.best_dot_streak})")
+        return text
+
     def play_ball_clicked(self):
         v = self.num_entry.get().strip()
         if not v or not v.isdigit() or not (1 <= int(v) <= 6):
@@ -432,11 +940,11 @@ class HandCricketGUI:
             return
         n = int(v)
         try:
-            out = self.game.play_ball(n)
+            out = self.game.play_ball(n, quiet=True)
         except Exception as e:
             messagebox.showinfo("Notice", str(e))
             return
-        self.append_log(out['event'])
+        self.append_log(self.game.record.text(-1))
         if out['innings_over']:
             self.append_log("Innings switched/ended.")
         self.refresh_ui()
@@ -446,11 +954,11 @@ class HandCricketGUI:
 
     def auto_ball(self):
         try:
-            out = self.game.play_ball(None)
+            out = self.game.play_ball(None, quiet=True)
         except Exception as e:
             messagebox.showinfo("Notice", str(e))
             return
-        self.append_log(out['event'])
+        self.append_log(self.game.record.text(-1))
         if out['innings_over']:
             self.append_log("Innings switched/ended.")
         self.refresh_ui()
@@ -460,7 +968,11 @@ class HandCricketGUI:
     def end_innings(self):
         ans = messagebox.askyesno("Confirm", "End this innings early?")
         if not ans: return
-        res = self.game.end_innings_early()
+        try:
+            res = self.game.end_innings_early()
+        except Exception as e:
+            messagebox.showinfo("Notice", str(e))
+            return
         if 'switched' in res:
             self.append_log("First innings ended by user.")
             self.append_log(f"Target is {self.game.target}")
@@ -472,39 +984,98 @@ class HandCricketGUI:
             if self.game.first_innings and self.game.second_innings:
                 self.on_match_end()
 
-    def on_match_end(self):
-        # compute match winner and update series totals
-        winner = self.game.match_winner()  # 'player'/'computer'/'tie'
-        f = self.game.first_innings; s = self.game.second_innings
-        if not (f and s):
-            return
-
-        if self.game.batting_first == 'player':
-            player_runs_match = f['runs']
-            computer_runs_match = s['runs']
+    def auto_start_match(self):
+        # start the match without asking: a toss already played is kept, otherwise it is auto-played
+        self.apply_match_settings()
+        if self.game.toss_winner is None:
+            self.game.auto_toss()
+        elif self.game.toss_winner == 'player':
+            self.game.choose_bat_bowl(self.pick_var.get())
         else:
-            computer_runs_match = f['runs']
-            player_runs_match = s['runs']
+            self.game.choose_bat_bowl(accept_computer=True)
+        for w in self.choose_frame.winfo_children(): w.destroy()
+        self.toss_info.config(text=f"Match started. {self.game.batting_first.capitalize()} batting first.")
+        self.after_match_reset_ui_for_play()
 
-        # update series totals
-        self.series_played += 1
-        self.series_player_runs += player_runs_match
-        self.series_computer_runs += computer_runs_match
+    def fast_forward(self, until):
+        # until: 'over', 'innings', 'match' or 'series'
+        if self.ff_until is not None:
+            return
+        game = self.game
+        if game.first_innings and game.second_innings:
+            if until != 'series' or self.next_match_btn.instate(['disabled']):
+                return
+        elif game.current_batting is None:
+            if until in ('over', 'innings'):
+                messagebox.showinfo("Notice", "Start the match first.")
+                return
+            self.auto_start_match()
+        self.ff_until = until
+        self.ff_innings = self.game.innings
+        # the toss too: a new toss mid-loop would change the match under it
+        for w in self.ff_btns + [self.play_btn, self.auto_btn, self.end_btn, self.next_match_btn, self.toss_btn]:
+            w.state(['disabled'])
+        self.fast_forward_step()
 
-        if winner == 'player':
-            self.series_player_wins += 1
-            match_text = f"Match {self.series_played}: You won (You {player_runs_match} - Computer {computer_runs_match})"
-        elif winner == 'computer':
-            self.series_computer_wins += 1
-            match_text = f"Match {self.series_played}: Computer won (Computer {computer_runs_match} - You {player_runs_match})"
-        else:
-            match_text = f"Match {self.series_played}: Tie (You {player_runs_match} - Computer {computer_runs_match})"
+    def fast_forward_step(self):
+        # Plays balls in a tight loop for up to FF_SLICE_MS, then writes the slice's log lines in
+        # one insert and refreshes once, so the window stays responsive and redraws at a
+        # steady rate however many balls are played.
+        if self.ff_until is None:
+            return
+        until = self.ff_until
+        deadline = time.perf_counter() + FF_SLICE_MS / 1000
+        lines = []
+        done = False
+        while not done and time.perf_counter() < deadline:
+            game = self.game
+            if game.first_innings and game.second_innings:
+                # only reached in series mode, between matches
+                self.prepare_next_match()
+                self.auto_start_match()
+                self.ff_innings = self.game.innings
+                continue
+            out = game.play_ball(None, quiet=True)
+            lines.append(game.record.text(-1))
+            if out['innings_over']:
+                lines.append("Innings switched/ended.")
+            if game.first_innings and game.second_innings:
+                self.append_log_lines(lines)
+                lines = []
+                self.on_match_end()
+                if until == 'series' and self.next_match_btn.instate(['!disabled']):
+                    # series goes on; Next Match is pressed by the loop, not the user
+                    self.next_match_btn.state(['disabled'])
+                else:
+                    done = True
+            elif until == 'over':
+                done = out['innings_over'] or game.balls % 6 == 0
+            elif until == 'innings':
+                done = game.innings != self.ff_innings
+        self.append_log_lines(lines)
+        if done:
+            self.ff_until = None
+            for w in self.ff_btns + [self.toss_btn]:
+                w.state(['!disabled'])
+        self.refresh_ui()
+        if not done:
+            self.disable_game_controls()
+            self.root.after(FF_FRAME_MS, self.fast_forward_step)
+        elif self.game.first_innings and self.game.second_innings:
+            self.disable_game_controls()
+
+    def on_match_end(self):
+        # compute match winner and update series totals
+        res = self.series.record_match(self.game)
+        if res is None:
+            return
+        match_text = res['text']
 
         # log in left panel
         self.append_log("=== Match Over ===")
         self.append_log(self.game.compute_result_text())
         self.append_log(match_text)
-        self.append_log(f"Series so far: You {self.series_player_wins} - Computer {self.series_computer_wins} (Runs: You {self.series_player_runs} - Comp {self.series_computer_runs})")
+        self.append_log(self.series.progress_text())
 
         # add to right-side series results panel
         self.add_series_result(match_text)
@@ -512,60 +1083,48 @@ class HandCricketGUI:
         # disable match controls until user clicks Next Match (if series continues)
         self.disable_game_controls()
 
-        # determine if series concluded early (majority reached)
-        majority = (self.series_total_games // 2) + 1
-        series_winner = None
-        if self.series_player_wins >= majority:
-            series_winner = 'player'
-        elif self.series_computer_wins >= majority:
-            series_winner = 'computer'
-
-        if self.series_played >= self.series_total_games or series_winner is not None:
-            # series ended — decide winner (if tie in matches, decide by total runs)
-            if self.series_player_wins > self.series_computer_wins:
-                final_text = f"Series Over: You won the series {self.series_player_wins}-{self.series_computer_wins} (Total runs You {self.series_player_runs} - Comp {self.series_computer_runs})"
-            elif self.series_computer_wins > self.series_player_wins:
-                final_text = f"Series Over: Computer won the series {self.series_computer_wins}-{self.series_player_wins} (Total runs Comp {self.series_computer_runs} - You {self.series_player_runs})"
-            else:
-                # match-wins tied -> decide by runs
-                if self.series_player_runs > self.series_computer_runs:
-                    final_text = f"Series Over (by runs): You {self.series_player_runs} - Comp {self.series_computer_runs} -> You win the series"
-                elif self.series_computer_runs > self.series_player_runs:
-                    final_text = f"Series Over (by runs): Computer {self.series_computer_runs} - You {self.series_player_runs} -> Computer wins the series"
-                else:
-                    final_text = f"Series Over: It's an exact tie! Both won {self.series_player_wins} matches and scored {self.series_player_runs} runs."
+        # series ends when all matches are played or a majority is reached early
+        if self.series.is_over():
+            final_text = self.series.result_text()
             self.append_log(final_text)
             self.add_series_result(final_text)
             messagebox.showinfo("Series Result", final_text)
             # reset series state so user can start a new series or reset
-            self.series_active = False
+            self.series.active = False
             self.next_match_btn.state(['disabled'])
         else:
             # series continues -> enable Next Match button so user can start next game
-            self.series_total_games = int(self.series_var.get())
+            self.series.total_games = int(self.series_var.get())
             self.next_match_btn.state(['!disabled'])
 
+        if self.journal is not None:
+            self.journal.write(hcricket_journal.MATCH_END)
         self.refresh_ui()
 
     def series_status_text(self):
-        if not self.series_active and self.series_played == 0:
+        sr = self.series
+        if not sr.active and sr.played == 0:
             # upcoming
             if self.game.format == 'TEST':
                 return "Series: Not available for TEST (single match)."
             return f"Series: Best of {self.series_var.get()} selected."
         else:
-            return f"Series: Played {self.series_played}/{self.series_total_games} - You {self.series_player_wins} : Comp {self.series_computer_wins} (Runs You {self.series_player_runs} - Comp {self.series_computer_runs})"
+            return f"Series: Played {sr.played}/{sr.total_games} - You {sr.player_wins} : Comp {sr.computer_wins} (Runs You {sr.player_runs} - Comp {sr.computer_runs})"
 
     def prepare_next_match(self):
         # Prepare new match in the series (reset game while keeping series totals and chosen format)
-        if self.series_played >= int(self.series_var.get()):
+        if self.series.played >= int(self.series_var.get()):
             messagebox.showinfo("Series", "All series matches already played.")
             self.next_match_btn.state(['disabled'])
             return
         # reset game state for a fresh match while preserving format
         current_fmt = self.fmt_var.get()
+        opponent = self.game.opponent
         self.game = HandCricketGame()
         self.game.set_format(current_fmt)
+        self.game.opponent = opponent
+        if self.journal is not None:
+            self.journal.bind(self.game, self.series)
         # ensure toss/who bats will be decided again
         self.game.toss_winner = None
         self.game.batting_first = None
@@ -573,7 +1132,7 @@ class HandCricketGUI:
         self.next_match_btn.state(['disabled'])
         # log start of next match in left panel and right panel remains as history
         self.log_box.configure(state='normal')
-        self.log_box.insert('1.0', f"\n--- Starting Match {self.series_played+1} ---\n")
+        self.log_box.insert('1.0', f"\n--- Starting Match {self.series.played+1} ---\n")
         self.log_box.configure(state='disabled')
         self.toss_info.config(text="Start toss for next match.")
         self.refresh_ui()
@@ -587,17 +1146,15 @@ class HandCricketGUI:
         if not ans: return
         self.game.reset_all()
         # reset series
-        self.series_total_games = 1
-        self.series_played = 0
-        self.series_player_wins = 0
-        self.series_computer_wins = 0
-        self.series_player_runs = 0
-        self.series_computer_runs = 0
-        self.series_active = False
+        self.series.reset()
+        self.ff_until = None
+        for w in self.ff_btns + [self.toss_btn]:
+            w.state(['!disabled'])
         # reset UI widgets
         self.fmt_var.set("T20")
         self.series_var.set("1")
         self.toss_call.set("heads")
+        self.opp_var.set("random")
         self.toss_info.config(text="")
         for w in self.choose_frame.winfo_children(): w.destroy()
         self.log_box.configure(state='normal')
@@ -607,7 +1164,56 @@ class HandCricketGUI:
         self.series_results_box.delete('1.0','end')
         self.series_results_box.configure(state='disabled')
         self.next_match_btn.state(['disabled'])
+        if self.journal is not None:
+            self.journal.write(hcricket_journal.RESET)
+        self.refresh_ui()
+
+    def offer_resume(self):
+        # called at startup: pick up the match or series left unfinished in the journal
+        try:
+            reader = hcricket_journal.JournalReader(self.journal.path)
+        except (OSError, ValueError):
+            return
+        with reader:
+            if not len(reader):
+                return
+            last = reader[-1]
+            if last.kind == hcricket_journal.RESET:
+                return
+            if last.kind == hcricket_journal.MATCH_END and not last.flags & hcricket_journal.F_SERIES_ACTIVE:
+                return
+            if not messagebox.askyesno("Resume", "Resume the unfinished match from last time?"):
+                return
+            hcricket_journal.restore(reader, len(reader) - 1, self.game, self.series)
+
+        self.fmt_var.set(self.game.format)
+        self.on_format_change()
+        self.series_var.set(str(self.series.total_games))
+        self.opp_var.set(hcricket_journal.OPPONENT_NAMES[last.opponent])
+        for line in self.game.log_lines():
+            self.append_log(line)
+        self.append_log("--- Resumed from journal ---")
+        if self.series.played:
+            self.add_series_result(self.series.progress_text())
+
+        if last.kind == hcricket_journal.MATCH_END:
+            # between matches of a series
+            self.disable_game_controls()
+            self.next_match_btn.state(['!disabled'])
+        elif self.game.current_batting is None:
+            # toss done, bat/bowl not chosen yet
+            self.show_toss_choice({'toss_winner': self.game.toss_winner, 'computer_choice': self.game._comp_pick})
+        else:
+            self.toss_info.config(text=f"Match resumed. {self.game.batting_first.capitalize()} batted first.")
         self.refresh_ui()
+        if self.game.first_innings and self.game.second_innings and last.kind != hcricket_journal.MATCH_END:
+            # the last ball was played but the match result never got recorded
+            self.journal.bind(self.game, self.series)
+            self.on_match_end()
+
+    def on_close(self):
+        self.journal.close()
+        self.root.destroy()
 
 def main():
     root = tk.Tk()
@@ -1,17 +1,19 @@
 import tkinter as tk
 from tkinter import messagebox
-from PIL import Image, ImageTk # Required for image handling
-import random
+import math
 import time
+import hideandkill_assets as assets
+import hideandkill_engine as rules
+from hideandkill_engine import HideAndKillEngine
 
 class HideAndKillGame(tk.Tk):
     """
     A multi-player Hide & Kill game with a fixed room layout, killer animation,
     and a visual killer sprite that moves between rooms.
     """
-    ROOM_COUNT = 8
-    MAX_ROUNDS = 10
-    POINTS_LOST = 1
+    ROOM_COUNT = rules.ROOM_COUNT
+    MAX_ROUNDS = rules.MAX_ROUNDS
+    POINTS_LOST = rules.POINTS_LOST
     CANVAS_SIZE = 600 # Increased canvas size
     ROOM_COLORS = "#E0E0E0" # Light grey for unsearched rooms
     BG_COLOR = "#f0f0f0"
@@ -19,6 +21,14 @@ class HideAndKillGame(tk.Tk):
     SEARCHED_COLOR = "#FF9800" # Orange during search
     KILLED_COLOR = "#F44336" # Red after search
     SAFE_COLOR = "#4CAF50" # Green for the safe room
+    KILLER_COLOR = "#212121" # Killer marker when there is no sprite image
+
+    # Killer search animation: the killer walks from room to room, one room every SEARCH_STEP_MS
+    # (the walk takes KILLER_MOVE_MS of it); a searched room stays orange for SEARCH_HOLD_MS
+    KILLER_FPS = 60
+    KILLER_MOVE_MS = 700
+    SEARCH_STEP_MS = 1500
+    SEARCH_HOLD_MS = 600
     
     # Updated Fixed positions (x1, y1, x2, y2) for 8 rooms in a larger house layout
     FIXED_LAYOUT = {
@@ -48,12 +58,17 @@ class HideAndKillGame(tk.Tk):
         
         # Game State Variables
         self.player_names = []
-        self.scores = {}
-        self.current_round = 0
+        self.engine = None # HideAndKillEngine: scores, rounds and the killer's draws
+        self.round_result = None # RoundResult of the round being shown
         self.room_canvas_ids = {} # Stores Canvas item IDs for coloring
         self.current_selections = {} # Stores player choices for the current round
         self.searched_rooms_sequence = [] # Order in which the killer checks rooms
         self.animation_step = 0
+        self.search_events = [] # (time ms, room, fill, outline) room recolors still to come
+        self.search_start = 0.0 # perf_counter() when the search began
+        self.frame_slot = 0 # last frame slot drawn (frame_slot * frame length = its time)
+        self.frame_times = [] # ms spent drawing each frame of the search
+        self.dropped_frames = 0
         self.killer_img_ref = None # Keep a reference to prevent garbage collection
         self.killer_sprite_id = None # Canvas ID for killer image
         
@@ -66,15 +81,14 @@ class HideAndKillGame(tk.Tk):
         self.lock_in_button = None
         self.result_text = None
         
-        # Load killer image
+        # Load killer image: a pre-scaled PNG from the sprite cache, rebuilt from killer.jpg only when it changed
         try:
-            original_killer_img = Image.open("killer.jpg") # Make sure "killer.png" is in the same directory
-            self.killer_img = ImageTk.PhotoImage(original_killer_img.resize((60, 60))) # Resize as needed
+            self.killer_img = assets.load_sprite(self, "killer") # Make sure "killer.jpg" is in the same directory
         except FileNotFoundError:
-            messagebox.showwarning("Image Not Found", "killer.png not found. Killer image won't be displayed.")
+            messagebox.showwarning("Image Not Found", "killer.jpg not found. Killer image won't be displayed.")
             self.killer_img = None
         except Exception as e:
-            messagebox.showwarning("Image Error", f"Error loading killer.png: {e}. Killer image won't be displayed.")
+            messagebox.showwarning("Image Error", f"Error loading killer.jpg: {e}. Killer image won't be displayed.")
             self.killer_img = None
             
         self.show_player_setup()
@@ -113,12 +127,11 @@ class HideAndKillGame(tk.Tk):
         """Validates player names, initializes scores, and moves to the main game screen."""
         self.player_names = [e.get().strip() for e in self.setup_entries if e.get().strip()]
         
-        if len(self.player_names) < 2 or len(self.player_names) > 6:
-            messagebox.showerror("Error", "Please enter between 2 and 6 player names.")
+        try:
+            self.engine = HideAndKillEngine(self.player_names) # Everyone starts with 10 points
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
             return
-
-        self.scores = {name: 10 for name in self.player_names} # Start with 10 points
-        self.current_round = 1
         
         self.main_frame.destroy()
         self.create_main_game_ui()
@@ -139,6 +152,8 @@ class HideAndKillGame(tk.Tk):
         self.canvas = tk.Canvas(canvas_frame, width=self.CANVAS_SIZE, height=self.CANVAS_SIZE, 
                                 bg=self.WALL_COLOR, highlightthickness=3, highlightbackground="#333333")
         self.canvas.pack()
+        self.anim_stats_label = tk.Label(canvas_frame, text="", font=("Inter", 10), bg=self.BG_COLOR, fg="#999999")
+        self.anim_stats_label.pack(pady=(6, 0))
         
         # Right Side: Controls and Scoreboard
         control_panel = tk.Frame(self.main_frame, bg=self.BG_COLOR, padx=15, pady=15, width=300)
@@ -180,7 +195,7 @@ class HideAndKillGame(tk.Tk):
     # --- Game Mechanics & Drawing ---
 
     def draw_rooms(self):
-        """Draws the fixed room layout and doors on the canvas."""
+        """Draws the fixed room layout, doors and killer once; rounds only recolor (reset_rooms)."""
         self.canvas.delete("all")
         self.room_canvas_ids = {}
         
@@ -224,12 +239,27 @@ class HideAndKillGame(tk.Tk):
                         self.canvas.create_line(center_x - door_width, y1, center_x + door_width, y1, fill=self.WALL_COLOR, width=door_width)
 
         # Place killer sprite at a starting point (e.g., center of room 5 or outside)
+        # Here, starting at room 5's center; without the image the killer is a dark disc
+        cx, cy = self.get_room_center(5) 
         if self.killer_img:
-            # You can choose a different starting point, e.g., slightly off-canvas or in a central room.
-            # Here, starting at room 5's center
-            cx, cy = self.get_room_center(5) 
             self.killer_sprite_id = self.canvas.create_image(cx, cy, image=self.killer_img, tags="killer_sprite")
-            self.canvas.itemconfigure(self.killer_sprite_id, state="hidden") # Hide initially
+        else:
+            self.killer_sprite_id = self.canvas.create_oval(-22, -22, 22, 22, fill=self.KILLER_COLOR, outline="white", width=2, tags="killer_sprite")
+            self.canvas.move(self.killer_sprite_id, cx, cy)
+        self.canvas.itemconfigure(self.killer_sprite_id, state="hidden") # Hide initially
+
+    def reset_rooms(self):
+        """Puts every room back to unsearched and hides the killer, reusing the drawn items."""
+        for rect_id in self.room_canvas_ids.values():
+            self.canvas.itemconfig(rect_id, fill=self.ROOM_COLORS, outline=self.WALL_COLOR, width=3)
+        self.canvas.itemconfigure(self.killer_sprite_id, state="hidden")
+
+    def move_killer(self, x, y):
+        """Centers the killer (image or disc) on (x, y)."""
+        if self.killer_img:
+            self.canvas.coords(self.killer_sprite_id, x, y)
+        else:
+            self.canvas.coords(self.killer_sprite_id, x - 22, y - 22, x + 22, y + 22)
 
     def get_room_center(self, room_id):
         """Calculates the center (x, y) coordinates of a given room."""
@@ -238,9 +268,9 @@ class HideAndKillGame(tk.Tk):
 
     def update_scoreboard(self):
         """Updates the scoreboard display with current scores and round number."""
-        self.round_label.config(text=f"Round {self.current_round} / {self.MAX_ROUNDS}")
+        self.round_label.config(text=f"Round {self.engine.current_round} / {self.MAX_ROUNDS}")
         
-        sorted_scores = sorted(self.scores.items(), key=lambda item: item[1], reverse=True)
+        sorted_scores = self.engine.standings()
         
         score_text = "CURRENT STANDINGS:\n"
         for name, score in sorted_scores:
@@ -256,13 +286,7 @@ class HideAndKillGame(tk.Tk):
         
         for name, entry in self.player_room_entries.items():
             try:
-                room_choice = int(entry.get())
-                if 1 <= room_choice <= self.ROOM_COUNT:
-                    selections[name] = room_choice
-                else:
-                    messagebox.showerror("Invalid Input", f"{name}: Room must be between 1 and {self.ROOM_COUNT}.")
-                    valid_round = False
-                    break
+                selections[name] = int(entry.get())
             except ValueError:
                 messagebox.showerror("Invalid Input", f"{name}: Please enter a valid number for your room choice.")
                 valid_round = False
@@ -271,53 +295,96 @@ class HideAndKillGame(tk.Tk):
         if not valid_round:
             return
 
+        # The engine checks the rooms, draws the safe room and search order, and scores the round
+        try:
+            self.round_result = self.engine.play_round(selections)
+        except ValueError as e:
+            messagebox.showerror("Invalid Input", str(e))
+            return
+
         self.current_selections = selections
         self.lock_in_button.config(state=tk.DISABLED, text="KILLER IS SEARCHING...")
         self.result_text.config(text="Choices locked in. Killer approaching...", fg="#FF5722")
         
-        all_rooms = list(range(1, self.ROOM_COUNT + 1))
-        self.safe_room = random.choice(all_rooms) 
-        
-        self.searched_rooms_sequence = [r for r in all_rooms if r != self.safe_room]
-        random.shuffle(self.searched_rooms_sequence)
+        self.safe_room = self.round_result.safe_room
+        self.searched_rooms_sequence = self.round_result.search_order
         
         self.animation_step = 0
         
         # Show killer sprite at the first room to be searched
-        if self.killer_img and self.searched_rooms_sequence:
+        if self.searched_rooms_sequence:
             initial_room_id = self.searched_rooms_sequence[0]
             cx, cy = self.get_room_center(initial_room_id)
-            self.canvas.coords(self.killer_sprite_id, cx, cy)
+            self.move_killer(cx, cy)
             self.canvas.itemconfigure(self.killer_sprite_id, state="normal") # Make visible
         
         self.animate_killer_search()
 
     def animate_killer_search(self):
-        """Iteratively highlights a room as the Killer searches it and moves the killer sprite."""
-        if self.animation_step < len(self.searched_rooms_sequence):
-            room_id = self.searched_rooms_sequence[self.animation_step]
-            rect_id = self.room_canvas_ids.get(room_id)
-
-            # Move killer sprite to current room's center
-            if self.killer_img:
-                cx, cy = self.get_room_center(room_id)
-                self.canvas.coords(self.killer_sprite_id, cx, cy)
-
-            self.canvas.itemconfig(rect_id, fill=self.SEARCHED_COLOR, outline="black", width=4)
-            self.update_idletasks() # Force update to show color change
-            
-            self.result_text.config(text=f"Killer is searching Room {room_id}...", fg="#FF9800")
-            
-            # Briefly hold orange, then change to red
-            self.after(600, lambda: self.canvas.itemconfig(rect_id, fill=self.KILLED_COLOR, outline="red", width=4))
-            
-            self.animation_step += 1
-            self.after(1500, self.animate_killer_search) # Wait for 1.5s before next room
-        else:
-            # Animation finished, hide killer sprite
-            if self.killer_img:
-                self.canvas.itemconfigure(self.killer_sprite_id, state="hidden")
+        """Starts the killer's walk through the searched rooms, drawn at a fixed KILLER_FPS."""
+        self.search_events = []
+        for step, room_id in enumerate(self.searched_rooms_sequence):
+            arrive = step * self.SEARCH_STEP_MS
+            self.search_events.append((arrive, room_id, self.SEARCHED_COLOR, "black"))
+            self.search_events.append((arrive + self.SEARCH_HOLD_MS, room_id, self.KILLED_COLOR, "red"))
+        self.search_events.sort(key=lambda event: event[0])
+        self.search_start = time.perf_counter()
+        self.frame_slot = -1
+        self.frame_times = []
+        self.dropped_frames = 0
+        self.animate_frame()
+
+    def killer_position(self, t):
+        """Where the killer is t ms into the search: walking to the next room, or standing in one."""
+        rooms = self.searched_rooms_sequence
+        step = min(int(t // self.SEARCH_STEP_MS), len(rooms) - 1)
+        x, y = self.get_room_center(rooms[step])
+        walk_start = (step + 1) * self.SEARCH_STEP_MS - self.KILLER_MOVE_MS
+        if step + 1 < len(rooms) and t > walk_start:
+            f = (t - walk_start) / self.KILLER_MOVE_MS
+            f = f * f * (3 - 2 * f) # ease in and out
+            nx, ny = self.get_room_center(rooms[step + 1])
+            x, y = x + (nx - x) * f, y + (ny - y) * f
+        return x, y
+
+    def animate_frame(self):
+        """Draws one frame of the search and schedules the next on the fixed frame grid."""
+        frame_ms = 1000 / self.KILLER_FPS
+        began = time.perf_counter()
+        t = (began - self.search_start) * 1000
+        slot = max(int(t // frame_ms), self.frame_slot + 1) # a timer firing a hair early still draws the next slot
+        # frame slots that went by without being drawn (the event loop was busy)
+        self.dropped_frames += max(0, slot - self.frame_slot - 1)
+        self.frame_slot = slot
+
+        while self.search_events and self.search_events[0][0] <= t:
+            _, room_id, fill, outline = self.search_events.pop(0)
+            self.canvas.itemconfig(self.room_canvas_ids[room_id], fill=fill, outline=outline, width=4)
+            if fill == self.SEARCHED_COLOR:
+                self.animation_step += 1
+                self.result_text.config(text=f"Killer is searching Room {room_id}...", fg="#FF9800")
+
+        end = len(self.searched_rooms_sequence) * self.SEARCH_STEP_MS
+        if t >= end:
+            # Search finished, hide killer sprite
+            self.canvas.itemconfigure(self.killer_sprite_id, state="hidden")
+            self.report_frame_stats()
             self.after(500, self.show_round_result)
+            return
+        self.move_killer(*self.killer_position(t))
+        now = time.perf_counter()
+        self.frame_times.append((now - began) * 1000)
+        delay = (slot + 1) * frame_ms - (now - self.search_start) * 1000
+        self.after(max(1, math.ceil(delay)), self.animate_frame)
+
+    def report_frame_stats(self):
+        """Shows how the last search animation kept up with KILLER_FPS."""
+        times = self.frame_times
+        if not times:
+            return
+        self.anim_stats_label.config(
+            text=f"Killer animation: {len(times)} frames @ {self.KILLER_FPS} fps, "
+                 f"avg {sum(times) / len(times):.2f} ms, worst {max(times):.2f} ms, {self.dropped_frames} dropped")
 
     def show_round_result(self, final_show=True):
         """Reveals the safe room and finalizes the scores for the round."""
@@ -327,12 +394,8 @@ class HideAndKillGame(tk.Tk):
         if safe_rect_id:
             self.canvas.itemconfig(safe_rect_id, fill=self.SAFE_COLOR, outline="green", width=4)
         
-        # 2. Calculate point loss
-        killed_players = []
-        for name, choice in self.current_selections.items():
-            if choice != self.safe_room:
-                self.scores[name] -= self.POINTS_LOST
-                killed_players.append(name)
+        # 2. Who was caught (the engine has already taken their points)
+        killed_players = self.round_result.caught
         
         # 3. Display Results
         if not killed_players:
@@ -350,7 +413,7 @@ class HideAndKillGame(tk.Tk):
 
     def start_new_round(self):
         """Resets the UI for a new round."""
-        self.draw_rooms() # Reset all room colors
+        self.reset_rooms() # Reset all room colors
         self.update_scoreboard()
         self.result_text.config(text="Place your bets and choose a room to hide!", fg="#777777")
         self.current_selections = {}
@@ -362,20 +425,17 @@ class HideAndKillGame(tk.Tk):
 
     def next_round_or_end(self):
         """Determines whether to start a new round or end the game."""
-        self.current_round += 1
-        
-        if self.current_round <= self.MAX_ROUNDS:
+        if self.engine.next_round():
             self.start_new_round()
         else:
             self.end_game()
 
     def end_game(self):
         """Calculates and displays the final game winner."""
-        final_scores = self.scores
-        sorted_scores = sorted(final_scores.items(), key=lambda item: item[1], reverse=True)
+        sorted_scores = self.engine.standings()
         
         winner_score = sorted_scores[0][1]
-        winners = [name for name, score in final_scores.items() if score == winner_score]
+        winners = self.engine.winners()
 
         self.canvas.delete("all")
         self.round_label.config(text="GAME OVER", fg="#CC0000")
@@ -0,0 +1,312 @@
+# hcricket_batch.py
+# Headless batch simulator for Hand Cricket: plays many auto-matches in parallel as NumPy arrays.
+# Every lane follows the same rules as HandCricketGame.play_ball / match_winner:
+#   - both sides pick 1-6; equal numbers is a wicket, otherwise the batter scores their pick
+#   - an innings ends on max_balls (if the format has a limit) or max_wickets
+#   - the chase also ends as soon as runs >= target (first innings runs + 1)
+# The computer can be the plain random opponent or the AdaptiveOpponent, and the player's picks can
+# follow any fixed weighting of 1-6 (player_weights) to model a human with habits.
+# NumPy is only needed for this module; the games themselves still run on pure Python + Tkinter.
+import argparse
+import math
+import random
+import time
+
+from Hcricket import FORMATS, OPPONENTS, AdaptiveOpponent, HandCricketGame
+
+
+_RUNS = None
+# opponents with a vectorized version here; the rest only run through simulate_scalar
+BATCH_OPPONENTS = ('random', 'adaptive')
+
+
+def _numpy():
+    global _RUNS
+    try:
+        import numpy as np
+    except ImportError:
+        raise RuntimeError("hcricket_batch needs NumPy (pip install numpy)")
+    if _RUNS is None:
+        # one draw per ball, u in 0-35: 0-5 -> both picked the same number (wicket, 1/6),
+        # 6-35 -> the batter's pick 1-6, each 5/36 (their pick didn't match the bowler's)
+        _RUNS = np.array([0] * 6 + [1, 2, 3, 4, 5, 6] * 5, dtype=np.int8)
+    return np
+
+
+def simulate(fmt='T20', n=100000, batting_first='toss', seed=None, chunk=131072,
+             opponent='random', player_weights=None):
+    # batting_first: 'player', 'computer' or 'toss' (toss winner picks at random, as in auto play)
+    # opponent: 'random' or 'adaptive'; player_weights: relative weights of picks 1-6 (None = uniform)
+    np = _numpy()
+    fmt = fmt.upper()
+    max_balls, max_wickets = FORMATS[fmt]
+    if batting_first not in ('player', 'computer', 'toss'):
+        raise ValueError("batting_first must be 'player', 'computer' or 'toss'")
+    if opponent not in BATCH_OPPONENTS:
+        raise ValueError(f"Unknown opponent {opponent!r}" if opponent not in OPPONENTS
+                         else f"Batch simulation has no {opponent!r} opponent; use simulate_scalar")
+    weights = _weights(player_weights)
+    rng = np.random.default_rng(seed)
+
+    start = time.perf_counter()
+    first_parts = []; second_parts = []; player_first_parts = []
+    done = 0
+    while done < n:
+        m = min(chunk, n - done)
+        if batting_first == 'toss':
+            player_first = rng.random(m) < 0.5
+        else:
+            player_first = np.full(m, batting_first == 'player')
+        if opponent == 'random' and weights is None:
+            # both sides uniform: who bats doesn't change the odds, so whole blocks of balls at once
+            first, second = _play_lanes(np, rng, m, max_balls, max_wickets)
+        else:
+            first, second = _play_lanes_by_ball(np, rng, m, max_balls, max_wickets, player_first,
+                                                opponent == 'adaptive', weights)
+        first_parts.append(first); second_parts.append(second); player_first_parts.append(player_first)
+        done += m
+    first = np.concatenate(first_parts)
+    second = np.concatenate(second_parts)
+    player_first = np.concatenate(player_first_parts)
+    elapsed = time.perf_counter() - start
+
+    chase_won = second > first
+    defended = second < first
+    tie = ~(chase_won | defended)
+    player_won = (player_first & defended) | (~player_first & chase_won)
+    computer_won = (player_first & chase_won) | (~player_first & defended)
+    return {
+        'format': fmt,
+        'matches': n,
+        'player_win': float(player_won.mean()),
+        'computer_win': float(computer_won.mean()),
+        'tie': float(tie.mean()),
+        'batting_first_win': float(defended.mean()),
+        'chasing_win': float(chase_won.mean()),
+        'mean_first_innings': float(first.mean()),
+        'mean_second_innings': float(second.mean()),
+        # histograms indexed by runs
+        'first_innings_runs': np.bincount(first),
+        'second_innings_runs': np.bincount(second),
+        'elapsed': elapsed,
+    }
+
+
+def _play_lanes(np, rng, m, max_balls, max_wickets):
+    # returns (first innings runs, second innings runs) for m auto-played matches
+    first = _innings(np, rng, m, max_balls, max_wickets, None)
+    second = _innings(np, rng, m, max_balls, max_wickets, first + 1)
+    return first, second
+
+
+def _innings(np, rng, m, max_balls, max_wickets, target):
+    # Plays one innings in every lane, a block of balls at a time: running sums down the
+    # ball axis give the score after each ball and the innings ends at the first ball that
+    # trips an end rule. Balls drawn after that point are simply discarded.
+    block = max_balls if max_balls is not None else 64
+    final = np.zeros(m, dtype=np.int32)
+    lane = np.arange(m)
+    runs = np.zeros(m, dtype=np.int32)
+    wickets = np.zeros(m, dtype=np.int32)
+    while lane.size:
+        # arrays are (ball, lane) so the running sums walk contiguous rows
+        u = rng.integers(0, 36, size=(block, lane.size), dtype=np.uint8)
+        score = _RUNS.take(u).astype(np.int32)
+        fallen = (u < 6).astype(np.int32)
+        score[0] += runs
+        fallen[0] += wickets
+        for i in range(1, block):
+            score[i] += score[i - 1]
+            fallen[i] += fallen[i - 1]
+
+        end = fallen >= max_wickets
+        if target is not None:
+            end |= score >= target[lane]
+        if max_balls is not None:
+            # the block is the whole innings, so the last ball always ends it
+            end[-1] = True
+        done = end.any(axis=0)
+        cols = np.flatnonzero(done)
+        final[lane[cols]] = score[end[:, cols].argmax(axis=0), cols]
+
+        keep = ~done
+        lane = lane[keep]
+        runs = score[-1, keep]
+        wickets = fallen[-1, keep]
+    return final
+
+
+def _weights(player_weights):
+    if player_weights is None:
+        return None
+    if len(player_weights) != 6 or min(player_weights) < 0 or sum(player_weights) <= 0:
+        raise ValueError("player_weights needs 6 non-negative weights for picks 1-6")
+    total = float(sum(player_weights))
+    return [w / total for w in player_weights]
+
+
+def _play_lanes_by_ball(np, rng, m, max_balls, max_wickets, player_first, adaptive, weights):
+    # Ball-at-a-time engine for when the two sides differ (a weighted player and/or the
+    # AdaptiveOpponent). The adaptive opponent's counts live in one (lane, role, context, pick)
+    # array and are updated exactly as AdaptiveOpponent.observe does, O(1) per ball per lane.
+    first = np.zeros(m, dtype=np.int32)
+    second = np.zeros(m, dtype=np.int32)
+    cum = None if weights is None else np.cumsum(weights)
+
+    lane = np.arange(m)
+    runs = np.zeros(m, dtype=np.int32)
+    wickets = np.zeros(m, dtype=np.int32)
+    balls = np.zeros(m, dtype=np.int32)
+    target = np.zeros(m, dtype=np.int32)
+    chasing = np.zeros(m, dtype=bool)
+    comp_bats = ~player_first
+    if adaptive:
+        counts = np.zeros((m, 2, 7, 6), dtype=np.int16)
+        prev = np.zeros((m, 2), dtype=np.int64)
+        picks = np.arange(1, 7)
+    while lane.size:
+        k = lane.size
+        # the player's pick
+        if cum is None:
+            human = rng.integers(1, 7, size=k)
+        else:
+            human = np.minimum(np.searchsorted(cum, rng.random(k), side='right'), 5) + 1
+
+        # the computer's pick
+        comp = rng.integers(1, 7, size=k)
+        if adaptive:
+            role = comp_bats.astype(np.int64)  # 1 = player bowling, as in AdaptiveOpponent
+            ctx = prev[lane, role]
+            uni = counts[lane, role, 0].astype(np.float64)
+            big = counts[lane, role, ctx].astype(np.float64)
+            big[ctx == 0] = 0.0
+            probs = big + (uni + 1) * (2.0 / (uni.sum(axis=1) + 6))[:, None]
+            probs /= probs.sum(axis=1)[:, None]
+            bat_score = picks * (1 - probs) - AdaptiveOpponent.WICKET_RUNS * probs
+            scores = np.where(comp_bats[:, None], bat_score, probs)
+            # random tie-breaks, like random.choice over the best picks
+            scores = scores + rng.random((k, 6)) * 1e-9
+            smart = scores.argmax(axis=1) + 1
+            explore = (rng.random(k) < AdaptiveOpponent.EXPLORE) | (uni.sum(axis=1) < AdaptiveOpponent.MIN_SEEN)
+            comp = np.where(explore, comp, smart)
+
+            # observe the player's pick in this role (unigram row, then bigram row)
+            h = human - 1
+            has = ctx > 0
+            rows = ((lane, role, np.zeros(k, dtype=np.int64), h),
+                    (lane[has], role[has], ctx[has], h[has]))
+            for li, ri, ci, hi in rows:
+                counts[li, ri, ci, hi] += 1
+                full = counts[li, ri, ci].sum(axis=1) >= AdaptiveOpponent.CAP
+                counts[li[full], ri[full], ci[full]] //= 2
+            prev[lane, role] = human
+
+        out = human == comp
+        balls += 1
+        wickets += out
+        runs += np.where(out, 0, np.where(comp_bats, comp, human))
+
+        over = wickets >= max_wickets
+        if max_balls is not None:
+            over |= balls >= max_balls
+        over |= chasing & (runs >= target)
+        if not over.any():
+            continue
+
+        # first innings finished: set target and swap sides for the chase
+        switch = over & ~chasing
+        first[lane[switch]] = runs[switch]
+        target[switch] = runs[switch] + 1
+        chasing |= switch
+        comp_bats ^= switch
+        runs[switch] = 0; wickets[switch] = 0; balls[switch] = 0
+
+        # second innings finished: match over, drop the lane
+        fin = over ^ switch
+        if fin.any():
+            second[lane[fin]] = runs[fin]
+            keep = ~fin
+            lane = lane[keep]; runs = runs[keep]; wickets = wickets[keep]; balls = balls[keep]
+            target = target[keep]; chasing = chasing[keep]; comp_bats = comp_bats[keep]
+    return first, second
+
+
+def simulate_scalar(fmt='T20', n=10000, batting_first='toss', seed=None,
+                    opponent='random', player_weights=None):
+    # reference run through HandCricketGame itself, same result keys as simulate()
+    if seed is not None:
+        random.seed(seed)
+    fmt = fmt.upper()
+    weights = _weights(player_weights)
+    start = time.perf_counter()
+    tally = {'player': 0, 'computer': 0, 'tie': 0}
+    defended = chased = 0
+    first_total = second_total = 0
+    for _ in range(n):
+        g = HandCricketGame()
+        g.set_format(fmt)
+        g.set_opponent(opponent)
+        if batting_first == 'toss':
+            g.auto_toss()
+        else:
+            g.toss_winner = 'player'
+            g.choose_bat_bowl('bat' if batting_first == 'player' else 'bowl')
+        while g.second_innings is None:
+            pick = None if weights is None else random.choices(range(1, 7), weights)[0]
+            g.play_ball(pick, quiet=True)
+        tally[g.match_winner()] += 1
+        f = g.first_innings['runs']; s = g.second_innings['runs']
+        first_total += f; second_total += s
+        defended += s < f; chased += s > f
+    elapsed = time.perf_counter() - start
+    return {
+        'format': fmt,
+        'matches': n,
+        'player_win': tally['player'] / n,
+        'computer_win': tally['computer'] / n,
+        'tie': tally['tie'] / n,
+        'batting_first_win': defended / n,
+        'chasing_win': chased / n,
+        'mean_first_innings': first_total / n,
+        'mean_second_innings': second_total / n,
+        'elapsed': elapsed,
+    }
+
+
+def compare(fmt='T20', n_batch=1000000, n_scalar=20000, seed=None, opponent='random', player_weights=None):
+    # runs both engines and checks the rates agree within 4 standard errors
+    batch = simulate(fmt, n_batch, seed=seed, opponent=opponent, player_weights=player_weights)
+    scalar = simulate_scalar(fmt, n_scalar, seed=seed, opponent=opponent, player_weights=player_weights)
+    report = {'batch': batch, 'scalar': scalar, 'agree': True}
+    for key in ('player_win', 'computer_win', 'tie', 'batting_first_win', 'chasing_win'):
+        p = batch[key]
+        se = math.sqrt(max(p * (1 - p), 1e-12) * (1 / n_batch + 1 / n_scalar))
+        if abs(p - scalar[key]) > 4 * se:
+            report['agree'] = False
+    report['speedup'] = (scalar['elapsed'] / n_scalar) / (batch['elapsed'] / n_batch)
+    return report
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Batch-simulate Hand Cricket auto matches")
+    ap.add_argument('--format', default='T20', choices=sorted(FORMATS))
+    ap.add_argument('-n', type=int, default=1000000, help="matches for the NumPy engine")
+    ap.add_argument('--scalar', type=int, default=20000, help="matches for the HandCricketGame reference run")
+    ap.add_argument('--seed', type=int, default=None)
+    ap.add_argument('--opponent', default='random', choices=BATCH_OPPONENTS)
+    ap.add_argument('--player-weights', type=float, nargs=6, default=None, metavar='W',
+                    help="relative weights of the player's picks 1-6")
+    args = ap.parse_args()
+
+    rep = compare(args.format, args.n, args.scalar, args.seed, args.opponent, args.player_weights)
+    for name in ('batch', 'scalar'):
+        r = rep[name]
+        print(f"{name:>6}: {r['matches']} matches in {r['elapsed']:.2f}s | "
+              f"player {r['player_win']:.4f} computer {r['computer_win']:.4f} tie {r['tie']:.4f} | "
+              f"bat-first {r['batting_first_win']:.4f} chase {r['chasing_win']:.4f} | "
+              f"avg 1st {r['mean_first_innings']:.2f} 2nd {r['mean_second_innings']:.2f}")
+    print(f"agree within 4 SE: {rep['agree']} | per-match speedup x{rep['speedup']:.0f}")
+
+
+if __name__ == "__main__":
+    main()
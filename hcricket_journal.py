@@ -0,0 +1,266 @@
+# hcricket_journal.py
+# Append-only binary journal of Hand Cricket matches: the toss, the bat/bowl choice and every ball.
+# Every record has the same fixed size and holds the full match + series state after the event,
+# so record i sits at HEADER.size + i * RECORD.size, any record can be read in O(1) through a
+# memory map, and a match or series can be resumed from the last record alone.
+# The header also keeps `base`, the number of records up to the last match end or reset, so a
+# resume or a scan back to the start of the current match never looks before it. Finished
+# matches stay in the file; once it passes `rotate` bytes at a match end or reset it is renamed
+# to the next free hcricket_journal.<n>.hcj and a new file is started. A file with the wrong
+# header is moved aside to <path>.bad, never written over.
+import mmap
+import os
+import struct
+from collections import namedtuple
+
+MAGIC = b'HCJ1'
+HEADER = struct.Struct('<4sHHI4x')         # magic, version, record size, base
+BASE = struct.Struct('<I')
+BASE_OFFSET = 8
+RECORD = struct.Struct('<8B5I4B2IB3x')
+VERSION = 2
+ROTATE_BYTES = 16 << 20
+
+# record kinds
+TOSS = 1
+CHOICE = 2          # bat/bowl decided, first innings starting
+BALL = 3            # state straight after the ball, before any change of innings
+INNINGS_END = 4     # written after BALL when that ball ended an innings
+END_EARLY = 5       # innings ended by the user
+MATCH_END = 6       # series totals updated with the finished match
+RESET = 7           # game and series reset; nothing to resume before this
+
+FORMAT_NAMES = ('T20', 'ODI', 'TEST')
+OPPONENT_NAMES = ('random', 'adaptive', 'expert')
+
+# flag bits
+F_TOSS_KNOWN = 1
+F_TOSS_PLAYER = 2
+F_COMP_BOWLS = 4            # computer's choice if it won the toss
+F_FIRST_KNOWN = 8
+F_FIRST_PLAYER = 16         # player batting first
+F_BATTING_PLAYER = 32       # player batting in the current innings
+F_MATCH_OVER = 64
+F_SERIES_ACTIVE = 128
+
+Entry = namedtuple('Entry', 'kind fmt innings flags player_pick computer_pick wickets first_wickets '
+                            'runs balls target first_runs first_balls '
+                            'series_total series_played player_wins computer_wins '
+                            'player_runs computer_runs opponent')
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'hcricket_journal.hcj')
+
+
+class MatchJournal:
+    # Writer. Records are packed into a buffer and written out in batches: whenever `batch`
+    # records are waiting, and always at innings and match boundaries.
+    # opponents: Hcricket's OPPONENTS (key -> class); a record stores the opponent as its key's
+    # place in OPPONENT_NAMES. rotate: size in bytes past which a finished file is set aside
+    def __init__(self, path=DEFAULT_PATH, batch=32, opponents=None, rotate=ROTATE_BYTES):
+        if opponents is None:
+            from Hcricket import OPPONENTS as opponents    # Hcricket imports this module
+        self.path = path
+        self.batch = batch
+        self.rotate = rotate
+        self.opponent_codes = {cls: OPPONENT_NAMES.index(kind) for kind, cls in opponents.items()
+                               if kind in OPPONENT_NAMES}
+        self.buf = []
+        self.game = None
+        self.series = None
+        if os.path.exists(path) and os.path.getsize(path) >= HEADER.size:
+            try:
+                self.base = _check_header(path)
+            except ValueError:
+                # an older version or a damaged file: keep it, but start a fresh journal
+                os.replace(path, path + '.bad')
+        if not os.path.exists(path) or os.path.getsize(path) < HEADER.size:
+            self._create()
+        else:
+            self.f = open(path, 'r+b')
+            # drop a half-written record left by a crash so the layout stays fixed-size
+            size = os.path.getsize(path)
+            self.f.truncate(size - (size - HEADER.size) % RECORD.size)
+            self.f.seek(0, os.SEEK_END)
+            self.count = (self.f.tell() - HEADER.size) // RECORD.size
+
+    def _create(self):
+        self.f = open(self.path, 'w+b')
+        self.f.write(HEADER.pack(MAGIC, VERSION, RECORD.size, 0))
+        self.f.flush()
+        self.base = self.count = 0
+
+    def bind(self, game, series=None):
+        # the game writes through game.journal; series totals are read from `series`
+        self.game = game
+        self.series = series
+        game.journal = self
+
+    def write(self, kind, player_pick=0, computer_pick=0):
+        g = self.game; sr = self.series
+        flags = 0
+        if g.toss_winner is not None:
+            flags |= F_TOSS_KNOWN
+            if g.toss_winner == 'player':
+                flags |= F_TOSS_PLAYER
+            elif g._comp_pick == 'bowl':
+                flags |= F_COMP_BOWLS
+        if g.batting_first is not None:
+            flags |= F_FIRST_KNOWN
+            if g.batting_first == 'player':
+                flags |= F_FIRST_PLAYER
+        if g.current_batting == 'player':
+            flags |= F_BATTING_PLAYER
+        if g.first_innings and g.second_innings:
+            flags |= F_MATCH_OVER
+        f = g.first_innings or {'runs': 0, 'wickets': 0, 'balls': 0}
+        if sr is not None:
+            if sr.active:
+                flags |= F_SERIES_ACTIVE
+            series = (sr.total_games, sr.played, sr.player_wins, sr.computer_wins, sr.player_runs, sr.computer_runs)
+        else:
+            series = (1, 0, 0, 0, 0, 0)
+        opponent = self.opponent_codes.get(type(g.opponent))
+        if opponent is None:
+            raise ValueError(f"{type(g.opponent).__name__} has no journal code (its OPPONENTS key "
+                             f"must be in OPPONENT_NAMES)")
+        record = RECORD.pack(
+            kind, FORMAT_NAMES.index(g.format) if g.format in FORMAT_NAMES else 2, g.innings, flags,
+            player_pick, computer_pick, g.wickets, f['wickets'],
+            g.runs, g.balls, g.target or 0, f['runs'], f['balls'],
+            *series, opponent)
+        self.buf.append(record)
+        self.count += 1
+        if kind == RESET or kind == MATCH_END:
+            self.flush()
+            # the records are on disk before the header points past them
+            self.base = self.count
+            self.f.seek(BASE_OFFSET)
+            self.f.write(BASE.pack(self.base))
+            self.f.seek(0, os.SEEK_END)
+            self.f.flush()
+            if self.f.tell() >= self.rotate and not flags & F_SERIES_ACTIVE:
+                self._rotate()
+        elif len(self.buf) >= self.batch or kind not in (BALL, TOSS):
+            self.flush()
+
+    def _rotate(self):
+        # set the finished file aside under the next free number and start an empty one
+        self.f.close()
+        stem, ext = os.path.splitext(self.path)
+        n = 1
+        while os.path.exists(f"{stem}.{n}{ext}"):
+            n += 1
+        os.replace(self.path, f"{stem}.{n}{ext}")
+        self._create()
+
+    def flush(self):
+        if self.buf:
+            self.f.write(b''.join(self.buf))
+            self.f.flush()
+            self.buf = []
+
+    def close(self):
+        self.flush()
+        self.f.close()
+
+
+def _check_header(path):
+    # the header's base; ValueError if this is not a journal of this version
+    with open(path, 'rb') as f:
+        magic, version, size, base = HEADER.unpack(f.read(HEADER.size))
+    if magic != MAGIC or version != VERSION or size != RECORD.size:
+        raise ValueError(f"{path} is not a Hand Cricket journal (version {VERSION})")
+    return base
+
+
+class JournalReader:
+    # Read-only view over a journal file through mmap; reader[i] is record i, in O(1).
+    # reader.base is the index of the first record of the current (unfinished) match
+    def __init__(self, path=DEFAULT_PATH):
+        base = _check_header(path)
+        self.f = open(path, 'rb')
+        size = os.path.getsize(path)
+        self.count = (size - HEADER.size) // RECORD.size
+        self.base = min(base, self.count)
+        self.mm = mmap.mmap(self.f.fileno(), 0, access=mmap.ACCESS_READ) if self.count else None
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError(i)
+        return Entry(*RECORD.unpack_from(self.mm, HEADER.size + i * RECORD.size))
+
+    def match_start(self, i):
+        # index of the CHOICE record that started the match containing record i (or None);
+        # the current match never starts before base
+        stop = self.base if i >= self.base else 0
+        while i >= stop:
+            kind = self.mm[HEADER.size + i * RECORD.size]
+            if kind == CHOICE:
+                return i
+            if kind in (MATCH_END, RESET):
+                return None
+            i -= 1
+        return None
+
+    def close(self):
+        if self.mm is not None:
+            self.mm.close()
+        self.f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def restore(reader, i, game, series=None):
+    # put `game` (and `series`) back into the state recorded at record i, including the
+    # match's ball-by-ball record; returns the Entry
+    e = reader[i]
+    game.reset_all()
+    game.set_format(FORMAT_NAMES[e.fmt])
+    game.set_opponent(OPPONENT_NAMES[e.opponent])
+    if e.flags & F_TOSS_KNOWN:
+        game.toss_winner = 'player' if e.flags & F_TOSS_PLAYER else 'computer'
+        game._comp_pick = None if e.flags & F_TOSS_PLAYER else ('bowl' if e.flags & F_COMP_BOWLS else 'bat')
+    if e.flags & F_FIRST_KNOWN:
+        game.batting_first = 'player' if e.flags & F_FIRST_PLAYER else 'computer'
+        game.current_batting = 'player' if e.flags & F_BATTING_PLAYER else 'computer'
+        game.innings = e.innings
+        game.runs = e.runs; game.wickets = e.wickets; game.balls = e.balls
+        game.target = e.target or None
+        if e.innings == 2:
+            game.first_innings = {'runs': e.first_runs, 'wickets': e.first_wickets, 'balls': e.first_balls}
+        if e.flags & F_MATCH_OVER:
+            game.second_innings = {'runs': e.runs, 'wickets': e.wickets, 'balls': e.balls}
+        start = reader.match_start(i)
+        if start is not None:
+            for j in range(start + 1, i + 1):
+                b = reader[j]
+                if b.kind != BALL:
+                    continue
+                player_batting = bool(b.flags & F_BATTING_PLAYER)
+                if b.player_pick == b.computer_pick:
+                    outcome = -1
+                else:
+                    outcome = b.player_pick if player_batting else b.computer_pick
+                game.record.add(b.innings, not player_batting, b.balls, b.player_pick, b.computer_pick,
+                                outcome, b.runs, b.wickets)
+                game.analytics[b.innings - 1].add(max(0, outcome), outcome == -1)
+                # let a learning opponent see this match's picks again
+                game.opponent.observe(not player_batting, b.player_pick)
+    if series is not None:
+        series.total_games = e.series_total
+        series.played = e.series_played
+        series.player_wins = e.player_wins
+        series.computer_wins = e.computer_wins
+        series.player_runs = e.player_runs
+        series.computer_runs = e.computer_runs
+        series.active = bool(e.flags & F_SERIES_ACTIVE)
+    return e
@@ -0,0 +1,121 @@
+# hcricket_series_sim.py
+# Simulates large numbers of auto-played best-of-N Hand Cricket series across all CPU cores.
+# Each worker plays a chunk of series with HandCricketGame + HandCricketSeries and sends back
+# only aggregated counts; the parent merges them and streams running totals as chunks finish.
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from Hcricket import HandCricketGame, HandCricketSeries
+
+
+def play_series(fmt, best_of):
+    # one auto-played series; returns the finished HandCricketSeries
+    series = HandCricketSeries()
+    series.start_match(best_of)
+    while not series.is_over():
+        game = HandCricketGame()
+        game.set_format(fmt)
+        game.auto_toss()
+        while game.second_innings is None:
+            game.play_ball(None, quiet=True)
+        series.record_match(game)
+    return series
+
+
+def empty_stats(best_of):
+    return {
+        'series': 0,
+        'player': 0,
+        'computer': 0,
+        'tie': 0,
+        'by_runs': 0,       # level on match wins, decided on total runs
+        'matches': 0,
+        # lengths[k] = series that finished after k matches
+        'lengths': [0] * (best_of + 1),
+    }
+
+
+def merge(total, part):
+    for key, value in part.items():
+        if key == 'lengths':
+            total[key] = [a + b for a, b in zip(total[key], value)]
+        else:
+            total[key] += value
+    return total
+
+
+def _run_chunk(fmt, best_of, count, seed):
+    random.seed(seed)
+    stats = empty_stats(best_of)
+    for _ in range(count):
+        series = play_series(fmt, best_of)
+        stats['series'] += 1
+        stats[series.winner()] += 1
+        stats['by_runs'] += series.decided_by_runs()
+        stats['matches'] += series.played
+        stats['lengths'][series.played] += 1
+    return best_of, stats
+
+
+def run(fmt='T20', best_of=(1, 3, 5), series=100000, workers=None, chunk=2000, seed=None):
+    # generator: yields {best_of: stats} with the running totals each time a chunk finishes
+    seeds = random.Random(seed)
+    totals = {n: empty_stats(n) for n in best_of}
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = []
+        for n in best_of:
+            left = series
+            while left > 0:
+                count = min(chunk, left)
+                futures.append(pool.submit(_run_chunk, fmt, n, count, seeds.getrandbits(64)))
+                left -= count
+        for fut in as_completed(futures):
+            n, stats = fut.result()
+            merge(totals[n], stats)
+            yield totals
+
+
+def summary_lines(totals):
+    lines = []
+    for n, st in sorted(totals.items()):
+        done = st['series']
+        if not done:
+            continue
+        lengths = ' '.join(f"{k}:{c / done:.3f}" for k, c in enumerate(st['lengths']) if k and c)
+        lines.append(f"best of {n}: {done} series | player {st['player'] / done:.4f} "
+                     f"computer {st['computer'] / done:.4f} tie {st['tie'] / done:.4f} | "
+                     f"decided on runs {st['by_runs'] / done:.4f} | "
+                     f"avg length {st['matches'] / done:.3f} | length {lengths}")
+    return lines
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Simulate best-of-N Hand Cricket series on all cores")
+    ap.add_argument('--format', default='T20', choices=['T20', 'ODI', 'TEST'])
+    ap.add_argument('--best-of', type=int, nargs='+', default=[1, 3, 5])
+    ap.add_argument('-n', '--series', type=int, default=100000, help="series per best-of value")
+    ap.add_argument('--workers', type=int, default=None)
+    ap.add_argument('--chunk', type=int, default=2000)
+    ap.add_argument('--seed', type=int, default=None)
+    args = ap.parse_args()
+
+    start = time.perf_counter()
+    last = start
+    totals = {}
+    for totals in run(args.format, args.best_of, args.series, args.workers, args.chunk, args.seed):
+        now = time.perf_counter()
+        if now - last >= 1.0:
+            last = now
+            done = sum(st['series'] for st in totals.values())
+            print(f"[{now - start:6.1f}s] {done} series simulated")
+    for line in summary_lines(totals):
+        print(line)
+    print(f"done in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,311 @@
+# hcricket_server.py
+# Asyncio server hosting many Hand Cricket matches in one process, plus a load generator.
+#
+# Protocol: one JSON object per line in each direction, answered in order per connection.
+#   {"op": "new", "format": "T20", "opponent": "adaptive"} -> {"ok": true, "session": 1, ...state}
+#   {"op": "toss", "session": 1, "call": "heads"}     -> toss result + state
+#   {"op": "choose", "session": 1, "choice": "bat"}   (or "accept": true when the computer won the toss)
+#   {"op": "ball", "session": 1, "num": 4}            ("num" may be left out for an auto ball)
+#   {"op": "end", "session": 1}                       end the current innings early
+#   {"op": "state", "session": 1} / {"op": "close", "session": 1} / {"op": "stats"}
+# Any request may carry an "id", which is echoed back. Errors come back as {"ok": false, "error": ...}.
+# Requests out of turn (a second toss, choose before the toss, a ball or end outside a match) are errors.
+# Sessions untouched for --idle seconds are evicted. The expert opponent's policy tables are solved
+# (or loaded from the disk cache) for every format before the server starts listening, so no
+# request ever waits on a solve.
+#
+#   python hcricket_server.py serve --port 8765
+#   python hcricket_server.py bench --port 8765 --sessions 10000 --connections 100
+import argparse
+import asyncio
+import json
+import time
+from collections import OrderedDict, deque
+
+import hcricket_solver
+from Hcricket import FORMATS, HandCricketGame
+
+
+class Session:
+    __slots__ = ('game', 'last_seen')
+
+    def __init__(self, game, now):
+        self.game = game
+        self.last_seen = now
+
+
+class HandCricketServer:
+    def __init__(self, idle_timeout=300.0):
+        self.idle_timeout = idle_timeout
+        # least recently used first, so eviction only ever looks at the front
+        self.sessions = OrderedDict()
+        self.next_id = 1
+        self.evicted = 0
+        self.balls_played = 0
+
+    # ---------- sessions ----------
+    def _session(self, msg):
+        sid = msg.get('session')
+        sess = self.sessions.get(sid)
+        if sess is None:
+            raise ValueError(f"unknown session {sid}")
+        sess.last_seen = time.monotonic()
+        self.sessions.move_to_end(sid)
+        return sess.game
+
+    def evict_idle(self, now=None):
+        now = time.monotonic() if now is None else now
+        limit = now - self.idle_timeout
+        while self.sessions:
+            sid, sess = next(iter(self.sessions.items()))
+            if sess.last_seen > limit:
+                break
+            del self.sessions[sid]
+            self.evicted += 1
+
+    async def _evict_loop(self):
+        while True:
+            await asyncio.sleep(max(1.0, self.idle_timeout / 4))
+            self.evict_idle()
+
+    @staticmethod
+    def state(game):
+        st = {
+            'format': game.format,
+            'innings': game.innings,
+            'batting': game.current_batting,
+            'runs': game.runs,
+            'wickets': game.wickets,
+            'balls': game.balls,
+            'target': game.target,
+        }
+        if game.first_innings and game.second_innings:
+            st['match_over'] = True
+            st['winner'] = game.match_winner()
+            st['result'] = game.compute_result_text()
+        return st
+
+    # ---------- requests ----------
+    @staticmethod
+    def _in_play(game):
+        # balls and early ends only between the bat/bowl choice and the end of the match
+        if game.current_batting is None:
+            raise RuntimeError("Match not started")
+        if game.first_innings and game.second_innings:
+            raise RuntimeError("Match is over")
+
+    def handle(self, msg):
+        op = msg.get('op')
+        if op == 'new':
+            fmt = msg.get('format', 'T20')
+            # set_format plays anything it doesn't know as TEST; a client gets told instead
+            if not isinstance(fmt, str) or fmt.upper() not in FORMATS:
+                raise ValueError(f"unknown format {fmt!r}: expected one of {', '.join(FORMATS)}")
+            game = HandCricketGame()
+            game.set_format(fmt)
+            game.set_opponent(msg.get('opponent', 'random'))
+            sid = self.next_id
+            self.next_id += 1
+            self.sessions[sid] = Session(game, time.monotonic())
+            out = {'session': sid}
+        elif op == 'toss':
+            game = self._session(msg)
+            if game.toss_winner is not None:
+                raise RuntimeError("Toss already played")
+            out = game.do_toss(msg.get('call', ''))
+        elif op == 'choose':
+            game = self._session(msg)
+            if game.toss_winner is None:
+                raise RuntimeError("Toss not played yet")
+            if game.current_batting is not None:
+                raise RuntimeError("Match already started")
+            accept = msg.get('accept') is True
+            if accept and game.toss_winner != 'computer':
+                raise RuntimeError("You won the toss: choose bat or bowl")
+            out = {'batting_first': game.choose_bat_bowl(msg.get('choice'), accept)}
+        elif op == 'ball':
+            game = self._session(msg)
+            self._in_play(game)
+            num = msg.get('num')
+            # bool is an int subclass, so true would otherwise count as 1
+            if num is not None and (isinstance(num, bool) or not isinstance(num, int)):
+                raise ValueError("num must be an integer 1-6")
+            res = game.play_ball(num, quiet=True)
+            self.balls_played += 1
+            rec = game.record
+            out = {'player': rec.player_pick[-1], 'computer': rec.computer_pick[-1],
+                   'outcome': rec.outcome[-1], 'innings_over': res['innings_over']}
+        elif op == 'end':
+            game = self._session(msg)
+            self._in_play(game)
+            out = game.end_innings_early()
+        elif op == 'state':
+            game = self._session(msg)
+            out = {}
+        elif op == 'close':
+            sid = msg.get('session')
+            if self.sessions.pop(sid, None) is None:
+                raise ValueError(f"unknown session {sid}")
+            return {'ok': True}
+        elif op == 'stats':
+            return {'ok': True, 'sessions': len(self.sessions), 'evicted': self.evicted,
+                    'balls': self.balls_played}
+        else:
+            raise ValueError(f"unknown op {op!r}")
+        out.update(self.state(game))
+        out['ok'] = True
+        return out
+
+    async def _client(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                msg = {}
+                try:
+                    msg = json.loads(line)
+                    reply = self.handle(msg)
+                except Exception as e:
+                    reply = {'ok': False, 'error': str(e)}
+                if isinstance(msg, dict) and 'id' in msg:
+                    reply['id'] = msg['id']
+                writer.write(json.dumps(reply, separators=(',', ':')).encode() + b'\n')
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    def load_policies():
+        # ExpertOpponent's tables for every format; hcricket_solver keeps them in memory after this
+        for max_balls, max_wickets in FORMATS.values():
+            hcricket_solver.policy(max_balls, max_wickets)
+
+    async def serve(self, host='127.0.0.1', port=8765, unix_path=None):
+        self.load_policies()
+        if unix_path:
+            server = await asyncio.start_unix_server(self._client, path=unix_path)
+        else:
+            server = await asyncio.start_server(self._client, host, port)
+        evictor = asyncio.create_task(self._evict_loop())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            evictor.cancel()
+
+
+# ---------- load generator ----------
+class Connection:
+    # pipelined client: requests go out as soon as they are made, replies are matched in order
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.pending = deque()
+        self.reader_task = asyncio.create_task(self._read())
+
+    async def _read(self):
+        while True:
+            line = await self.reader.readline()
+            if not line:
+                break
+            self.pending.popleft().set_result(json.loads(line))
+
+    async def call(self, **msg):
+        fut = asyncio.get_running_loop().create_future()
+        self.pending.append(fut)
+        self.writer.write(json.dumps(msg, separators=(',', ':')).encode() + b'\n')
+        return await fut
+
+    async def close(self):
+        self.writer.close()
+        self.reader_task.cancel()
+
+
+def _checked(reply):
+    if not reply['ok']:
+        raise RuntimeError(reply['error'])
+    return reply
+
+
+async def _bench_session(conn, fmt, latencies):
+    st = _checked(await conn.call(op='new', format=fmt))
+    sid = st['session']
+    toss = _checked(await conn.call(op='toss', session=sid, call='heads'))
+    if toss['toss_winner'] == 'player':
+        _checked(await conn.call(op='choose', session=sid, choice='bat'))
+    else:
+        _checked(await conn.call(op='choose', session=sid, accept=True))
+    while True:
+        t = time.perf_counter()
+        st = await conn.call(op='ball', session=sid)
+        latencies.append(time.perf_counter() - t)
+        if _checked(st).get('match_over'):
+            break
+    _checked(await conn.call(op='close', session=sid))
+
+
+async def bench(host='127.0.0.1', port=8765, unix_path=None, sessions=10000, connections=100, fmt='T20'):
+    conns = []
+    for _ in range(connections):
+        if unix_path:
+            reader, writer = await asyncio.open_unix_connection(unix_path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        conns.append(Connection(reader, writer))
+    latencies = []
+    start = time.perf_counter()
+    # every session is in flight at once, spread over the connections
+    await asyncio.gather(*(_bench_session(conns[i % connections], fmt, latencies) for i in range(sessions)))
+    elapsed = time.perf_counter() - start
+    for c in conns:
+        await c.close()
+
+    latencies.sort()
+    def pct(p):
+        return latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000
+    return {
+        'sessions': sessions,
+        'balls': len(latencies),
+        'elapsed': elapsed,
+        'balls_per_sec': len(latencies) / elapsed,
+        'p50_ms': pct(0.50),
+        'p99_ms': pct(0.99),
+        'max_ms': latencies[-1] * 1000,
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Hand Cricket multi-session server and load generator")
+    sub = ap.add_subparsers(dest='cmd', required=True)
+    for name in ('serve', 'bench'):
+        p = sub.add_parser(name)
+        p.add_argument('--host', default='127.0.0.1')
+        p.add_argument('--port', type=int, default=8765)
+        p.add_argument('--unix', default=None, help="Unix socket path instead of TCP")
+    sub.choices['serve'].add_argument('--idle', type=float, default=300.0, help="evict sessions idle this many seconds")
+    b = sub.choices['bench']
+    b.add_argument('--sessions', type=int, default=10000)
+    b.add_argument('--connections', type=int, default=100)
+    b.add_argument('--format', default='T20', choices=['T20', 'ODI', 'TEST'])
+    args = ap.parse_args()
+
+    if args.cmd == 'serve':
+        server = HandCricketServer(idle_timeout=args.idle)
+        where = args.unix or f"{args.host}:{args.port}"
+        print(f"Hand Cricket server on {where}")
+        try:
+            asyncio.run(server.serve(args.host, args.port, args.unix))
+        except KeyboardInterrupt:
+            pass
+    else:
+        r = asyncio.run(bench(args.host, args.port, args.unix, args.sessions, args.connections, args.format))
+        print(f"{r['sessions']} concurrent sessions, {r['balls']} balls in {r['elapsed']:.2f}s "
+              f"({r['balls_per_sec']:.0f} balls/s) | per-ball latency p50 {r['p50_ms']:.1f} ms, "
+              f"p99 {r['p99_ms']:.1f} ms, max {r['max_ms']:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
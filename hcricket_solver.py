@@ -0,0 +1,275 @@
+# hcricket_solver.py
+# Equilibrium (minimax) strategies for Hand Cricket.
+# Each ball is a simultaneous 6x6 game. With x_b the batting side's chance of winning after scoring b
+# and y its chance after losing a wicket (a tie counts as half a win), the batter gets x_b when the
+# picks differ and y when they match. A game of this shape is solved exactly, no LP needed:
+#   - the bowler picks b with chance q_b = (x_b - v) / d_b, where d_b = x_b - y, over the numbers
+#     with x_b > v; v is the level at which those chances add up to 1 ("water-filling")
+#   - the batter picks b with chance proportional to 1 / d_b over the same numbers
+# Neither side can do better than v against the other's mix, whatever it plays.
+# Backward induction over (runs, wickets left, balls left) solves every state of a format. The
+# tables are written to disk once per format and loaded straight back from then on.
+#
+#   python hcricket_solver.py --format ODI
+import argparse
+import os
+import struct
+import time
+from array import array
+from functools import lru_cache
+
+from hcricket_winprob import WinTable
+
+MAGIC = b'HCP1'
+HEADER = struct.Struct('<4sHHHI')      # magic, max_balls (0 = no limit), max_wickets, max_runs, states
+EPS = 1e-12
+ROW = 13                               # per state: value, batter chances 1-6, bowler chances 1-6
+CACHE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def solve_ball(x, y):
+    # one ball: returns (value, batter chances, bowler chances) for payoffs x[0..5] / y
+    d = [xb - y for xb in x]
+    live = sorted((b for b in range(6) if d[b] > EPS), key=lambda b: -x[b])
+    safe = [b for b in range(6) if d[b] <= EPS]
+    # a pick where the wicket costs nothing guarantees its x_b
+    floor = max((x[b] for b in safe), default=None)
+
+    v = None
+    support = []
+    sx = si = 0.0
+    for i, b in enumerate(live):
+        sx += x[b] / d[b]
+        si += 1.0 / d[b]
+        v = (sx - 1.0) / si
+        if i + 1 == len(live) or x[live[i + 1]] <= v:
+            support = live[:i + 1]
+            break
+
+    p = [0.0] * 6
+    q = [0.0] * 6
+    if v is None or (floor is not None and floor >= v):
+        # the batter is better off with a pick the bowler can't hurt
+        v = floor
+        best = [b for b in safe if x[b] >= floor - EPS]
+        for b in best:
+            p[b] = 1.0 / len(best)
+        left = 1.0
+        for b in live:
+            if x[b] > v:
+                q[b] = (x[b] - v) / d[b]
+                left -= q[b]
+        for b in safe:
+            q[b] = left / len(safe)
+    else:
+        for b in support:
+            p[b] = (1.0 / d[b]) / si
+            q[b] = (x[b] - v) / d[b]
+    return v, p, q
+
+
+class Policy:
+    # chase(need, wickets_left, balls_left) / first(runs, wickets_left, balls_left) -> row of ROW
+    # floats: the batting side's chance of winning (ties half) and both sides' pick chances.
+    # balls_left is ignored for formats without a ball limit.
+    def __init__(self, max_balls, max_wickets, max_runs, chase, first):
+        self.max_balls = max_balls
+        self.max_wickets = max_wickets
+        self.max_runs = max_runs
+        self.nb = 1 if max_balls is None else max_balls + 1
+        self._chase = chase
+        self._first = first
+
+    def _row(self, table, n, i, wl, bl):
+        k = ((wl * self.nb + (0 if self.max_balls is None else bl)) * n + i) * ROW
+        return table[k:k + ROW]
+
+    def chase(self, need, wickets_left, balls_left=None):
+        return self._row(self._chase, self.max_runs + 2, max(0, min(need, self.max_runs + 1)),
+                         wickets_left, balls_left)
+
+    def first(self, runs, wickets_left, balls_left=None):
+        return self._row(self._first, self.max_runs + 1, min(runs, self.max_runs), wickets_left, balls_left)
+
+    def chase_value(self, need, wickets_left, balls_left=None):
+        # like chase()[0], but also covers finished innings
+        if need <= 0:
+            return 1.0
+        if wickets_left == 0 or balls_left == 0:
+            return 0.5 if need == 1 else 0.0
+        if need > self.max_runs + 1:
+            return 0.0
+        return self.chase(need, wickets_left, balls_left)[0]
+
+    def first_value(self, runs, wickets_left, balls_left=None):
+        if runs > self.max_runs:
+            return 1.0
+        if wickets_left == 0 or balls_left == 0:
+            return 1.0 - self.chase_value(runs + 1, self.max_wickets, self.max_balls)
+        return self.first(runs, wickets_left, balls_left)[0]
+
+    @staticmethod
+    def batter(row):
+        return row[1:7]
+
+    @staticmethod
+    def bowler(row):
+        return row[7:13]
+
+
+def solve(max_balls, max_wickets):
+    # backward induction over every state; returns a Policy
+    W = max_wickets
+    if max_balls is None:
+        R = WinTable._test_runs_cap(W)
+        balls = [0]
+    else:
+        R = 6 * max_balls
+        balls = range(1, max_balls + 1)
+    nb = 1 if max_balls is None else max_balls + 1
+    n = R + 2
+
+    def nxt(bl):
+        # balls-left index after one more ball
+        return 0 if max_balls is None else bl - 1
+
+    # chase: value[wl][bl][need]; innings over (no wickets or balls left) -> tie only if one run was needed
+    chase = array('f', bytes(4 * ROW * (W + 1) * nb * n))
+    cv = [[None] * nb for _ in range(W + 1)]
+    dead = [1.0, 0.5] + [0.0] * (n - 2)
+    for wl in range(W + 1):
+        for bl in range(nb):
+            cv[wl][bl] = dead
+    for wl in range(1, W + 1):
+        for bl in balls:
+            out = cv[wl - 1][nxt(bl)]
+            row = [1.0] + [0.0] * (n - 1)
+            # with no ball limit a run keeps the same wickets and balls index: the row being filled
+            on = row if max_balls is None else cv[wl][nxt(bl)]
+            for need in range(1, n):
+                x = [on[need - r] if need > r else 1.0 for r in range(1, 7)]
+                v, p, q = solve_ball(x, out[need])
+                row[need] = v
+                k = ((wl * nb + bl) * n + need) * ROW
+                chase[k:k + ROW] = array('f', [v] + p + q)
+            cv[wl][bl] = row
+
+    # first innings: value[wl][bl][runs] for the side batting first; when it closes on `runs`
+    # the chase starts needing runs + 1 with everything in hand
+    m = R + 1
+    first = array('f', bytes(4 * ROW * (W + 1) * nb * m))
+    full = cv[W][nb - 1]
+    end = [1.0 - full[runs + 1] for runs in range(m)]
+    fv = [[end] * nb for _ in range(W + 1)]
+    for wl in range(1, W + 1):
+        for bl in balls:
+            out = fv[wl - 1][nxt(bl)]
+            # runs only go up, so fill from the top; past the cap counts as a sure win
+            row = [0.0] * m
+            on = row if max_balls is None else fv[wl][nxt(bl)]
+            for runs in range(R, -1, -1):
+                x = [on[runs + r] if runs + r <= R else 1.0 for r in range(1, 7)]
+                v, p, q = solve_ball(x, out[runs])
+                row[runs] = v
+                k = ((wl * nb + bl) * m + runs) * ROW
+                first[k:k + ROW] = array('f', [v] + p + q)
+            fv[wl][bl] = row
+    return Policy(max_balls, max_wickets, R, chase, first)
+
+
+def exploitability(pol):
+    # largest gain a single fixed pick makes against the solved mix, for either side, in any state
+    W = pol.max_wickets; R = pol.max_runs
+    balls = [None] if pol.max_balls is None else range(1, pol.max_balls + 1)
+    worst = 0.0
+    for wl in range(1, W + 1):
+        for bl in balls:
+            nbl = None if bl is None else bl - 1
+            for need in range(1, R + 2):
+                x = [pol.chase_value(need - r, wl, nbl) for r in range(1, 7)]
+                row = pol.chase(need, wl, bl)
+                worst = max(worst, _gain(row, x, pol.chase_value(need, wl - 1, nbl)))
+            for runs in range(R + 1):
+                x = [pol.first_value(runs + r, wl, nbl) for r in range(1, 7)]
+                row = pol.first(runs, wl, bl)
+                worst = max(worst, _gain(row, x, pol.first_value(runs, wl - 1, nbl)))
+    return worst
+
+
+def _gain(row, x, y):
+    v, p, q = row[0], row[1:7], row[7:13]
+    bat = max(x[b] - q[b] * (x[b] - y) for b in range(6))
+    s = sum(p[b] * x[b] for b in range(6))
+    bowl = min(s - p[c] * (x[c] - y) for c in range(6))
+    return max(bat - v, v - bowl)
+
+
+def _cache_path(max_balls, max_wickets):
+    return os.path.join(CACHE_DIR, f"hcricket_policy_{max_balls or 0}b_{max_wickets}w.hcp")
+
+
+def _load(path, max_balls, max_wickets):
+    with open(path, 'rb') as f:
+        magic, balls, wickets, runs, states = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC or balls != (max_balls or 0) or wickets != max_wickets:
+            raise ValueError("policy file is for another format")
+        nb = 1 if max_balls is None else max_balls + 1
+        chase = array('f'); first = array('f')
+        chase.fromfile(f, ROW * (wickets + 1) * nb * (runs + 2))
+        first.fromfile(f, ROW * (wickets + 1) * nb * (runs + 1))
+    return Policy(max_balls, max_wickets, runs, chase, first)
+
+
+def _save(path, pol):
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        states = (len(pol._chase) + len(pol._first)) // ROW
+        f.write(HEADER.pack(MAGIC, pol.max_balls or 0, pol.max_wickets, pol.max_runs, states))
+        pol._chase.tofile(f)
+        pol._first.tofile(f)
+    os.replace(tmp, path)
+
+
+@lru_cache(maxsize=None)
+def policy(max_balls, max_wickets):
+    # solved policy for a format: from memory, else from the disk cache, else solved and cached
+    path = _cache_path(max_balls, max_wickets)
+    try:
+        return _load(path, max_balls, max_wickets)
+    except (OSError, EOFError, ValueError, struct.error):
+        pass
+    pol = solve(max_balls, max_wickets)
+    try:
+        _save(path, pol)
+    except OSError:
+        pass
+    return pol
+
+
+def main():
+    from Hcricket import FORMATS
+    ap = argparse.ArgumentParser(description="Solve Hand Cricket equilibrium strategies for a format")
+    ap.add_argument('--format', default='T20', choices=sorted(FORMATS))
+    ap.add_argument('--check', action='store_true', help="also measure how far the policy is from unexploitable")
+    args = ap.parse_args()
+    max_balls, max_wickets = FORMATS[args.format]
+
+    start = time.perf_counter()
+    pol = solve(max_balls, max_wickets)
+    solved = time.perf_counter() - start
+    _save(_cache_path(max_balls, max_wickets), pol)
+    start = time.perf_counter()
+    _load(_cache_path(max_balls, max_wickets), max_balls, max_wickets)
+    loaded = time.perf_counter() - start
+
+    bl = max_balls
+    v = pol.first(0, max_wickets, bl)[0]
+    print(f"{args.format}: {(len(pol._chase) + len(pol._first)) // ROW} states solved in {solved:.2f}s, "
+          f"loaded from disk in {loaded * 1000:.1f} ms")
+    print(f"batting first wins {v:.4f} (ties count half) when both sides play the equilibrium")
+    if args.check:
+        print(f"largest gain from deviating: {exploitability(pol):.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,496 @@
+# hcricket_tournament.py
+# Round-robin Hand Cricket league for AI and human entrants.
+# Fixtures come from the circle method (every entrant meets every other once per leg, one match
+# per entrant per round). AI-vs-AI fixtures are played in a process pool; fixtures with a human
+# entrant stay pending until their result is entered from a finished HandCricketGame.
+# The points table is updated as each result arrives: a row's totals change in O(1) and only the
+# two rows involved are moved in the sorted standings (bisect), never re-sorted from history.
+# With --gui the league runs in a window: the standings update live while the AI fixtures are
+# played in the background, and human entrants play their fixtures there.
+#
+#   python hcricket_tournament.py --format T20 --ai random:4 adaptive:4 expert:2 --humans 2
+#   python hcricket_tournament.py --gui --ai random:4 expert:2 --humans 2
+import argparse
+import os
+import queue
+import random
+import threading
+import time
+import tkinter as tk
+from tkinter import messagebox, ttk
+from bisect import bisect_left, insort
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from Hcricket import OPPONENTS, HandCricketGame
+
+WIN_POINTS = 2
+TIE_POINTS = 1
+
+
+def schedule(names, legs=1):
+    # circle method: returns [(round, home, away)]; with an odd count one entrant sits out each round
+    teams = list(names)
+    if len(teams) % 2:
+        teams.append(None)
+    n = len(teams)
+    fixtures = []
+    for leg in range(legs):
+        order = teams[:]
+        for rnd in range(n - 1):
+            for i in range(n // 2):
+                a, b = order[i], order[n - 1 - i]
+                if a is None or b is None:
+                    continue
+                # alternate home side by round and leg so nobody is always the player's side
+                if (rnd + leg) % 2:
+                    a, b = b, a
+                fixtures.append((leg * (n - 1) + rnd + 1, a, b))
+            # keep the first entrant fixed, rotate the rest one step
+            order = [order[0], order[-1]] + order[1:-1]
+    return fixtures
+
+
+def match_summary(game):
+    # runs and balls for each side of a finished match, for points and net run rate;
+    # 'home' is the player's side. An innings that lost every wicket counts its full ball quota.
+    f = game.first_innings; s = game.second_innings
+
+    def balls(inn):
+        if game.max_balls is not None and inn['wickets'] >= game.max_wickets:
+            return game.max_balls
+        return inn['balls']
+
+    if game.batting_first == 'player':
+        home, away = f, s
+    else:
+        home, away = s, f
+    winner = game.match_winner()
+    return {
+        'home_runs': home['runs'], 'home_balls': balls(home),
+        'away_runs': away['runs'], 'away_balls': balls(away),
+        'winner': {'player': 'home', 'computer': 'away'}.get(winner, 'tie'),
+    }
+
+
+def flip_summary(summary):
+    # the same result seen from the other side (for a match where the away entrant was the player)
+    return {
+        'home_runs': summary['away_runs'], 'home_balls': summary['away_balls'],
+        'away_runs': summary['home_runs'], 'away_balls': summary['home_balls'],
+        'winner': {'home': 'away', 'away': 'home'}.get(summary['winner'], 'tie'),
+    }
+
+
+def play_fixture(fmt, home, away):
+    # one AI-vs-AI match: `home` plays the player's side, `away` the computer's
+    game = HandCricketGame()
+    game.set_format(fmt)
+    game.set_opponent(away)
+    side = OPPONENTS[home](side='player')
+    game.auto_toss()
+    while game.second_innings is None:
+        batting = game.current_batting == 'player'
+        game.play_ball(side.pick(game), quiet=True)
+        side.observe(batting, game.record.computer_pick[-1])
+    return match_summary(game)
+
+
+def _run_chunk(fmt, jobs, seed):
+    random.seed(seed)
+    return [(i, play_fixture(fmt, home, away)) for i, home, away in jobs]
+
+
+class TableRow:
+    __slots__ = ('name', 'played', 'won', 'lost', 'tied', 'points',
+                 'runs_for', 'balls_for', 'runs_against', 'balls_against', 'key')
+
+    def __init__(self, name):
+        self.name = name
+        self.played = self.won = self.lost = self.tied = self.points = 0
+        self.runs_for = self.balls_for = self.runs_against = self.balls_against = 0
+        self.key = self.sort_key()
+
+    @property
+    def nrr(self):
+        # runs per over scored minus runs per over conceded
+        scored = self.runs_for * 6 / self.balls_for if self.balls_for else 0.0
+        conceded = self.runs_against * 6 / self.balls_against if self.balls_against else 0.0
+        return scored - conceded
+
+    def sort_key(self):
+        return (-self.points, -self.nrr, self.name)
+
+    def add(self, runs_for, balls_for, runs_against, balls_against, result):
+        self.played += 1
+        self.runs_for += runs_for; self.balls_for += balls_for
+        self.runs_against += runs_against; self.balls_against += balls_against
+        if result == 'won':
+            self.won += 1; self.points += WIN_POINTS
+        elif result == 'lost':
+            self.lost += 1
+        else:
+            self.tied += 1; self.points += TIE_POINTS
+
+
+class PointsTable:
+    # standings kept sorted by (points, net run rate, name) as results come in
+    def __init__(self, names):
+        self.rows = {name: TableRow(name) for name in names}
+        self.keys = sorted(row.key for row in self.rows.values())
+
+    def record(self, home, away, summary):
+        # add one result; returns [(name, new position)] for the two rows that changed,
+        # in order of position
+        h = self.rows[home]; a = self.rows[away]
+        for row in (h, a):
+            del self.keys[bisect_left(self.keys, row.key)]
+        won = summary['winner']
+        h.add(summary['home_runs'], summary['home_balls'], summary['away_runs'], summary['away_balls'],
+              'won' if won == 'home' else 'lost' if won == 'away' else 'tied')
+        a.add(summary['away_runs'], summary['away_balls'], summary['home_runs'], summary['home_balls'],
+              'won' if won == 'away' else 'lost' if won == 'home' else 'tied')
+        for row in (h, a):
+            row.key = row.sort_key()
+            insort(self.keys, row.key)
+        moved = [(row.name, bisect_left(self.keys, row.key)) for row in (h, a)]
+        return sorted(moved, key=lambda m: m[1])
+
+    def standings(self):
+        return [self.rows[key[2]] for key in self.keys]
+
+
+class League:
+    # entrants: [(name, kind)], kind is 'human' or an OPPONENTS key
+    def __init__(self, fmt, entrants, legs=1):
+        self.format = fmt.upper()
+        self.kinds = dict(entrants)
+        for name, kind in entrants:
+            if kind != 'human' and kind not in OPPONENTS:
+                raise ValueError(f"Unknown entrant kind {kind!r} for {name}")
+        self.fixtures = schedule([name for name, _ in entrants], legs)
+        self.table = PointsTable(self.kinds)
+        self.results = {}
+
+    def is_ai(self, i):
+        _, home, away = self.fixtures[i]
+        return self.kinds[home] != 'human' and self.kinds[away] != 'human'
+
+    def pending(self):
+        # fixtures still waiting for a result (the human ones, once the AI fixtures are run)
+        return [i for i in range(len(self.fixtures)) if i not in self.results]
+
+    def record(self, i, summary):
+        if i in self.results:
+            raise ValueError(f"Fixture {i} already has a result")
+        self.results[i] = summary
+        _, home, away = self.fixtures[i]
+        return self.table.record(home, away, summary)
+
+    def human_side(self, i):
+        # which entrant of a human fixture plays the player's side: home if human, else away
+        _, home, away = self.fixtures[i]
+        return 'home' if self.kinds[home] == 'human' else 'away'
+
+    def record_game(self, i, game):
+        # enter a human fixture from its finished match; the entrant on human_side(i) played the
+        # player's side
+        if not (game.first_innings and game.second_innings):
+            raise RuntimeError("Match not finished")
+        summary = match_summary(game)
+        if self.human_side(i) == 'away':
+            summary = flip_summary(summary)
+        return self.record(i, summary)
+
+    def check_table(self):
+        # True if the table kept up result by result matches one built again from every result,
+        # sorted from scratch
+        fresh = PointsTable(self.kinds)
+        for i, summary in self.results.items():
+            _, home, away = self.fixtures[i]
+            fresh.record(home, away, summary)
+        return fresh.keys == self.table.keys
+
+    def run_ai(self, workers=None, chunk=200, seed=None):
+        # generator: plays every pending AI fixture in a process pool and yields (fixture, moved rows)
+        # as each result is added to the table
+        for i, summary in self.play_ai(workers, chunk, seed):
+            yield i, self.record(i, summary)
+
+    def play_ai(self, workers=None, chunk=200, seed=None):
+        # generator: plays every pending AI fixture in a process pool and yields (fixture, summary)
+        # as each finishes, without recording it (LeagueWindow records them on the Tk thread)
+        seeds = random.Random(seed)
+        jobs = [(i, self.kinds[self.fixtures[i][1]], self.kinds[self.fixtures[i][2]])
+                for i in self.pending() if self.is_ai(i)]
+        workers = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_run_chunk, self.format, jobs[k:k + chunk], seeds.getrandbits(64))
+                       for k in range(0, len(jobs), chunk)]
+            for fut in as_completed(futures):
+                yield from fut.result()
+
+
+class StandingsView:
+    # keeps a ttk.Treeview in standings order; after each result only the two changed rows get
+    # new values and are moved, everything else stays where it is. The moved rows are detached
+    # first: moving them one at a time would shift the indexes the other one was placed by.
+    COLUMNS = ('P', 'W', 'L', 'T', 'Pts', 'NRR')
+
+    def __init__(self, tree, table):
+        self.tree = tree
+        self.table = table
+        tree.configure(columns=self.COLUMNS)
+        tree.heading('#0', text="Team")
+        for col in self.COLUMNS:
+            tree.heading(col, text=col)
+            tree.column(col, width=50, anchor='e')
+        for row in table.standings():
+            tree.insert('', 'end', iid=row.name, text=row.name, values=self.values(row))
+
+    @staticmethod
+    def values(row):
+        return (row.played, row.won, row.lost, row.tied, row.points, f"{row.nrr:+.3f}")
+
+    def update(self, moved):
+        # moved: [(name, new position)] in order of position, as PointsTable.record returns it
+        for name, _ in moved:
+            self.tree.detach(name)
+        for name, pos in moved:
+            self.tree.item(name, values=self.values(self.table.rows[name]))
+            self.tree.move(name, '', pos)
+
+
+class EnteredPicks:
+    # the computer's side of a human-vs-human fixture: plays the number the second human entered
+    def __init__(self):
+        self.value = None
+
+    def pick(self, game):
+        return self.value
+
+    def observe(self, batting, other_pick):
+        pass
+
+
+class FixtureWindow:
+    # one human fixture: the entrant on league.human_side(i) plays the player's side, the other
+    # entrant the computer's (its AI, or a second human entering numbers too). on_done(i, moved)
+    # is called when the match is recorded, or with moved None if the window is closed first
+    def __init__(self, parent, league, i, on_done):
+        self.league = league
+        self.i = i
+        self.on_done = on_done
+        _, home, away = league.fixtures[i]
+        self.player, self.other = (home, away) if league.human_side(i) == 'home' else (away, home)
+        self.game = HandCricketGame()
+        self.game.set_format(league.format)
+        if league.kinds[self.other] == 'human':
+            self.game.opponent = EnteredPicks()
+        else:
+            self.game.set_opponent(league.kinds[self.other])
+        self.game.auto_toss()
+
+        self.top = tk.Toplevel(parent)
+        self.top.title(f"{home} v {away}")
+        self.top.protocol("WM_DELETE_WINDOW", self.close)
+        frm = ttk.Frame(self.top, padding=10)
+        frm.grid(sticky="nsew")
+        first = self.player if self.game.batting_first == 'player' else self.other
+        ttk.Label(frm, text=f"{self.game.format}: {first} bats first").grid(row=0, column=0, columnspan=3, sticky="w")
+        self.score_lbl = ttk.Label(frm, text="", font=('Segoe UI', 12, 'bold'))
+        self.score_lbl.grid(row=1, column=0, columnspan=3, sticky="w", pady=4)
+        self.entries = []
+        names = [self.player] + ([self.other] if isinstance(self.game.opponent, EnteredPicks) else [])
+        for row, name in enumerate(names, start=2):
+            ttk.Label(frm, text=f"{name} (1-6):").grid(row=row, column=0, sticky="w")
+            entry = ttk.Entry(frm, width=4, show='*' if len(names) > 1 else '')
+            entry.grid(row=row, column=1, padx=6)
+            self.entries.append(entry)
+        ttk.Button(frm, text="Play Ball", command=self.play_ball).grid(row=2, column=2, padx=6)
+        self.ball_lbl = ttk.Label(frm, text="")
+        self.ball_lbl.grid(row=len(names) + 2, column=0, columnspan=3, sticky="w", pady=(6, 0))
+        self.refresh()
+
+    def refresh(self):
+        g = self.game
+        batting = self.player if g.current_batting == 'player' else self.other
+        text = f"{batting} {g.runs}/{g.wickets} ({g.balls} balls)"
+        if g.target is not None:
+            text += f", target {g.target}"
+        self.score_lbl.config(text=text)
+
+    def play_ball(self):
+        nums = []
+        for entry in self.entries:
+            v = entry.get().strip()
+            if not v.isdigit() or not 1 <= int(v) <= 6:
+                messagebox.showinfo("Invalid", "Enter a number 1-6", parent=self.top)
+                return
+            nums.append(int(v))
+        if len(nums) > 1:
+            self.game.opponent.value = nums[1]
+        self.game.play_ball(nums[0], quiet=True)
+        for entry in self.entries:
+            entry.delete(0, 'end')
+        self.ball_lbl.config(text=self.game.record.text(-1))
+        self.refresh()
+        if self.game.first_innings and self.game.second_innings:
+            moved = self.league.record_game(self.i, self.game)
+            messagebox.showinfo("Result", self.game.compute_result_text(), parent=self.top)
+            self.top.destroy()
+            self.on_done(self.i, moved)
+
+    def close(self):
+        self.top.destroy()
+        self.on_done(self.i, None)
+
+
+class LeagueWindow:
+    # standings of a League, updated row by row as results arrive. AI fixtures are played by a
+    # background thread (League.play_ai); their results are recorded here, on the Tk thread.
+    POLL_MS = 50
+
+    def __init__(self, root, league, workers=None, chunk=200, seed=None):
+        self.root = root
+        self.league = league
+        self.ai_args = (workers, chunk, seed)
+        self.results = queue.Queue()
+        self.open_fixtures = {}         # fixture -> its FixtureWindow, one window per fixture
+        root.title(f"Hand Cricket League — {league.format}")
+        frm = ttk.Frame(root, padding=10)
+        frm.grid(sticky="nsew")
+
+        self.tree = ttk.Treeview(frm, height=min(20, len(league.kinds)))
+        self.tree.grid(row=0, column=0, columnspan=2, sticky="nsew")
+        self.view = StandingsView(self.tree, league.table)
+
+        self.ai_btn = ttk.Button(frm, text="Play AI Fixtures", command=self.play_ai)
+        self.ai_btn.grid(row=1, column=0, sticky="w", pady=6)
+        self.status_lbl = ttk.Label(frm, text="")
+        self.status_lbl.grid(row=1, column=1, sticky="w", padx=8)
+
+        ttk.Label(frm, text="Human fixtures:").grid(row=2, column=0, sticky="w")
+        self.fixture_list = tk.Listbox(frm, height=8, width=44)
+        self.fixture_list.grid(row=3, column=0, columnspan=2, sticky="w")
+        ttk.Button(frm, text="Play Selected", command=self.play_selected).grid(row=4, column=0, sticky="w", pady=6)
+        self.refresh_fixtures()
+
+    def refresh_fixtures(self):
+        self.human_fixtures = [i for i in self.league.pending() if not self.league.is_ai(i)]
+        self.fixture_list.delete(0, 'end')
+        for i in self.human_fixtures:
+            rnd, home, away = self.league.fixtures[i]
+            self.fixture_list.insert('end', f"Round {rnd}: {home} v {away}")
+        if not any(self.league.is_ai(i) for i in self.league.pending()):
+            self.ai_btn.state(['disabled'])
+
+    def play_ai(self):
+        self.ai_btn.state(['disabled'])
+        self.played = 0
+        self.started = time.perf_counter()
+
+        def work():
+            try:
+                for item in self.league.play_ai(*self.ai_args):
+                    self.results.put(item)
+            except Exception as e:
+                self.results.put(e)
+            else:
+                self.results.put(None)
+
+        threading.Thread(target=work, daemon=True).start()
+        self.root.after(self.POLL_MS, self.poll)
+
+    def poll(self):
+        # records whatever results have arrived since the last poll
+        while True:
+            try:
+                item = self.results.get_nowait()
+            except queue.Empty:
+                break
+            if item is None or isinstance(item, Exception):
+                if item is not None:
+                    messagebox.showinfo("Error", str(item))
+                self.status_lbl.config(text=f"{self.played} AI fixtures in "
+                                            f"{time.perf_counter() - self.started:.1f}s")
+                self.refresh_fixtures()
+                return
+            i, summary = item
+            self.view.update(self.league.record(i, summary))
+            self.played += 1
+        self.status_lbl.config(text=f"{self.played} AI fixtures played...")
+        self.root.after(self.POLL_MS, self.poll)
+
+    def play_selected(self):
+        sel = self.fixture_list.curselection()
+        if not sel:
+            return
+        i = self.human_fixtures[sel[0]]
+        if i in self.open_fixtures:
+            self.open_fixtures[i].top.lift()
+            return
+        self.open_fixtures[i] = FixtureWindow(self.root, self.league, i, self.fixture_done)
+
+    def fixture_done(self, i, moved):
+        del self.open_fixtures[i]
+        if moved is not None:
+            self.view.update(moved)
+            self.refresh_fixtures()
+
+
+def table_lines(table):
+    lines = [f"{'#':>3}  {'Team':<14}{'P':>4}{'W':>4}{'L':>4}{'T':>4}{'Pts':>5}{'NRR':>9}"]
+    for pos, row in enumerate(table.standings(), 1):
+        lines.append(f"{pos:>3}  {row.name:<14}{row.played:>4}{row.won:>4}{row.lost:>4}{row.tied:>4}"
+                     f"{row.points:>5}{row.nrr:>+9.3f}")
+    return lines
+
+
+def entrants_from_args(ai, humans):
+    entrants = []
+    for spec in ai:
+        kind, _, count = spec.partition(':')
+        for k in range(int(count or 1)):
+            entrants.append((f"{kind.capitalize()} {k + 1}", kind))
+    entrants += [(f"Human {k + 1}", 'human') for k in range(humans)]
+    return entrants
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Run a round-robin Hand Cricket league")
+    ap.add_argument('--format', default='T20', choices=['T20', 'ODI', 'TEST'])
+    ap.add_argument('--ai', nargs='+', default=['random:4', 'adaptive:4'], metavar='KIND:COUNT',
+                    help=f"AI entrants, KIND one of {', '.join(OPPONENTS)}")
+    ap.add_argument('--humans', type=int, default=0, help="human entrants (their fixtures stay pending)")
+    ap.add_argument('--legs', type=int, default=1)
+    ap.add_argument('--workers', type=int, default=None)
+    ap.add_argument('--chunk', type=int, default=200)
+    ap.add_argument('--seed', type=int, default=None)
+    ap.add_argument('--gui', action='store_true', help="run the league in a window")
+    ap.add_argument('--check', action='store_true',
+                    help="also check the standings against a table sorted from scratch")
+    args = ap.parse_args()
+
+    league = League(args.format, entrants_from_args(args.ai, args.humans), args.legs)
+    if args.gui:
+        root = tk.Tk()
+        LeagueWindow(root, league, args.workers, args.chunk, args.seed)
+        root.mainloop()
+        return
+    start = time.perf_counter()
+    played = 0
+    for _ in league.run_ai(args.workers, args.chunk, args.seed):
+        played += 1
+    elapsed = time.perf_counter() - start
+    for line in table_lines(league.table):
+        print(line)
+    pending = len(league.pending())
+    print(f"{played} AI fixtures in {elapsed:.1f}s, {pending} human fixture(s) pending")
+    if args.check:
+        if not league.check_table():
+            raise SystemExit("standings differ from a table sorted from scratch")
+        print("standings match a table sorted from scratch")
+
+
+if __name__ == "__main__":
+    main()
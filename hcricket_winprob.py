@@ -0,0 +1,179 @@
+# hcricket_winprob.py
+# Exact win probabilities for any Hand Cricket match state.
+# Both sides are treated as picking 1-6 uniformly at random from here on (what auto play does), so
+# every ball is a wicket with chance 1/6, otherwise the batter scores 1-6 with chance 5/36 each.
+# Tables are built once per format by dynamic programming; after that every lookup is O(1).
+from functools import lru_cache
+
+P_OUT = 1 / 6
+P_RUN = 5 / 36
+# TEST innings have no ball limit; runs beyond the point where an innings total has
+# less than this much probability left are treated as unreachable
+TAIL = 1e-12
+
+
+class WinTable:
+    # chase(need, wickets_left, balls_left) -> (win, tie) for the side batting second
+    # first(runs, wickets_left, balls_left) -> (win, tie) for the side batting first
+    # balls_left is ignored for formats without a ball limit
+    def __init__(self, max_balls, max_wickets):
+        self.max_balls = max_balls
+        self.max_wickets = max_wickets
+        if max_balls is None:
+            self.max_runs = self._test_runs_cap(max_wickets)
+            self._build_unlimited()
+        else:
+            self.max_runs = 6 * max_balls
+            self._build_limited()
+
+    # ---------- lookups ----------
+    def chase(self, need, wickets_left, balls_left=None):
+        if need <= 0:
+            return 1.0, 0.0
+        if need > self.max_runs + 1:
+            return 0.0, 0.0
+        if self.max_balls is None:
+            return self._cw[wickets_left][need], self._ct[wickets_left][need]
+        return self._cw[wickets_left][balls_left][need], self._ct[wickets_left][balls_left][need]
+
+    def first(self, runs, wickets_left, balls_left=None):
+        if runs > self.max_runs:
+            return 1.0, 0.0
+        if self.max_balls is None:
+            return self._fw[wickets_left][runs], self._ft[wickets_left][runs]
+        return self._fw[wickets_left][balls_left][runs], self._ft[wickets_left][balls_left][runs]
+
+    # ---------- limited overs: state (runs, wickets left, balls left) ----------
+    def _build_limited(self):
+        B = self.max_balls; W = self.max_wickets; R = self.max_runs
+        n = R + 2  # need runs 0..R+1
+
+        # chase[wl][bl][need]; with no balls or wickets left it's a tie only if one run was needed
+        cw = [[None] * (B + 1) for _ in range(W + 1)]
+        ct = [[None] * (B + 1) for _ in range(W + 1)]
+        dead_w = [1.0] + [0.0] * (n - 1)
+        dead_t = [0.0, 1.0] + [0.0] * (n - 2)
+        for wl in range(W + 1):
+            cw[wl][0] = dead_w; ct[wl][0] = dead_t
+        for bl in range(B + 1):
+            cw[0][bl] = dead_w; ct[0][bl] = dead_t
+        for wl in range(1, W + 1):
+            for bl in range(1, B + 1):
+                out_w = cw[wl - 1][bl - 1]; out_t = ct[wl - 1][bl - 1]
+                on_w = cw[wl][bl - 1]; on_t = ct[wl][bl - 1]
+                row_w = [1.0] + [0.0] * (n - 1); row_t = [0.0] * n
+                for need in range(1, n):
+                    sw = st = 0.0
+                    for r in range(1, 7):
+                        j = need - r
+                        if j <= 0:
+                            sw += 1.0
+                        else:
+                            sw += on_w[j]; st += on_t[j]
+                    row_w[need] = P_OUT * out_w[need] + P_RUN * sw
+                    row_t[need] = P_OUT * out_t[need] + P_RUN * st
+                cw[wl][bl] = row_w; ct[wl][bl] = row_t
+        self._cw = cw; self._ct = ct
+
+        # first innings over at `runs` -> the chase starts needing runs + 1 with everything left
+        end_w, end_t = self._innings_end(cw[W][B], ct[W][B], R)
+        fw = [[None] * (B + 1) for _ in range(W + 1)]
+        ft = [[None] * (B + 1) for _ in range(W + 1)]
+        for wl in range(W + 1):
+            fw[wl][0] = end_w; ft[wl][0] = end_t
+        for bl in range(B + 1):
+            fw[0][bl] = end_w; ft[0][bl] = end_t
+        for wl in range(1, W + 1):
+            for bl in range(1, B + 1):
+                out_w = fw[wl - 1][bl - 1]; out_t = ft[wl - 1][bl - 1]
+                on_w = fw[wl][bl - 1]; on_t = ft[wl][bl - 1]
+                row_w = [0.0] * (R + 1); row_t = [0.0] * (R + 1)
+                for runs in range(R + 1):
+                    sw = st = 0.0
+                    for r in range(1, 7):
+                        if runs + r <= R:
+                            sw += on_w[runs + r]; st += on_t[runs + r]
+                        else:
+                            # more runs than the format allows can't happen from a reachable state
+                            sw += 1.0
+                    row_w[runs] = P_OUT * out_w[runs] + P_RUN * sw
+                    row_t[runs] = P_OUT * out_t[runs] + P_RUN * st
+                fw[wl][bl] = row_w; ft[wl][bl] = row_t
+        self._fw = fw; self._ft = ft
+
+    # ---------- no ball limit: state (runs, wickets left) ----------
+    # With no ball limit the number of balls between wickets is geometric and memoryless,
+    # so the ball count drops out of the state entirely.
+    @staticmethod
+    def _test_runs_cap(max_wickets):
+        # distribution of runs still to come with wl wickets in hand:
+        # add(k, wl) = 1/6 * add(k, wl-1) + 5/36 * sum_r add(k-r, wl)
+        add = [[1.0]] + [[] for _ in range(max_wickets)]
+        total = 0.0
+        k = 0
+        while True:
+            for wl in range(1, max_wickets + 1):
+                row = add[wl]
+                p = P_OUT * (add[wl - 1][k] if k < len(add[wl - 1]) else 0.0)
+                for r in range(1, 7):
+                    if k - r >= 0:
+                        p += P_RUN * row[k - r]
+                row.append(p)
+            total += add[max_wickets][k]
+            if total >= 1.0 - TAIL:
+                return k
+            k += 1
+
+    def _build_unlimited(self):
+        W = self.max_wickets; R = self.max_runs
+        n = R + 2
+
+        cw = [[1.0] + [0.0] * (n - 1)]
+        ct = [[0.0, 1.0] + [0.0] * (n - 2)]
+        for wl in range(1, W + 1):
+            # a wicket keeps `need` the same; runs only ever lower it, so fill by rising need
+            out_w = cw[wl - 1]; out_t = ct[wl - 1]
+            row_w = [1.0] + [0.0] * (n - 1); row_t = [0.0] * n
+            for need in range(1, n):
+                sw = st = 0.0
+                for r in range(1, 7):
+                    j = need - r
+                    if j <= 0:
+                        sw += 1.0
+                    else:
+                        sw += row_w[j]; st += row_t[j]
+                row_w[need] = P_OUT * out_w[need] + P_RUN * sw
+                row_t[need] = P_OUT * out_t[need] + P_RUN * st
+            cw.append(row_w); ct.append(row_t)
+        self._cw = cw; self._ct = ct
+
+        end_w, end_t = self._innings_end(cw[W], ct[W], R)
+        fw = [end_w]; ft = [end_t]
+        for wl in range(1, W + 1):
+            # runs only go up, so fill from the cap downwards
+            out_w = fw[wl - 1]; out_t = ft[wl - 1]
+            row_w = [0.0] * (R + 1); row_t = [0.0] * (R + 1)
+            for runs in range(R, -1, -1):
+                sw = st = 0.0
+                for r in range(1, 7):
+                    j = runs + r
+                    if j > R:
+                        sw += 1.0
+                    else:
+                        sw += row_w[j]; st += row_t[j]
+                row_w[runs] = P_OUT * out_w[runs] + P_RUN * sw
+                row_t[runs] = P_OUT * out_t[runs] + P_RUN * st
+            fw.append(row_w); ft.append(row_t)
+        self._fw = fw; self._ft = ft
+
+    @staticmethod
+    def _innings_end(chase_w, chase_t, max_runs):
+        # first innings closed on `runs`: batting first wins unless the chase gets there
+        win = [1.0 - chase_w[runs + 1] - chase_t[runs + 1] for runs in range(max_runs + 1)]
+        tie = [chase_t[runs + 1] for runs in range(max_runs + 1)]
+        return win, tie
+
+
+@lru_cache(maxsize=None)
+def table(max_balls, max_wickets):
+    return WinTable(max_balls, max_wickets)
@@ -0,0 +1,103 @@
+# hideandkill_assets.py
+# Sprites for Hide & Kill, pre-scaled once and kept in an on-disk cache so a launch never has to
+# decode and resize the source pictures. A cached sprite is a PNG in hideandkill_sprites/ named
+#   <sprite>-<first 16 hex digits of the source's SHA-256>-<width>x<height>.png
+# so editing the picture or changing its size makes a new entry; older entries of the same sprite
+# are removed when it is rebuilt. Tk reads the PNG straight into a PhotoImage, so the game needs
+# Pillow only to (re)build the cache, and imports it only then.
+#
+#   python hideandkill_assets.py            (build every sprite in SPRITES and time the loads)
+import argparse
+import glob
+import hashlib
+import os
+import time
+import tkinter as tk
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(HERE, 'hideandkill_sprites')
+
+# name: (source picture next to this file, size on the board)
+SPRITES = {
+    'killer': ('killer.jpg', (60, 60)),
+}
+
+
+def _pillow():
+    try:
+        from PIL import Image
+    except ImportError:
+        raise RuntimeError("building the Hide & Kill sprite cache needs Pillow (pip install pillow)")
+    return Image
+
+
+def source_hash(src):
+    h = hashlib.sha256()
+    with open(src, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 16), b''):
+            h.update(block)
+    return h.hexdigest()[:16]
+
+
+def cache_path(name, digest, size):
+    return os.path.join(CACHE_DIR, f"{name}-{digest}-{size[0]}x{size[1]}.png")
+
+
+def build_sprite(name, src, size, out):
+    # decodes and resizes the source with Pillow and writes the cache entry; stale entries go
+    Image = _pillow()
+    with Image.open(src) as img:
+        scaled = img.convert('RGBA').resize(size, Image.LANCZOS)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp = out + '.tmp'
+    scaled.save(tmp, 'PNG')
+    os.replace(tmp, out)
+    for old in glob.glob(os.path.join(CACHE_DIR, f"{name}-*.png")):
+        if old != out:
+            os.remove(old)
+
+
+def sprite_path(name):
+    # path of the cached PNG for SPRITES[name], building it first if the source or size changed.
+    # FileNotFoundError if the source is missing, RuntimeError if a rebuild needs Pillow and it
+    # isn't installed
+    src, size = SPRITES[name]
+    src = os.path.join(HERE, src)
+    out = cache_path(name, source_hash(src), size)
+    if not os.path.exists(out):
+        build_sprite(name, src, size, out)
+    return out
+
+
+def load_sprite(master, name):
+    # the sprite as a PhotoImage; keep a reference to it for as long as it is shown
+    return tk.PhotoImage(master=master, file=sprite_path(name))
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Build the Hide & Kill sprite cache and time sprite loads")
+    ap.add_argument('sprites', nargs='*', default=list(SPRITES), help="sprites to build (default: all)")
+    args = ap.parse_args()
+
+    root = tk.Tk()
+    root.withdraw()
+    for name in args.sprites:
+        if name not in SPRITES:
+            ap.error(f"unknown sprite {name!r} (choose from {', '.join(SPRITES)})")
+        start = time.perf_counter()
+        try:
+            path = sprite_path(name)
+        except (OSError, RuntimeError) as e:
+            print(f"{name}: {e}")
+            continue
+        built = time.perf_counter() - start
+        start = time.perf_counter()
+        load_sprite(root, name)
+        loaded = time.perf_counter() - start
+        print(f"{name}: {os.path.relpath(path, HERE)} ready in {built * 1000:.1f} ms, "
+              f"cached load {loaded * 1000:.1f} ms")
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
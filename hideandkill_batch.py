@@ -0,0 +1,154 @@
+# hideandkill_batch.py
+# Headless batch simulator for Hide & Kill: plays many whole games at once as NumPy arrays, to see
+# how final scores spread and how often games end in a tie for a given mix of hiding strategies.
+# Every game follows the same rules as HideAndKillEngine: each round every player picks a room with
+# their strategy, the safe room is uniform over ROOM_COUNT, everyone not in it loses POINTS_LOST;
+# after the rounds the top score wins and several on it tie. The killer's search order only matters
+# for the animation, so it isn't drawn here.
+# NumPy is only needed for this module; the game itself still runs on pure Python + Tkinter.
+#
+#   python hideandkill_batch.py random random last-safe fixed:5 -n 1000000
+import argparse
+import math
+import random
+import time
+
+from hideandkill_engine import (MAX_PLAYERS, MAX_ROUNDS, MIN_PLAYERS, POINTS_LOST, ROOM_COUNT,
+                                START_POINTS, make_strategy, play_game)
+
+
+def _numpy():
+    try:
+        import numpy as np
+    except ImportError:
+        raise RuntimeError("hideandkill_batch needs NumPy (pip install numpy)")
+    return np
+
+
+def simulate(strategies, n=1000000, rounds=MAX_ROUNDS, seed=None, chunk=262144):
+    # strategies: one per player (2-6). Scores are counted from the lowest possible final score,
+    # so score_hist[p][s] is how many games player p ended on lowest + s
+    if not MIN_PLAYERS <= len(strategies) <= MAX_PLAYERS:
+        raise ValueError(f"Hide & Kill needs {MIN_PLAYERS}-{MAX_PLAYERS} players")
+    np = _numpy()
+    gen = np.random.default_rng(seed)
+    k = len(strategies)
+    lowest = START_POINTS - rounds * POINTS_LOST
+    span = rounds + 1
+    hist = np.zeros((k, span), dtype=np.int64)
+    shares = np.zeros(k)
+    outright = np.zeros(k, dtype=np.int64)
+    tie_sizes = np.zeros(k + 1, dtype=np.int64)
+    start = time.perf_counter()
+    done = 0
+    while done < n:
+        m = min(chunk, n - done)
+        caught = np.zeros((m, k), dtype=np.int16)
+        last_safe = np.zeros(m, dtype=np.int64)
+        for _ in range(rounds):
+            picks = np.stack([s.pick_batch(np, gen, last_safe) for s in strategies], axis=1)
+            safe = gen.integers(1, ROOM_COUNT + 1, m)
+            caught += picks != safe[:, None]
+            last_safe = safe
+        # scores fall by POINTS_LOST per catch, so fewest catches is the top score
+        fewest = caught.min(axis=1)
+        top = caught == fewest[:, None]
+        on_top = top.sum(axis=1)
+        shares += (top / on_top[:, None]).sum(axis=0)
+        outright += (top & (on_top == 1)[:, None]).sum(axis=0)
+        tie_sizes += np.bincount(on_top, minlength=k + 1)
+        for p in range(k):
+            hist[p] += np.bincount(rounds - caught[:, p], minlength=span)
+        done += m
+    elapsed = time.perf_counter() - start
+    scores = lowest + np.arange(span) * POINTS_LOST
+    return {
+        'games': n,
+        'players': [s.name for s in strategies],
+        'scores': scores.tolist(),
+        'score_hist': hist,
+        'mean_score': (hist @ scores / n).tolist(),
+        'win_share': (shares / n).tolist(),
+        'outright_win': (outright / n).tolist(),
+        'tie_rate': float(tie_sizes[2:].sum() / n),
+        # tie_sizes[j]: games where j players shared the top score
+        'tie_sizes': tie_sizes,
+        'elapsed': elapsed,
+    }
+
+
+def simulate_scalar(strategies, n=20000, rounds=MAX_ROUNDS, seed=None):
+    # reference run through HideAndKillEngine, one game at a time
+    rng = random.Random(seed)
+    k = len(strategies)
+    shares = [0.0] * k
+    totals = [0] * k
+    ties = 0
+    start = time.perf_counter()
+    for _ in range(n):
+        engine = play_game(strategies, rng, rounds)
+        winners = engine.winners()
+        if len(winners) > 1:
+            ties += 1
+        for p, name in enumerate(engine.player_names):
+            totals[p] += engine.scores[name]
+            if name in winners:
+                shares[p] += 1 / len(winners)
+    elapsed = time.perf_counter() - start
+    return {
+        'games': n,
+        'mean_score': [t / n for t in totals],
+        'win_share': [s / n for s in shares],
+        'tie_rate': ties / n,
+        'elapsed': elapsed,
+    }
+
+
+def compare(strategies, n_batch=1000000, n_scalar=20000, rounds=MAX_ROUNDS, seed=None):
+    # runs both engines and checks the tie rate and win shares agree within 4 standard errors
+    batch = simulate(strategies, n_batch, rounds, seed)
+    scalar = simulate_scalar(strategies, n_scalar, rounds, seed)
+    report = {'batch': batch, 'scalar': scalar, 'agree': True}
+    for p, q in [(batch['tie_rate'], scalar['tie_rate'])] + list(zip(batch['win_share'], scalar['win_share'])):
+        se = math.sqrt(max(p * (1 - p), 1e-12) * (1 / n_batch + 1 / n_scalar))
+        if abs(p - q) > 4 * se:
+            report['agree'] = False
+    report['speedup'] = (scalar['elapsed'] / n_scalar) / (batch['elapsed'] / n_batch)
+    return report
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Batch-simulate Hide & Kill games for a mix of hiding strategies")
+    ap.add_argument('strategies', nargs='*', default=['random', 'random'],
+                    help="one per player: random, last-safe, avoid-last or fixed:<room>")
+    ap.add_argument('-n', type=int, default=1000000, help="games for the NumPy engine")
+    ap.add_argument('--scalar', type=int, default=20000, help="games for the HideAndKillEngine reference run")
+    ap.add_argument('--rounds', type=int, default=MAX_ROUNDS)
+    ap.add_argument('--seed', type=int, default=None)
+    args = ap.parse_args()
+
+    try:
+        strategies = [make_strategy(s) for s in args.strategies]
+    except ValueError as e:
+        ap.error(str(e))
+    rep = compare(strategies, args.n, args.scalar, args.rounds, args.seed)
+    b, s = rep['batch'], rep['scalar']
+    for name, r in (('batch', b), ('scalar', s)):
+        print(f"{name:>6}: {r['games']} games in {r['elapsed']:.2f}s | tie rate {r['tie_rate']:.4f}")
+    print("player  strategy     mean score  win share  outright  (scalar win share)")
+    for p, strat in enumerate(b['players']):
+        print(f"P{p + 1:<6} {strat:<12} {b['mean_score'][p]:10.3f}  {b['win_share'][p]:9.4f}  "
+              f"{b['outright_win'][p]:8.4f}  ({s['win_share'][p]:.4f})")
+    print("final score distribution:")
+    print("score " + " ".join(f"{v:>6}" for v in b['scores']))
+    for p in range(len(b['players'])):
+        row = b['score_hist'][p] / b['games']
+        print(f"P{p + 1:<4} " + " ".join(f"{x:6.3f}" for x in row))
+    sizes = b['tie_sizes']
+    print("players sharing the top score: " + "  ".join(f"{j}: {sizes[j] / b['games']:.4f}"
+                                                         for j in range(1, len(sizes)) if sizes[j]))
+    print(f"agree within 4 SE: {rep['agree']} | per-game speedup x{rep['speedup']:.0f}")
+
+
+if __name__ == "__main__":
+    main()
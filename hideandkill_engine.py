@@ -0,0 +1,170 @@
+# hideandkill_engine.py
+# Hide & Kill rules without any UI: the game in Hide&kill.py plays through HideAndKillEngine, and
+# hideandkill_batch.py checks it against a NumPy version that plays many games at once.
+# A round: every player picks a room, one room is drawn as the safe room, the killer searches the
+# other rooms in a random order and everyone found loses POINTS_LOST. After MAX_ROUNDS rounds the
+# highest score wins; several players on the top score share the win.
+# Hiding strategies are pluggable for simulations: pick(rng, history) chooses a room for one game,
+# pick_batch(np, gen, last_safe) for a whole batch (last_safe: last round's safe room per game, 0
+# before the first round). STRATEGIES maps their names to them.
+import random
+from collections import namedtuple
+
+ROOM_COUNT = 8
+MAX_ROUNDS = 10
+POINTS_LOST = 1
+START_POINTS = 10
+MIN_PLAYERS = 2
+MAX_PLAYERS = 6
+
+# round number, the safe room, the order the killer searched the other rooms, players caught
+RoundResult = namedtuple('RoundResult', 'round safe_room search_order caught')
+
+
+class HideAndKillEngine:
+    """Scores and rounds of one Hide & Kill game."""
+
+    def __init__(self, player_names, rng=None, rounds=MAX_ROUNDS):
+        names = list(player_names)
+        if not MIN_PLAYERS <= len(names) <= MAX_PLAYERS:
+            raise ValueError(f"Please enter between {MIN_PLAYERS} and {MAX_PLAYERS} player names.")
+        if len(set(names)) != len(names):
+            raise ValueError("Player names must be different.")
+        self.player_names = names
+        self.rng = rng or random
+        self.rounds = rounds
+        self.scores = {name: START_POINTS for name in names}
+        self.current_round = 1
+        self.history = []
+
+    @property
+    def is_over(self):
+        return self.current_round > self.rounds
+
+    def draw_search(self):
+        """Draws the safe room and the order in which the killer searches the other rooms."""
+        rooms = list(range(1, ROOM_COUNT + 1))
+        safe_room = self.rng.choice(rooms)
+        order = [r for r in rooms if r != safe_room]
+        self.rng.shuffle(order)
+        return safe_room, order
+
+    def play_round(self, selections):
+        """Resolves the current round for {name: room} and returns its RoundResult.
+
+        Raises ValueError (with a message for the player) if a choice is missing or not a room.
+        """
+        for name in self.player_names:
+            room = selections.get(name)
+            if not isinstance(room, int) or not 1 <= room <= ROOM_COUNT:
+                raise ValueError(f"{name}: Room must be between 1 and {ROOM_COUNT}.")
+        if self.is_over:
+            raise ValueError("The game is over.")
+        safe_room, order = self.draw_search()
+        caught = [name for name in self.player_names if selections[name] != safe_room]
+        for name in caught:
+            self.scores[name] -= POINTS_LOST
+        result = RoundResult(self.current_round, safe_room, order, caught)
+        self.history.append(result)
+        return result
+
+    def next_round(self):
+        """Moves on to the next round; returns False once all rounds have been played."""
+        self.current_round += 1
+        return not self.is_over
+
+    def standings(self):
+        """[(name, score)], best first."""
+        return sorted(self.scores.items(), key=lambda item: item[1], reverse=True)
+
+    def winners(self):
+        """Everyone on the top score (more than one is a tie)."""
+        top = max(self.scores.values())
+        return [name for name in self.player_names if self.scores[name] == top]
+
+
+def play_game(strategies, rng=None, rounds=MAX_ROUNDS):
+    """Plays a whole game with one strategy per player; returns the finished engine."""
+    rng = rng or random
+    engine = HideAndKillEngine([f"P{i + 1}" for i in range(len(strategies))], rng, rounds)
+    while not engine.is_over:
+        picks = {name: s.pick(rng, engine.history) for name, s in zip(engine.player_names, strategies)}
+        engine.play_round(picks)
+        engine.next_round()
+    return engine
+
+
+# ---------- Hiding strategies ----------
+
+class RandomRoom:
+    """Any room, each equally likely."""
+    name = 'random'
+
+    def pick(self, rng, history):
+        return rng.randint(1, ROOM_COUNT)
+
+    def pick_batch(self, np, gen, last_safe):
+        return gen.integers(1, ROOM_COUNT + 1, last_safe.shape[0])
+
+
+class FixedRoom:
+    """Always the same room."""
+
+    def __init__(self, room=5):
+        if not 1 <= room <= ROOM_COUNT:
+            raise ValueError(f"Room must be between 1 and {ROOM_COUNT}.")
+        self.room = room
+        self.name = f'fixed:{room}'
+
+    def pick(self, rng, history):
+        return self.room
+
+    def pick_batch(self, np, gen, last_safe):
+        return np.full(last_safe.shape[0], self.room)
+
+
+class LastSafeRoom:
+    """The room that was safe last round (any room in the first)."""
+    name = 'last-safe'
+
+    def pick(self, rng, history):
+        return history[-1].safe_room if history else rng.randint(1, ROOM_COUNT)
+
+    def pick_batch(self, np, gen, last_safe):
+        return np.where(last_safe > 0, last_safe, gen.integers(1, ROOM_COUNT + 1, last_safe.shape[0]))
+
+
+class AvoidLastSafe:
+    """Any room except the one that was safe last round."""
+    name = 'avoid-last'
+
+    def pick(self, rng, history):
+        if not history:
+            return rng.randint(1, ROOM_COUNT)
+        room = rng.randint(1, ROOM_COUNT - 1)
+        return room + 1 if room >= history[-1].safe_room else room
+
+    def pick_batch(self, np, gen, last_safe):
+        room = gen.integers(1, ROOM_COUNT, last_safe.shape[0])
+        first = gen.integers(1, ROOM_COUNT + 1, last_safe.shape[0])
+        return np.where(last_safe > 0, room + (room >= last_safe), first)
+
+
+STRATEGIES = {
+    'random': RandomRoom,
+    'fixed': FixedRoom,
+    'last-safe': LastSafeRoom,
+    'avoid-last': AvoidLastSafe,
+}
+
+
+def make_strategy(text):
+    """'random', 'last-safe', 'avoid-last' or 'fixed:<room>' -> a strategy."""
+    kind, _, arg = text.partition(':')
+    if kind not in STRATEGIES:
+        raise ValueError(f"Unknown strategy {text!r} (choose from {', '.join(STRATEGIES)})")
+    if arg:
+        if kind != 'fixed' or not arg.isdigit():
+            raise ValueError(f"Bad strategy {text!r}")
+        return FixedRoom(int(arg))
+    return STRATEGIES[kind]()
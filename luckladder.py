@@ -1,8 +1,14 @@
 # luck_ladder_gui_simple.py
-# Luck Ladder — Simplified GUI with Mode selection (1 = vs Computer, 2 = 2-player hotseat)
+# Luck Ladder — Simplified GUI with Mode selection (1 = vs Computer, 2 = 2-player hotseat, 3 = party: players + bots)
+import os
 import random
+import struct
+import time
+from array import array
+from collections import namedtuple
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog, scrolledtext
+from luckladder_quiz import QuizDeck, QuizFile, answer_ok
 
 # ---------- Configuration ----------
 NUM_PATHS = 5
@@ -25,6 +31,13 @@ COMP_QUIZ_PROB = 0.55
 COMP_PUZZLE_PROB = 0.85
 COMP_ROUTE_ACCEPT_PROB = 0.5
 
+MAX_HUMANS = 4            # party mode: players at the keyboard
+MAX_BOTS = 500            # party mode: computer players in one game
+BOT_DELAY_MS = 500        # pause before bots move, so their turns can be followed
+BOT_LOG_LIMIT = 8         # with more bots than this, their moves are logged as one summary line
+RANK_ROWS = 10            # ranking view: the leaders, plus every human
+LOG_LINES = 300           # the game log keeps this many lines
+
 QUIZ_BANK = [
     ("Capital of Australia?", "canberra"),
     ("What is 2 + 2?", "4"),
@@ -38,6 +51,30 @@ QUIZ_BANK = [
     ("Which animal is known as king of the jungle?", "lion"),
     ("Which country has the Eiffel Tower?", "france"),
 ]
+# An external bank (see luckladder_quiz.py) replaces QUIZ_BANK when this file exists; its
+# questions are dealt without repeats for the whole session.
+QUIZ_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'luckladder_quiz.tsv')
+_quiz_bank = None                   # (QuizFile, QuizDeck) once opened, False if there is none
+
+def quiz_source():
+    global _quiz_bank
+    if _quiz_bank is None:
+        _quiz_bank = False
+        if os.path.exists(QUIZ_FILE):
+            try:
+                bank = QuizFile(QUIZ_FILE)
+                _quiz_bank = (bank, QuizDeck(len(bank)))
+            except (OSError, ValueError, UnicodeDecodeError):
+                pass
+    return _quiz_bank
+
+def draw_quiz(rng=random):
+    # the next question for a quiz tile: from the external bank's deck, else QUIZ_BANK
+    source = quiz_source()
+    if source:
+        bank, deck = source
+        return bank[deck.next()]
+    return rng.choice(QUIZ_BANK)
 
 # ---------- Game structures ----------
 class Tile:
@@ -63,37 +100,974 @@ class Path:
                 bad = set(random.sample(range(1, 11), BAD_NUMBERS_PER_TILE))
                 self.tiles.append(Tile('choice', bad_numbers=bad))
             elif r < CHOICE_TILE_RATIO + QUIZ_TILE_RATIO:
-                q = random.choice(QUIZ_BANK)
-                self.tiles.append(Tile('quiz', quiz=q))
+                self.tiles.append(Tile('quiz', quiz=draw_quiz()))
             elif r < CHOICE_TILE_RATIO + QUIZ_TILE_RATIO + GAMBLE_TILE_RATIO:
                 self.tiles.append(Tile('gamble'))
             else:
                 self.tiles.append(Tile('puzzle'))
 
+# ---------- Seeded boards ----------
+# A SeededBoard never stores its tiles: the tile at (path, step) is worked out from a counter-based
+# hash of (seed, path, step) the first time it is looked at, so a board costs nothing until it is
+# played, is the same on every machine and can be shared as a short code for its seed.
+# splitmix64 is the hash: the key picks a starting state and successive states give the draws.
+MASK64 = (1 << 64) - 1
+GOLDEN64 = 0x9E3779B97F4A7C15
+SEED_BITS = 40                      # new seeds fit an 8-character code
+CODE_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"   # Crockford base32
+
+def _splitmix64(x):
+    z = (x + GOLDEN64) & MASK64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & MASK64
+    return z ^ (z >> 31)
+
+def new_board_seed():
+    return random.getrandbits(SEED_BITS)
+
+def board_code(seed):
+    # seed -> "XXXX-XXXX" (longer for seeds past SEED_BITS)
+    chars = []
+    while True:
+        chars.append(CODE_ALPHABET[seed & 31])
+        seed >>= 5
+        if not seed and len(chars) >= SEED_BITS // 5:
+            break
+    code = ''.join(reversed(chars))
+    return '-'.join(code[i:i + 4] for i in range(0, len(code), 4))
+
+def parse_board_code(code):
+    # inverse of board_code; forgiving about case, dashes, spaces and O/I/L for 0/1
+    text = code.strip().upper().replace('-', '').replace(' ', '')
+    text = text.replace('O', '0').replace('I', '1').replace('L', '1')
+    if not text or len(text) > 13 or any(c not in CODE_ALPHABET for c in text):
+        raise ValueError(f"Not a board code: {code!r}")
+    seed = 0
+    for c in text:
+        seed = (seed << 5) | CODE_ALPHABET.index(c)
+    if seed > MASK64:
+        raise ValueError(f"Not a board code: {code!r}")
+    return seed
+
+class SeededBoard:
+    # list-of-Paths stand-in: board[p].tiles[i] is a Tile, derived on first use and then kept
+    def __init__(self, seed, num_paths=NUM_PATHS, length=PATH_LENGTH):
+        self.seed = seed
+        self.num_paths = num_paths
+        self.length = length
+        self._key = _splitmix64(seed & MASK64)
+        self._routes = {}
+        self._tiles = {}
+    def __len__(self): return self.num_paths
+    def __getitem__(self, p):
+        if p < 0: p += self.num_paths
+        if not 0 <= p < self.num_paths: raise IndexError("path index out of range")
+        return SeededPath(self, p)
+    def __iter__(self):
+        return (SeededPath(self, p) for p in range(self.num_paths))
+    def code(self): return board_code(self.seed)
+
+    def _state(self, path, step):
+        # starting hash state for one tile; step -1 is the path's route draw
+        return _splitmix64(self._key ^ ((path << 32) | (step & 0xFFFFFFFF)))
+
+    def route_pos(self, path):
+        pos = self._routes.get(path)
+        if pos is None:
+            hi = max(2, self.length - 1)
+            pos = 2 + _splitmix64(self._state(path, -1)) % (hi - 1)
+            self._routes[path] = pos
+        return pos
+
+    def tile(self, path, step):
+        key = path * self.length + step
+        tile = self._tiles.get(key)
+        if tile is None:
+            tile = self._tiles[key] = self._make_tile(path, step)
+        return tile
+
+    def _make_tile(self, path, step):
+        if step == self.route_pos(path):
+            return Tile('route', route_id=step)
+        state = self._state(path, step)
+        state = (state + GOLDEN64) & MASK64
+        r = (_splitmix64(state) >> 11) * (1.0 / (1 << 53))
+        if r < CHOICE_TILE_RATIO:
+            # partial Fisher-Yates over 1-10, one draw per bad number
+            numbers = list(range(1, 11))
+            for i in range(BAD_NUMBERS_PER_TILE):
+                state = (state + GOLDEN64) & MASK64
+                j = i + _splitmix64(state) % (10 - i)
+                numbers[i], numbers[j] = numbers[j], numbers[i]
+            return Tile('choice', bad_numbers=set(numbers[:BAD_NUMBERS_PER_TILE]))
+        if r < CHOICE_TILE_RATIO + QUIZ_TILE_RATIO:
+            if quiz_source():
+                # an external bank deals its own questions (the board layout stays the same)
+                return Tile('quiz', quiz=draw_quiz())
+            state = (state + GOLDEN64) & MASK64
+            return Tile('quiz', quiz=QUIZ_BANK[_splitmix64(state) % len(QUIZ_BANK)])
+        if r < CHOICE_TILE_RATIO + QUIZ_TILE_RATIO + GAMBLE_TILE_RATIO:
+            return Tile('gamble')
+        return Tile('puzzle')
+
+class SeededPath:
+    def __init__(self, board, index):
+        self.index = index
+        self.tiles = _SeededTiles(board, index)
+
+class _SeededTiles:
+    def __init__(self, board, path):
+        self.board = board; self.path = path
+    def __len__(self): return self.board.length
+    def __getitem__(self, i):
+        n = self.board.length
+        if i < 0: i += n
+        if not 0 <= i < n: raise IndexError("tile index out of range")
+        return self.board.tile(self.path, i)
+    def __iter__(self):
+        return (self.board.tile(self.path, i) for i in range(self.board.length))
+
+# Pre-balanced boards: seeds written by luckladder_balance.py, best first. Startup reads the header
+# and the seed array only. Layout: header, then `count` uint64 seeds, then `count` float32 spreads
+# (largest minus smallest expected finish time across paths, in turns).
+BALANCED_BOARDS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'luckladder_boards.llb')
+BALANCED_MAGIC = b'LLB1'
+BALANCED_HEADER = struct.Struct('<4sIHI')   # magic, count, num_paths, path_length
+
+def load_balanced_seeds(path=BALANCED_BOARDS):
+    # seeds of pre-balanced boards for this board size, or an empty array if there are none
+    seeds = array('Q')
+    try:
+        with open(path, 'rb') as f:
+            magic, count, paths, length = BALANCED_HEADER.unpack(f.read(BALANCED_HEADER.size))
+            if magic == BALANCED_MAGIC and (paths, length) == (NUM_PATHS, PATH_LENGTH):
+                seeds.fromfile(f, count)
+    except (OSError, EOFError, struct.error):
+        return array('Q')
+    return seeds
+
+# ---------- Rules engine (no Tk) ----------
+# resolve(player, tile, decision) looks up the tile type in TILE_RULES. Each rule takes the
+# player's position and path plus the decision (and the game's rng, for the gamble's treasure, and
+# its number of paths, for a route switch), and returns a TileOutcome. The decision depends on the tile type:
+#   choice -> number picked 1-10          quiz   -> True if answered correctly
+#   route  -> new path index, None stays  gamble -> number picked 1-5 (treasure drawn here)
+#   puzzle -> True if answered correctly
+# TileOutcome: type, decision, ok (good pick / correct / jackpot / switched), delta (steps moved,
+# after the floor at 0), pos and path afterwards, treasure (gamble only, else 0).
+TileOutcome = namedtuple('TileOutcome', 'type decision ok delta pos path treasure')
+
+def _rule_choice(tile, pos, path, pick, rng=random, num_paths=NUM_PATHS):
+    if pick in tile.bad_numbers:
+        new = max(0, pos - pick)
+        return TileOutcome('choice', pick, False, new - pos, new, path, 0)
+    return TileOutcome('choice', pick, True, pick, pos + pick, path, 0)
+
+def _rule_quiz(tile, pos, path, correct, rng=random, num_paths=NUM_PATHS):
+    if correct:
+        return TileOutcome('quiz', correct, True, QUIZ_FORWARD, pos + QUIZ_FORWARD, path, 0)
+    new = max(0, pos - QUIZ_BACK)
+    return TileOutcome('quiz', correct, False, new - pos, new, path, 0)
+
+def _rule_route(tile, pos, path, new_path, rng=random, num_paths=NUM_PATHS):
+    if new_path is None or new_path == path or not 0 <= new_path < num_paths:
+        return TileOutcome('route', new_path, False, 0, pos, path, 0)
+    return TileOutcome('route', new_path, True, 0, pos, new_path, 0)
+
+def _rule_gamble(tile, pos, path, pick, rng=random, num_paths=NUM_PATHS):
+    treasure = int(rng.random() * 5) + 1
+    if pick == treasure:
+        gain = pick * GAMBLE_MULTIPLIER
+        return TileOutcome('gamble', pick, True, gain, pos + gain, path, treasure)
+    new = max(0, pos - pick)
+    return TileOutcome('gamble', pick, False, new - pos, new, path, treasure)
+
+def _rule_puzzle(tile, pos, path, correct, rng=random, num_paths=NUM_PATHS):
+    if correct:
+        return TileOutcome('puzzle', correct, True, PUZZLE_FORWARD, pos + PUZZLE_FORWARD, path, 0)
+    new = max(0, pos - PUZZLE_BACK)
+    return TileOutcome('puzzle', correct, False, new - pos, new, path, 0)
+
+TILE_RULES = {
+    'choice': _rule_choice,
+    'quiz': _rule_quiz,
+    'route': _rule_route,
+    'gamble': _rule_gamble,
+    'puzzle': _rule_puzzle,
+}
+
+def computer_decision(tile, path, rng=random, num_paths=NUM_PATHS):
+    # what the computer does on a tile of a board with num_paths paths, using the COMP_* probabilities
+    # (int(random() * n) + 1 is randint(1, n) without its call overhead; bots call this a lot)
+    typ = tile.type
+    if typ == 'choice':
+        return int(rng.random() * 10) + 1
+    if typ == 'quiz':
+        return rng.random() < COMP_QUIZ_PROB
+    if typ == 'route':
+        if rng.random() < COMP_ROUTE_ACCEPT_PROB:
+            # any other path: one of num_paths - 1, skipping over this one
+            other = int(rng.random() * (num_paths - 1))
+            return other + (other >= path)
+        return None
+    if typ == 'gamble':
+        return int(rng.random() * 5) + 1
+    return rng.random() < COMP_PUZZLE_PROB
+
+# ---------- Hard computer (value iteration) ----------
+# The hard computer plays to finish in as few turns as it can. Value iteration over (path, step)
+# gives V, the expected turns left from each spot; on a tile it takes the decision with the
+# lowest expected V afterwards: which number to pick on a choice tile (it can see the bad ones),
+# whether and where to switch on a route tile, which chest to open. Quiz and puzzle outcomes stay
+# at the COMP_* odds. The decisions go in one table, so a turn is a lookup.
+class HardPolicy:
+    def __init__(self, paths, tol=1e-9, max_sweeps=10000):
+        self.num_paths = len(paths)
+        self.length = L = len(paths[0].tiles)
+        P = self.num_paths
+        self.tiles = [[paths[p].tiles[i] for i in range(L)] for p in range(P)]
+        V = [[0.0] * L for _ in range(P)]      # expected turns left at (path, step)
+        W = [[0.0] * L for _ in range(P)]      # expected turns left after the tile at (path, idx)
+        self.sweeps = 0
+        # Gauss-Seidel from the top: most moves go forward, so values settle in a few sweeps
+        while self.sweeps < max_sweeps:
+            self.sweeps += 1
+            change = 0.0
+            for s in range(L - 1, -1, -1):
+                for p in range(P):
+                    W[p][s] = min(self._option_values(p, s, V))[0]
+                for p in range(P):
+                    total = 0.0
+                    for d in range(1, DICE_SIDES + 1):
+                        if s + d < L:
+                            total += W[p][s + d - 1]
+                    v = 1.0 + total / DICE_SIDES
+                    change = max(change, abs(v - V[p][s]))
+                    V[p][s] = v
+            if change < tol:
+                break
+        self.values = V
+        # the table: number picked (choice, gamble), path switched to or -1 (route), 0 otherwise
+        self.table = array('b', bytes(P * L))
+        for p in range(P):
+            for i in range(L):
+                self.table[p * L + i] = min(self._option_values(p, i, V))[1]
+
+    def _option_values(self, p, idx, V):
+        # [(expected turns left, decision code)] for each choice the tile at (p, idx) offers
+        L = self.length
+        tile = self.tiles[p][idx]
+        n = idx + 1
+        def v(step, path=p):
+            return V[path][step] if step < L else 0.0
+        typ = tile.type
+        if typ == 'choice':
+            return [(v(max(0, n - k) if k in tile.bad_numbers else n + k), k) for k in range(1, 11)]
+        if typ == 'route':
+            # staying first, so a tie keeps the current path
+            return [(v(n), -1)] + [(v(n, q), q) for q in range(self.num_paths) if q != p]
+        if typ == 'gamble':
+            return [(v(n + g * GAMBLE_MULTIPLIER) / 5 + v(max(0, n - g)) * 4 / 5, g) for g in range(1, 6)]
+        if typ == 'quiz':
+            return [(COMP_QUIZ_PROB * v(n + QUIZ_FORWARD) + (1 - COMP_QUIZ_PROB) * v(max(0, n - QUIZ_BACK)), 0)]
+        return [(COMP_PUZZLE_PROB * v(n + PUZZLE_FORWARD) + (1 - COMP_PUZZLE_PROB) * v(max(0, n - PUZZLE_BACK)), 0)]
+
+    def decide(self, tile, path, idx, rng=random):
+        # same decisions as computer_decision takes, for the tile at (path, idx)
+        code = self.table[path * self.length + idx]
+        typ = tile.type
+        if typ in ('choice', 'gamble'):
+            return code
+        if typ == 'route':
+            return None if code < 0 else code
+        if typ == 'quiz':
+            return rng.random() < COMP_QUIZ_PROB
+        return rng.random() < COMP_PUZZLE_PROB
+
+    def decider(self, game):
+        # decide(tile, path, rng, num_paths) for play_turn / bot_round: the tile index is where the
+        # player whose turn it is (game.moving) has just landed
+        return lambda tile, path, rng=random, num_paths=None: self.decide(tile, path, game.pos[game.moving] - 1, rng)
+
 class LuckLadder:
-    def __init__(self):
-        self.reset_all()
-    def reset_all(self):
-        self.paths = [Path(PATH_LENGTH, i) for i in range(NUM_PATHS)]
-        self.p1_pos = 0
-        self.p2_pos = 0           # used for computer or player2
-        self.p1_path = None
-        self.p2_path = None
-    def roll(self): return random.randint(1, DICE_SIDES)
+    # Player state is struct-of-arrays: player k (1-based) is at pos[k-1] on path[k-1], path -1
+    # until chosen. Any number of players; turns go 1, 2, ..., players, 1, ...
+    # Dice, treasure and bot decisions come from self.rng: the random module unless a TurnMachine
+    # gives the game its own random.Random. The board's size is read from self.paths, so any board
+    # (a list of Paths, a SeededBoard, a CompactBoard of any size) can be put in there
+    def __init__(self, seed=None, players=2):
+        self.rng = random
+        self.reset_all(seed, players)
+    def reset_all(self, seed=None, players=2):
+        # seed None: a fresh board from the global RNG; else the SeededBoard for that seed
+        self.seed = seed
+        if seed is None:
+            self.paths = [Path(PATH_LENGTH, i) for i in range(NUM_PATHS)]
+        else:
+            self.paths = SeededBoard(seed)
+        self.seat(players)
+    def seat(self, players):
+        # fresh player arrays on the same board, everyone at the start without a path
+        self.players = players
+        self.pos = array('i', bytes(4 * players))
+        self.path = array('i', [-1]) * players
+        self.moving = 0           # index of the player whose turn is being played
+        self.landed = array('i', [-1]) * players   # tile each player last landed on, path * length + step
+    @property
+    def num_paths(self): return len(self.paths)
+    @property
+    def length(self): return len(self.paths[0].tiles)
+    def roll(self): return int(self.rng.random() * DICE_SIDES) + 1
     def winner(self):
-        if self.p1_pos >= PATH_LENGTH and self.p2_pos >= PATH_LENGTH: return 'tie'
-        if self.p1_pos >= PATH_LENGTH: return 'player1'
-        if self.p2_pos >= PATH_LENGTH: return 'player2'
+        # 'player<k>' once player k has reached the end, 'tie' if several have
+        end = self.length
+        done = [i for i in range(self.players) if self.pos[i] >= end]
+        if len(done) > 1: return 'tie'
+        if done: return f'player{done[0] + 1}'
+        return None
+    def ranking(self):
+        # player numbers, furthest along first (equal positions keep turn order)
+        pos = self.pos
+        return sorted(range(1, self.players + 1), key=lambda k: -pos[k - 1])
+
+    def advance(self, player, steps):
+        # move player k by a dice roll; returns (tile index, tile) landed on,
+        # or None if that reached the end of the path
+        i = player - 1
+        self.moving = i
+        pos = self.pos[i] + steps
+        self.pos[i] = pos
+        end = self.length
+        if pos >= end:
+            return None
+        idx = min(end - 1, max(0, pos - 1))
+        self.landed[i] = self.path[i] * end + idx
+        return idx, self.paths[self.path[i]].tiles[idx]
+
+    def resolve(self, player, tile, decision):
+        # apply a tile's effect for player k; returns the TileOutcome
+        i = player - 1
+        out = TILE_RULES[tile.type](tile, self.pos[i], self.path[i], decision, self.rng, self.num_paths)
+        self.pos[i] = out.pos; self.path[i] = out.path
+        return out
+
+    def play_turn(self, player, decide=computer_decision):
+        # one whole turn without any UI: roll, move, resolve the tile with
+        # decide(tile, path, rng, num_paths);
+        # returns (roll, tile index or None, TileOutcome or None)
+        d = self.roll()
+        landed = self.advance(player, d)
+        if landed is None:
+            return d, None, None
+        idx, tile = landed
+        path = self.path[player - 1]
+        return d, idx, self.resolve(player, tile, decide(tile, path, self.rng, self.num_paths))
+
+    def bot_round(self, players, decide=computer_decision, record=None):
+        # the turns of `players` (numbers, in turn order) in one pass over the arrays, the same
+        # rules as play_turn without its per-turn calls; stops at the first player to reach the end
+        # and returns their number, else None. record, if a list, gets
+        # (player, roll, tile index or None, TileOutcome or None) for each turn played
+        pos = self.pos; path = self.path; paths = self.paths; landed = self.landed
+        rules = TILE_RULES; end = self.length; n = len(paths); rng = self.rng; rnd = rng.random
+        for k in players:
+            i = k - 1
+            self.moving = i
+            d = int(rnd() * DICE_SIDES) + 1
+            p = pos[i] + d
+            pos[i] = p
+            if p >= end:
+                if record is not None:
+                    record.append((k, d, None, None))
+                return k
+            cur = path[i]
+            landed[i] = cur * end + p - 1
+            tile = paths[cur].tiles[p - 1]
+            out = rules[tile.type](tile, p, cur, decide(tile, cur, rng, n), rng, n)
+            pos[i] = out.pos; path[i] = out.path
+            if record is not None:
+                record.append((k, d, p - 1, out))
+            if out.pos >= end:
+                return k
         return None
 
+    def play_bot_game(self, p1_path, p2_path, decide=computer_decision, max_turns=10000):
+        # two players both played by `decide` from the start; returns (winner, turns taken)
+        self.pos[0] = self.pos[1] = 0
+        self.path[0] = p1_path; self.path[1] = p2_path
+        for turn in range(1, max_turns + 1):
+            self.play_turn(1 if turn % 2 else 2, decide)
+            w = self.winner()
+            if w:
+                return w, turn
+        return None, max_turns
+
+# ---------- Snapshots ----------
+# History for undo, redo and the timeline. A snapshot's player state is a persistent vector: a
+# 32-way trie of (pos, path) that is never changed in place. set() copies only the nodes on the
+# way to the slot (two for up to 1024 players) and shares the rest with the version before, so a
+# snapshot per turn costs a few small tuples however many players there are.
+# The RNG needs no copying either: the TurnMachine reseeds its own random.Random (game.rng) from
+# splitmix64(key + clock) before every transition, so a snapshot's clock is its whole random
+# state, and replaying from a snapshot rolls the same dice. The random module is left alone.
+PVEC_BITS = 5
+PVEC_WIDTH = 1 << PVEC_BITS
+PVEC_MASK = PVEC_WIDTH - 1
+
+class PVec:
+    __slots__ = ('size', 'shift', 'root')
+
+    def __init__(self, size, shift, root):
+        self.size = size
+        self.shift = shift          # bits below the root's level; 0 when the root is a leaf
+        self.root = root
+
+    @classmethod
+    def from_list(cls, items):
+        nodes = [tuple(items[i:i + PVEC_WIDTH]) for i in range(0, max(len(items), 1), PVEC_WIDTH)]
+        shift = 0
+        while len(nodes) > 1:
+            nodes = [tuple(nodes[i:i + PVEC_WIDTH]) for i in range(0, len(nodes), PVEC_WIDTH)]
+            shift += PVEC_BITS
+        return cls(len(items), shift, nodes[0])
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, i):
+        node = self.root
+        for level in range(self.shift, 0, -PVEC_BITS):
+            node = node[(i >> level) & PVEC_MASK]
+        return node[i & PVEC_MASK]
+
+    def __iter__(self):
+        def walk(node, level):
+            if level == 0:
+                yield from node
+            else:
+                for child in node:
+                    yield from walk(child, level - PVEC_BITS)
+        return walk(self.root, self.shift)
+
+    def set(self, i, value):
+        def put(node, level):
+            slot = (i >> level) & PVEC_MASK
+            child = value if level == 0 else put(node[slot], level - PVEC_BITS)
+            return node[:slot] + (child,) + node[slot + 1:]
+        return PVec(self.size, self.shift, put(self.root, self.shift))
+
+    def diff(self, other):
+        # indices where self and other (same size) differ; subtrees they share are skipped whole
+        out = []
+        def walk(a, b, level, base):
+            if a is b:
+                return
+            for j, (x, y) in enumerate(zip(a, b)):
+                if level == 0:
+                    if x != y:
+                        out.append(base + j)
+                else:
+                    walk(x, y, level - PVEC_BITS, base + (j << level))
+        walk(self.root, other.root, self.shift, 0)
+        return out
+
+# players: PVec of (pos, path, landed); the rest is the TurnMachine's. Taken whenever a human is next to
+# act (and when the game ends), so undo always lands where someone can play on.
+Snapshot = namedtuple('Snapshot', 'players turn state clock')
+
+# Save file: header, one byte per player (0 human, 1 bot), then each snapshot as
+# SAVE_SNAP and the players that changed since the snapshot before (the first against the
+# start: everyone at 0 without a path) as SAVE_ENTRY each.
+SAVE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'luckladder_save.lls')
+SAVE_MAGIC = b'LLS2'
+SAVE_HEADER = struct.Struct('<4sQHBQII')    # magic, board seed, players, mode, rng key, snapshots, current
+SAVE_SNAP = struct.Struct('<HBQI')          # turn, state, clock, players changed
+SAVE_ENTRY = struct.Struct('<Hihi')         # player index, pos, path, tile last landed on
+SAVE_ENTRY_V1 = struct.Struct('<Hih')       # LLS1 saves: no landed tile, loaded as -1
+START_PLAYER = (0, -1, -1)                  # at the start, no path, nothing landed on
+SAVE_STATES = ('pick', 'roll', 'bots', 'over')
+
+def save_game(machine, mode, path=SAVE_FILE):
+    game = machine.game
+    if game.seed is None:
+        raise ValueError("Only boards with a board code can be saved.")
+    out = bytearray(SAVE_HEADER.pack(SAVE_MAGIC, game.seed, game.players, mode, machine.key,
+                                     len(machine.history), machine.at))
+    out += bytes(0 if kind == 'human' else 1 for kind in machine.kinds)
+    prev = PVec.from_list([START_PLAYER] * game.players)
+    for snap in machine.history:
+        changed = snap.players.diff(prev)
+        out += SAVE_SNAP.pack(snap.turn, SAVE_STATES.index(snap.state), snap.clock, len(changed))
+        for i in changed:
+            out += SAVE_ENTRY.pack(i, *snap.players[i])
+        prev = snap.players
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(out)
+    os.replace(tmp, path)
+    return len(out)
+
+def load_game(path=SAVE_FILE):
+    # -> (LuckLadder on the saved board, kinds, mode, rng key, history, current snapshot)
+    with open(path, 'rb') as f:
+        data = f.read()
+    try:
+        magic, seed, players, mode, key, count, at = SAVE_HEADER.unpack_from(data)
+        if magic not in (SAVE_MAGIC, b'LLS1'):
+            raise ValueError("Not a Luck Ladder save file.")
+        entry = SAVE_ENTRY if magic == SAVE_MAGIC else SAVE_ENTRY_V1
+        off = SAVE_HEADER.size
+        kinds = ['human' if b == 0 else 'bot' for b in data[off:off + players]]
+        off += players
+        vec = PVec.from_list([START_PLAYER] * players)
+        history = []
+        for _ in range(count):
+            turn, state, clock, changed = SAVE_SNAP.unpack_from(data, off)
+            off += SAVE_SNAP.size
+            for _ in range(changed):
+                i, pos, p, *landed = entry.unpack_from(data, off)
+                off += entry.size
+                vec = vec.set(i, (pos, p, landed[0] if landed else -1))
+            history.append(Snapshot(vec, turn, SAVE_STATES[state], clock))
+    except (struct.error, IndexError):
+        raise ValueError("Save file is damaged.")
+    if len(kinds) != players or not history or not 0 <= at < count:
+        raise ValueError("Save file is damaged.")
+    return LuckLadder(seed, players), kinds, mode, key, history, at
+
+# ---------- Turn state machine ----------
+# A game as explicit states. Nothing here waits for input: the GUI feeds it button presses and
+# timer ticks, a headless run (run()) feeds it answers directly.
+#   'pick'    a human has no start path yet: prompt offers the paths, answer(path)
+#   'roll'    a human's turn: waits for roll()
+#   'answer'  that human is on a tile: prompt says what is asked, answer(value)
+#   'bots'    bots to move: step() plays every bot up to the next human in one bot_round
+#   'over'    result holds game.winner()
+# What happens goes to on_event(player, text), player None for lines about the whole game.
+
+# what a human is asked: options are the values answer() takes (numbers; paths, None = stay on
+# this one), or None when the answer is typed
+Prompt = namedtuple('Prompt', 'type text options')
+
+class TurnMachine:
+    def __init__(self, game, kinds, decide=computer_decision, names=None, on_event=None, key=None):
+        self.game = game
+        self.kinds = kinds                  # 'human' or 'bot' for each player
+        self.decide = decide                # bots' decide(tile, path, rng, num_paths)
+        self.names = names or [f"Player {k}" if kind == 'human' else f"Bot {k}" for k, kind in enumerate(kinds, 1)]
+        self.on_event = on_event or (lambda player, text: None)
+        self.bots = kinds.count('bot')
+        self.state = None
+        self.turn = 1                       # the player whose turn (or path pick) it is
+        self.prompt = None
+        self.tile = None                    # (tile index, tile) a human is answering for
+        self.result = None
+        self._product = None                # puzzle answer
+        self._runs = {}                     # first bot -> the bots that move together from there
+        self.key = random.getrandbits(64) if key is None else key
+        self.clock = 0                      # transitions so far; with key, the RNG state
+        self.rng = random.Random()          # the game's dice, treasure and bot decisions
+        game.rng = self.rng
+        self.history = []                   # Snapshots, oldest first
+        self.at = -1                        # the one the game is at (or mid-turn from)
+        self._players = None                # PVec of (pos, path, landed), kept up to date as players move
+
+    def _reseed(self):
+        self.rng.seed(_splitmix64((self.key + self.clock) & MASK64))
+        self.clock += 1
+
+    def _touch(self, players):
+        vec = self._players
+        game = self.game
+        for k in players:
+            vec = vec.set(k - 1, (game.pos[k - 1], game.path[k - 1], game.landed[k - 1]))
+        self._players = vec
+
+    def _record(self):
+        # a new snapshot drops any undone ones after the current
+        del self.history[self.at + 1:]
+        self.history.append(Snapshot(self._players, self.turn, self.state, self.clock))
+        self.at = len(self.history) - 1
+
+    def start(self):
+        # bots without a path get a random one; humans without one are asked
+        self._reseed()
+        for k, kind in enumerate(self.kinds, 1):
+            if kind == 'bot' and self.game.path[k - 1] < 0:
+                self.game.path[k - 1] = self.rng.randrange(self.game.num_paths)
+        self._players = PVec.from_list(list(zip(self.game.pos, self.game.path, self.game.landed)))
+        self._next_pick()
+
+    def _next_pick(self):
+        for k in range(1, self.game.players + 1):
+            if self.game.path[k - 1] < 0:
+                self.turn = k
+                self.state = 'pick'
+                self.prompt = self._pick_prompt()
+                self._record()
+                return
+        self._begin(1)
+
+    def _pick_prompt(self):
+        return Prompt('path', "Choose your path:", tuple(range(self.game.num_paths)))
+
+    def _begin(self, player):
+        self.turn = player
+        self.prompt = self.tile = None
+        self.state = 'roll' if self.kinds[player - 1] == 'human' else 'bots'
+        if self.state == 'roll':
+            self._record()
+
+    def _finish(self, player):
+        self.result = f'player{player}'
+        self.state = 'over'
+        self.prompt = self.tile = None
+        self._record()
+
+    def roll(self):
+        # a human's roll; False if it is not a human's turn to roll
+        if self.state != 'roll':
+            return False
+        k = self.turn
+        self._reseed()
+        d = self.game.roll()
+        self.on_event(k, f"Roll: {d}")
+        landed = self.game.advance(k, d)
+        if landed is None:
+            self.on_event(k, "Reached destination!")
+            self._touch([k])
+            self._finish(k)
+            return True
+        idx, tile = landed
+        self.on_event(k, f"Landed on tile {idx+1}: {tile.type.upper()}")
+        self.tile = landed
+        self.prompt = self._ask(k, tile)
+        self.state = 'answer'
+        return True
+
+    def _ask(self, player, tile):
+        if tile.type == 'choice':
+            return Prompt('choice', f"Bad numbers here: {sorted(tile.bad_numbers)}\nChoose a number 1–10:", tuple(range(1, 11)))
+        if tile.type == 'quiz':
+            return Prompt('quiz', tile.quiz[0], None)
+        if tile.type == 'route':
+            here = self.game.path[player - 1]
+            return Prompt('route', "Switch to another path at same step index?", (None,) + tuple(p for p in range(self.game.num_paths) if p != here))
+        if tile.type == 'gamble':
+            return Prompt('gamble', "Pick 1–5:", tuple(range(1, 6)))
+        a = self.rng.randint(2,9); b = self.rng.randint(2,9)
+        self._product = a * b
+        return Prompt('puzzle', f"What is {a} × {b}?", None)
+
+    def answer(self, value):
+        # a human's answer to the prompt; False (and nothing changes) if it is not one it takes
+        if self.state not in ('pick', 'answer'):
+            return False
+        if self.prompt.options is not None:
+            if value not in self.prompt.options:
+                return False
+        elif value is None or not str(value).strip():
+            return False
+        k = self.turn
+        self._reseed()
+        if self.state == 'pick':
+            self.game.path[k - 1] = value
+            self.on_event(k, f"Chose Path {value+1}.")
+            self._touch([k])
+            self._next_pick()
+            return True
+        idx, tile = self.tile
+        if tile.type in ('quiz', 'puzzle'):
+            value = str(value).strip()       # a headless caller may pass the number itself
+        if tile.type == 'quiz':
+            value = answer_ok(tile.quiz, value)
+        elif tile.type == 'puzzle':
+            value = value.isdigit() and int(value) == self._product
+        out = self.game.resolve(k, tile, value)
+        self.on_event(k, self._human_text(tile, out))
+        self._touch([k])
+        if out.pos >= self.game.length:
+            self._finish(k)
+        else:
+            self._begin(k % self.game.players + 1)
+        return True
+
+    def _human_text(self, tile, out):
+        if out.type == 'choice':
+            if out.ok:
+                return f"Chose {out.decision} — GOOD. Move forward {out.decision} -> {out.pos}"
+            return f"Chose {out.decision} — BAD. Move back {out.decision} -> {out.pos}"
+        if out.type == 'quiz':
+            if out.ok:
+                return f"Quiz correct! +{QUIZ_FORWARD} -> {out.pos}"
+            return f"Quiz wrong. Answer: {tile.quiz[1]}. -{QUIZ_BACK} -> {out.pos}"
+        if out.type == 'route':
+            return f"Switched to Path {out.path+1}." if out.ok else "Stayed on same path."
+        if out.type == 'gamble':
+            return f"Gamble: picked {out.decision}; treasure {out.treasure}. {out.delta:+d} -> {out.pos}"
+        if out.ok:
+            return f"Puzzle correct! +{PUZZLE_FORWARD} -> {out.pos}"
+        return f"Puzzle wrong. Correct {self._product}. -{PUZZLE_BACK} -> {out.pos}"
+
+    def _run_from(self, player):
+        # the bots that move one after another from `player`: up to the next human, or one round
+        run = self._runs.get(player)
+        if run is None:
+            n = self.game.players
+            run = []
+            k = player
+            while self.kinds[k - 1] == 'bot' and len(run) < n:
+                run.append(k)
+                k = k % n + 1
+            self._runs[player] = run
+        return run
+
+    def step(self):
+        # every bot turn up to the next human, in one pass; False if it is not the bots' turn
+        if self.state != 'bots':
+            return False
+        run = self._run_from(self.turn)
+        record = [] if self.bots <= BOT_LOG_LIMIT else None
+        self._reseed()
+        won = self.game.bot_round(run, self.decide, record)
+        self._touch(run)
+        if record is not None:
+            for k, d, idx, out in record:
+                for text in self._bot_lines(d, idx, out):
+                    self.on_event(k, text)
+        if won:
+            self._finish(won)
+            if record is None:
+                self.on_event(won, "Reached destination!")
+            return True
+        if record is None:
+            leader = self.game.ranking()[0]
+            self.on_event(None, f"{len(run)} bots moved. {self.names[leader - 1]} leads at step {self.game.pos[leader - 1]}.")
+        self._begin(run[-1] % self.game.players + 1)
+        return True
+
+    def _bot_lines(self, d, idx, out):
+        lines = [f"Roll: {d}"]
+        if idx is None:
+            return lines + ["Reached destination!"]
+        lines.append(f"Landed on tile {idx+1}: {out.type.upper()}")
+        if out.type == 'choice':
+            tile = self.game.paths[out.path].tiles[idx]
+            lines.append(f"Picks {out.decision} (bad set: {sorted(tile.bad_numbers)})")
+            lines.append(f"{'Good' if out.ok else 'Bad'} -> {out.delta:+d} -> {out.pos}")
+        elif out.type == 'quiz':
+            lines.append(f"Quiz attempt: {'correct' if out.ok else 'wrong'} {out.delta:+d} -> {out.pos}")
+        elif out.type == 'route':
+            lines.append(f"Switched to Path {out.path+1}." if out.ok else "Stayed on path.")
+        elif out.type == 'gamble':
+            lines.append(f"Gambles {out.decision}; treasure {out.treasure}")
+            lines.append(f"{'Jackpot' if out.ok else 'Lost'} {out.delta:+d} -> {out.pos}")
+        else:
+            lines.append(f"Puzzle -> {'correct' if out.ok else 'wrong'} {out.delta:+d} -> {out.pos}")
+        return lines
+
+    def restore(self, i):
+        # back (or forward) to snapshot i; playing on from there replaces the ones after it
+        snap = self.history[i]
+        self.at = i
+        game = self.game
+        for j, (pos, path, landed) in enumerate(snap.players):
+            game.pos[j] = pos; game.path[j] = path; game.landed[j] = landed
+        self._players = snap.players
+        self.turn, self.state, self.clock = snap.turn, snap.state, snap.clock
+        self.tile = None
+        self.prompt = self._pick_prompt() if self.state == 'pick' else None
+        self.result = game.winner() if self.state == 'over' else None
+
+    def undo(self):
+        # to the start of the turn in progress, or to the human turn before; False if none
+        i = self.at if self.state in ('answer', 'bots') else self.at - 1
+        if i < 0:
+            return False
+        self.restore(i)
+        return True
+
+    def redo(self):
+        if self.at + 1 >= len(self.history):
+            return False
+        self.restore(self.at + 1)
+        return True
+
+    def run(self, respond, max_steps=1000000):
+        # plays to the end without a UI, respond(player, prompt) answering for the humans;
+        # returns the result (None if max_steps ran out)
+        if self.state is None:
+            self.start()
+        for _ in range(max_steps):
+            if self.state == 'over':
+                break
+            if self.state == 'bots':
+                self.step()
+            elif self.state == 'roll':
+                self.roll()
+            elif not self.answer(respond(self.turn, self.prompt)):
+                raise ValueError(f"{self.names[self.turn - 1]}: {self.prompt.type} answer not accepted")
+        return self.result
+
 # ---------- GUI ----------
+class BoardView:
+    # Every path and tile on one canvas, drawn once per board. Tiles stay hidden (gray) until
+    # someone lands on them, then take their type's color; a turn only recolors those tiles and
+    # moves tokens, each tween running at FPS frames a second. Boards up to ITEM_TILES tiles are a
+    # rectangle item per tile; bigger ones are a single PhotoImage with a block of pixels per tile,
+    # recolored with put(), so even thousands of paths cost one canvas item. Column 0 is the
+    # start, the column after the last step the finish.
+    ITEM_TILES = 5000
+    WIDTH, HEIGHT = 760, 190
+    LEFT, TOP = 30, 4
+    MAX_CELL = 30
+    FPS = 30
+    MOVE_MS = 300               # how long a token takes to reach its new spot
+    HIDDEN = '#3a4654'
+    COLORS = {'choice': '#4aa3ff', 'quiz': '#ffd166', 'route': '#b084f5', 'gamble': '#ff9f43', 'puzzle': '#06d6a0'}
+    TOKENS = ('#e63946', '#f1faee', '#2a9d8f', '#f4a261')      # humans, by player number; bots gray
+
+    def __init__(self, parent):
+        frame = ttk.Frame(parent)
+        self.frame = frame
+        self.canvas = tk.Canvas(frame, width=self.WIDTH, height=self.HEIGHT, background='#1d2630', highlightthickness=0)
+        xs = ttk.Scrollbar(frame, orient='horizontal', command=self.canvas.xview)
+        ys = ttk.Scrollbar(frame, orient='vertical', command=self.canvas.yview)
+        self.canvas.configure(xscrollcommand=xs.set, yscrollcommand=ys.set)
+        self.canvas.grid(row=0, column=0, sticky="nsew")
+        ys.grid(row=0, column=1, sticky="ns")
+        xs.grid(row=1, column=0, sticky="we")
+        frame.columnconfigure(0, weight=1)
+        self.paths = None
+        self.tokens = []
+        self._anim = {}             # token index -> (x0, y0, x1, y1, start time)
+        self._job = None
+
+    def draw(self, game):
+        # the board: tiles all hidden, no tokens yet
+        c = self.canvas
+        c.delete('all')
+        self._stop()
+        self.paths = game.paths
+        P, L = game.num_paths, game.length
+        self.length = L
+        cell = min(self.MAX_CELL, (self.WIDTH - self.LEFT) // (L + 2), (self.HEIGHT - self.TOP) // P)
+        self.cell = cell = max(1, cell)
+        x0 = self.LEFT + cell       # step 1; the start column is left of it
+        w, h = L * cell, P * cell
+        self.revealed = bytearray(P * L)
+        if P * L <= self.ITEM_TILES:
+            self.image = None
+            self.tiles = [c.create_rectangle(x0 + i * cell, self.TOP + p * cell, x0 + (i + 1) * cell, self.TOP + (p + 1) * cell,
+                                             fill=self.HIDDEN, outline='#1d2630')
+                          for p in range(P) for i in range(L)]
+        else:
+            self.tiles = None
+            self.image = tk.PhotoImage(width=w, height=h)
+            self.image.put(self.HIDDEN, to=(0, 0, w, h))
+            c.create_image(x0, self.TOP, image=self.image, anchor='nw')
+        c.create_rectangle(x0 - cell, self.TOP, x0, self.TOP + h, fill='#2b3a2b', outline='')
+        c.create_rectangle(x0 + w, self.TOP, x0 + w + cell, self.TOP + h, fill='#5a4b1a', outline='')
+        if cell >= 10:
+            for p in range(P):
+                c.create_text(self.LEFT - 4, self.TOP + p * cell + cell // 2, text=str(p + 1), fill='gray', anchor='e')
+        c.configure(scrollregion=(0, 0, x0 + w + cell + 4, self.TOP + h + 4))
+        self.tokens = []
+
+    def _spot(self, player, pos, path):
+        # token center for a player at pos on path; players sharing a tile are spread a little
+        cell = self.cell
+        col = pos if pos < self.length else self.length + 1
+        x = self.LEFT + (col + 0.5) * cell
+        y = self.TOP + (max(path, 0) + 0.5) * cell
+        if cell >= 12:
+            x += (player % 3 - 1) * cell / 4
+            y += (player // 3 % 3 - 1) * cell / 4
+        return x, y
+
+    def _reveal(self, at):
+        if self.revealed[at]:
+            return
+        self.revealed[at] = 1
+        p, i = divmod(at, self.length)
+        color = self.COLORS[self.paths[p].tiles[i].type]
+        if self.image is None:
+            self.canvas.itemconfigure(self.tiles[at], fill=color)
+        else:
+            cell = self.cell
+            self.image.put(color, to=(i * cell, p * cell, (i + 1) * cell, (p + 1) * cell))
+
+    def sync(self, game, kinds=None):
+        # catch the view up with the game: tiles landed on since last time, tokens that moved.
+        # kinds ('human'/'bot' per player) places tokens; None means no game is running
+        if game.paths is not self.paths:
+            self.draw(game)
+        c = self.canvas
+        if kinds is None or len(kinds) != len(self.tokens):
+            for item, _, _ in self.tokens:
+                c.delete(item)
+            self._anim.clear()
+            self.tokens = []
+            if kinds is None:
+                return
+            r = max(2, self.cell * 0.3)
+            for k, kind in enumerate(kinds):
+                x, y = self._spot(k, game.pos[k], game.path[k])
+                color = self.TOKENS[k] if kind == 'human' and k < len(self.TOKENS) else '#8d99ae'
+                item = c.create_oval(x - r, y - r, x + r, y + r, fill=color, outline='black', tags=kind)
+                self.tokens.append((item, game.pos[k], game.path[k]))
+            c.tag_raise('human')
+        now = time.perf_counter()
+        for k, (item, pos, path) in enumerate(self.tokens):
+            if game.landed[k] >= 0:
+                self._reveal(game.landed[k])
+            if game.pos[k] != pos or game.path[k] != path:
+                start = self._anim.get(k)
+                x0, y0 = self._current(k, now) if start else self._spot(k, pos, path)
+                x1, y1 = self._spot(k, game.pos[k], game.path[k])
+                self._anim[k] = (x0, y0, x1, y1, now)
+                self.tokens[k] = (item, game.pos[k], game.path[k])
+        if self._anim and self._job is None:
+            self._job = c.after(1000 // self.FPS, self._frame)
+
+    def _current(self, k, now):
+        x0, y0, x1, y1, start = self._anim[k]
+        t = min(1.0, (now - start) * 1000 / self.MOVE_MS)
+        t = t * t * (3 - 2 * t)     # ease in and out
+        return x0 + (x1 - x0) * t, y0 + (y1 - y0) * t
+
+    def _frame(self):
+        # one animation frame: every token still on its way moves a step
+        self._job = None
+        now = time.perf_counter()
+        c = self.canvas
+        r = max(2, self.cell * 0.3)
+        for k in list(self._anim):
+            x, y = self._current(k, now)
+            c.coords(self.tokens[k][0], x - r, y - r, x + r, y + r)
+            if now - self._anim[k][4] >= self.MOVE_MS / 1000:
+                del self._anim[k]
+        if self._anim:
+            self._job = c.after(1000 // self.FPS, self._frame)
+
+    def _stop(self):
+        if self._job is not None:
+            self.canvas.after_cancel(self._job)
+            self._job = None
+        self._anim.clear()
+
 class App:
     def __init__(self, root):
         self.root = root
-        root.title("Luck Ladder — Simple (Mode: vs Computer / 2-player)")
-        self.game = LuckLadder()
-        self.mode = tk.IntVar(value=1)  # 1 = vs Computer, 2 = two-player
-        self.current_turn = 'p1'  # 'p1' or 'p2' during play
+        root.title("Luck Ladder — Simple (Mode: vs Computer / 2-player / party)")
+        self.balanced = load_balanced_seeds()
+        self.game = LuckLadder(self._board_seed())
+        self.machine = None       # TurnMachine once a game is started
+        self.mode = tk.IntVar(value=1)  # 1 = vs Computer, 2 = two-player, 3 = party (humans + bots)
+        self.difficulty = tk.StringVar(value='normal')
+        self._hard = None         # (paths, HardPolicy) for the board it was solved on
+        self._bot_job = None      # pending root.after for the bots' step
+        self._latency = []        # ms the event loop spent on each turn event
         self._build_ui()
         self._refresh_ui()
 
@@ -111,15 +1085,16 @@ class App:
         mode_frame.grid(row=0, column=1, sticky="w", padx=(6,12))
         ttk.Radiobutton(mode_frame, text="1 — vs Computer", variable=self.mode, value=1, command=self._on_mode_change).grid(row=0, column=0)
         ttk.Radiobutton(mode_frame, text="2 — 2 Players (hotseat)", variable=self.mode, value=2, command=self._on_mode_change).grid(row=0, column=1)
+        ttk.Radiobutton(mode_frame, text="3 — Party", variable=self.mode, value=3, command=self._on_mode_change).grid(row=0, column=2)
 
         ttk.Label(top, text="Player1 Path:").grid(row=0, column=2, sticky="w")
         self.p1_path_var = tk.StringVar(value="1")
-        self.p1_path_combo = ttk.Combobox(top, textvariable=self.p1_path_var, values=[str(i+1) for i in range(NUM_PATHS)], width=4, state='readonly')
+        self.p1_path_combo = ttk.Combobox(top, textvariable=self.p1_path_var, values=[str(i+1) for i in range(self.game.num_paths)], width=4, state='readonly')
         self.p1_path_combo.grid(row=0, column=3, padx=(6,12))
 
         ttk.Label(top, text="Player2 Path:").grid(row=0, column=4, sticky="w")
         self.p2_path_var = tk.StringVar(value="2")
-        self.p2_path_combo = ttk.Combobox(top, textvariable=self.p2_path_var, values=[str(i+1) for i in range(NUM_PATHS)], width=4, state='readonly')
+        self.p2_path_combo = ttk.Combobox(top, textvariable=self.p2_path_var, values=[str(i+1) for i in range(self.game.num_paths)], width=4, state='readonly')
         self.p2_path_combo.grid(row=0, column=5, padx=(6,12))
 
         self.start_btn = ttk.Button(top, text="Start (lock)", command=self.start_game)
@@ -131,71 +1106,233 @@ class App:
         self.challenges_btn.grid(row=0, column=8, padx=6)
         self.pathinfo_btn = ttk.Button(top, text="Path Info", command=self.show_path_info)
         self.pathinfo_btn.grid(row=0, column=9, padx=6)
+        self.code_btn = ttk.Button(top, text="Board Code", command=self.board_code_dialog)
+        self.code_btn.grid(row=0, column=10, padx=6)
+
+        # party mode: how many humans (players 1..n, the rest pick their path in turn) and bots
+        party = ttk.Frame(top)
+        party.grid(row=1, column=1, columnspan=5, sticky="w", pady=(6,0))
+        ttk.Label(party, text="Party — humans:").grid(row=0, column=0, sticky="w")
+        self.humans_var = tk.IntVar(value=1)
+        self.humans_spin = ttk.Spinbox(party, from_=1, to=MAX_HUMANS, textvariable=self.humans_var, width=4, state='readonly')
+        self.humans_spin.grid(row=0, column=1, padx=(6,12))
+        ttk.Label(party, text="bots:").grid(row=0, column=2, sticky="w")
+        self.bots_var = tk.IntVar(value=20)
+        self.bots_spin = ttk.Spinbox(party, from_=1, to=MAX_BOTS, textvariable=self.bots_var, width=5)
+        self.bots_spin.grid(row=0, column=3, padx=6)
 
         # Middle: status + roll
         mid = ttk.Frame(main, padding=(0,8))
         mid.grid(row=1, column=0, sticky="we")
-        self.status_lbl = ttk.Label(mid, text="Positions — P1: 0 | P2/Comp: 0", font=('Segoe UI', 10, 'bold'))
+        self.status_lbl = ttk.Label(mid, text="Choose paths and Start.", font=('Segoe UI', 10, 'bold'))
         self.status_lbl.grid(row=0, column=0, sticky="w")
         self.tile_lbl = ttk.Label(mid, text="Current tile: -")
         self.tile_lbl.grid(row=0, column=1, sticky="w", padx=12)
         self.roll_btn = ttk.Button(mid, text="Roll (Player 1)", command=self.roll_action, state='disabled')
         self.roll_btn.grid(row=0, column=2, padx=8)
+        ttk.Label(mid, text="Computer:").grid(row=0, column=3, sticky="w", padx=(12,0))
+        self.difficulty_combo = ttk.Combobox(mid, textvariable=self.difficulty, values=['normal', 'hard'], width=7, state='readonly')
+        self.difficulty_combo.grid(row=0, column=4, padx=6)
+        self.latency_lbl = ttk.Label(mid, text="", foreground='gray')
+        self.latency_lbl.grid(row=0, column=5, sticky="w", padx=12)
 
-        # Bottom: two logs side-by-side (Player1 | Player2/Computer)
+        # Timeline: a snapshot whenever a human is next to play; undo/redo step through them,
+        # the slider jumps anywhere, and playing on from an earlier one replaces what came after
+        timeline = ttk.Frame(mid)
+        timeline.grid(row=1, column=0, columnspan=6, sticky="w", pady=(6,0))
+        self.undo_btn = ttk.Button(timeline, text="Undo", command=self.undo_action, state='disabled')
+        self.undo_btn.grid(row=0, column=0, padx=(0,6))
+        self.redo_btn = ttk.Button(timeline, text="Redo", command=self.redo_action, state='disabled')
+        self.redo_btn.grid(row=0, column=1, padx=(0,6))
+        self.timeline_scale = ttk.Scale(timeline, from_=0, to=0, orient='horizontal', length=320, command=self._on_scrub)
+        self.timeline_scale.grid(row=0, column=2, padx=6)
+        self.timeline_lbl = ttk.Label(timeline, text="Turn 0/0")
+        self.timeline_lbl.grid(row=0, column=3, sticky="w", padx=6)
+        self.save_btn = ttk.Button(timeline, text="Save", command=self.save_action)
+        self.save_btn.grid(row=0, column=4, padx=(12,6))
+        self.load_btn = ttk.Button(timeline, text="Resume", command=self.load_action)
+        self.load_btn.grid(row=0, column=5, padx=6)
+
+        # Board: paths, tiles revealed so far and every player's token
+        self.board = BoardView(main)
+        self.board.frame.grid(row=2, column=0, sticky="we")
+
+        # Input panel: what the player on turn is asked, answered in place (no dialog windows).
+        # Built once; each prompt shows the typed-answer row or as many option buttons as it needs.
+        self.ask_frame = ttk.Frame(main, padding=(0,4))
+        self.ask_frame.grid(row=3, column=0, sticky="we")
+        self.ask_lbl = ttk.Label(self.ask_frame, text="", font=('Segoe UI', 10, 'bold'))
+        self.ask_lbl.grid(row=0, column=0, columnspan=12, sticky="w")
+        self.ask_var = tk.StringVar()
+        self.ask_entry = ttk.Entry(self.ask_frame, textvariable=self.ask_var, width=30)
+        self.ask_entry.bind('<Return>', lambda e: self._answer_action(self.ask_var.get()))
+        self.ask_ok = ttk.Button(self.ask_frame, text="Answer", command=lambda: self._answer_action(self.ask_var.get()))
+        self.ask_buttons = [ttk.Button(self.ask_frame) for _ in range(10)]     # more are added for bigger boards
+        self.ask_hint = ttk.Label(self.ask_frame, text="", foreground='red')
+        self.ask_hint.grid(row=2, column=0, columnspan=12, sticky="w")
+        self.ask_frame.grid_remove()
+
+        # Bottom: ranking (leaders and every human) | game log
         bottom = ttk.Frame(main)
-        bottom.grid(row=2, column=0, sticky="nsew", pady=(8,0))
-        # player1 log
+        bottom.grid(row=4, column=0, sticky="nsew", pady=(8,0))
         left_frame = ttk.Frame(bottom)
         left_frame.grid(row=0, column=0, sticky="nsew", padx=(0,8))
-        ttk.Label(left_frame, text="Player 1 Log").grid(row=0, column=0, sticky="w")
-        self.p1_log = scrolledtext.ScrolledText(left_frame, width=60, height=20, state='disabled', wrap='word')
-        self.p1_log.grid(row=1, column=0, pady=6)
-        # player2/computer log
+        ttk.Label(left_frame, text="Ranking").grid(row=0, column=0, sticky="w")
+        self.rank_view = ttk.Treeview(left_frame, columns=('rank', 'player', 'path', 'step'), show='headings', height=RANK_ROWS + MAX_HUMANS)
+        for col, title, width in (('rank', '#', 40), ('player', 'Player', 120), ('path', 'Path', 60), ('step', 'Step', 70)):
+            self.rank_view.heading(col, text=title)
+            self.rank_view.column(col, width=width, anchor='center')
+        self.rank_view.grid(row=1, column=0, pady=6, sticky="nsew")
         right_frame = ttk.Frame(bottom)
         right_frame.grid(row=0, column=1, sticky="nsew")
-        self.right_label = ttk.Label(right_frame, text="Computer Log")
-        self.right_label.grid(row=0, column=0, sticky="w")
-        self.p2_log = scrolledtext.ScrolledText(right_frame, width=40, height=20, state='disabled', wrap='word')
-        self.p2_log.grid(row=1, column=0, pady=6)
+        ttk.Label(right_frame, text="Game Log").grid(row=0, column=0, sticky="w")
+        self.log = scrolledtext.ScrolledText(right_frame, width=60, height=20, state='disabled', wrap='word')
+        self.log.grid(row=1, column=0, pady=6)
 
         # winner label
         self.winner_lbl = ttk.Label(main, text="", font=('Segoe UI', 11, 'bold'))
-        self.winner_lbl.grid(row=3, column=0, sticky="w", pady=(6,0))
+        self.winner_lbl.grid(row=5, column=0, sticky="w", pady=(6,0))
 
         # layout config
         self.root.columnconfigure(0, weight=1)
         main.columnconfigure(0, weight=1)
-        bottom.columnconfigure(0, weight=3)
-        bottom.columnconfigure(1, weight=2)
+        bottom.columnconfigure(0, weight=2)
+        bottom.columnconfigure(1, weight=3)
 
         # initialize UI state
         self._on_mode_change()
 
     # ---------- UI helpers ----------
-    def _append_p1(self, text):
-        self.p1_log.configure(state='normal')
-        self.p1_log.insert('1.0', text + "\n")
-        self.p1_log.configure(state='disabled')
-
-    def _append_p2(self, text):
-        self.p2_log.configure(state='normal')
-        self.p2_log.insert('1.0', text + "\n")
-        self.p2_log.configure(state='disabled')
+    def _log(self, text):
+        # newest first; only the last LOG_LINES are kept
+        self.log.configure(state='normal')
+        self.log.insert('1.0', text + "\n")
+        self.log.delete(f'{LOG_LINES + 1}.0', 'end')
+        self.log.configure(state='disabled')
 
     def _clear_logs(self):
-        self.p1_log.configure(state='normal'); self.p1_log.delete('1.0','end'); self.p1_log.configure(state='disabled')
-        self.p2_log.configure(state='normal'); self.p2_log.delete('1.0','end'); self.p2_log.configure(state='disabled')
+        self.log.configure(state='normal'); self.log.delete('1.0','end'); self.log.configure(state='disabled')
+
+    def _on_event(self, player, text):
+        # TurnMachine events
+        self._log(f"{self.machine.names[player - 1]}: {text}" if player else text)
+
+    def _name(self, player):
+        return self.machine.names[player - 1]
 
     def _refresh_ui(self):
-        self.status_lbl.config(text=f"Positions — P1: {self.game.p1_pos} | P2/Comp: {self.game.p2_pos}")
+        m = self.machine
+        if m is None:
+            self.status_lbl.config(text="Choose paths and Start.")
+            self.roll_btn.config(text="Roll (Player 1)")
+            self._refresh_ranking()
+            self._refresh_timeline()
+            self.board.sync(self.game)
+            return
+        pos = self.game.pos
+        if self.game.players <= 4:
+            self.status_lbl.config(text="Positions — " + " | ".join(f"{self._name(k)}: {pos[k - 1]}" for k in range(1, self.game.players + 1)))
+        else:
+            leader = self.game.ranking()[0]
+            self.status_lbl.config(text=f"{self.game.players} players — leader {self._name(leader)} at step {pos[leader - 1]}")
+        self.roll_btn.config(text=f"Roll ({self._name(m.turn)})")
+        self._refresh_ranking()
+        self._refresh_timeline()
+        self.board.sync(self.game, m.kinds)
+
+    def _refresh_timeline(self):
+        m = self.machine
+        last = len(m.history) - 1 if m else 0
+        at = max(m.at, 0) if m else 0
+        self.timeline_scale.config(to=max(last, 1))
+        self.timeline_scale.set(at)
+        self.timeline_lbl.config(text=f"Turn {at}/{last}")
+        can_undo = m is not None and (m.at > 0 or (m.at == 0 and m.state in ('answer', 'bots')))
+        self.undo_btn.config(state='normal' if can_undo else 'disabled')
+        self.redo_btn.config(state='normal' if m is not None and m.at < last else 'disabled')
+
+    def _refresh_ranking(self):
+        # the top RANK_ROWS plus any human below them; rows are reused, not rebuilt
+        rows = []
+        if self.machine is not None:
+            kinds = self.machine.kinds
+            for rank, k in enumerate(self.game.ranking(), start=1):
+                if rank <= RANK_ROWS or kinds[k - 1] == 'human':
+                    path = self.game.path[k - 1]
+                    rows.append((rank, self._name(k), path + 1 if path >= 0 else '-', f"{self.game.pos[k - 1]}/{self.game.length}"))
+        items = self.rank_view.get_children()
+        for item, values in zip(items, rows):
+            self.rank_view.item(item, values=values)
+        for values in rows[len(items):]:
+            self.rank_view.insert('', 'end', values=values)
+        if len(items) > len(rows):
+            self.rank_view.delete(*items[len(rows):])
+
+    def _show_prompt(self, prompt):
+        # fills the input panel for a TurnMachine prompt
+        name = self._name(self.machine.turn)
+        self.ask_lbl.config(text=f"{name} — {prompt.text}")
+        self.ask_hint.config(text="")
+        if prompt.options is None:
+            self.ask_var.set("")
+            self.ask_entry.grid(row=1, column=0, padx=(0,6), pady=4, sticky="w")
+            self.ask_ok.grid(row=1, column=1, pady=4)
+            self.ask_entry.focus_set()
+            for btn in self.ask_buttons:
+                btn.grid_remove()
+        else:
+            self.ask_entry.grid_remove()
+            self.ask_ok.grid_remove()
+            while len(self.ask_buttons) < len(prompt.options):
+                self.ask_buttons.append(ttk.Button(self.ask_frame))
+            for i, btn in enumerate(self.ask_buttons):
+                if i < len(prompt.options):
+                    value = prompt.options[i]
+                    if prompt.type in ('path', 'route'):
+                        label = "Stay" if value is None else f"Path {value+1}"
+                    else:
+                        label = str(value)
+                    btn.config(text=label, command=lambda v=value: self._answer_action(v))
+                    btn.grid(row=1, column=i, padx=2, pady=4)
+                else:
+                    btn.grid_remove()
+        self.ask_frame.grid()
+
+    def _show_state(self):
+        # puts the UI in line with the machine's state after every transition
+        m = self.machine
+        self._refresh_ui()
         self.tile_lbl.config(text="Current tile: -")
-        self.winner_lbl.config(text="")
-        # update roll button label based on turn and mode
-        if self.mode.get() == 1:
-            self.roll_btn.config(text="Roll (Player 1)" if self.current_turn == 'p1' else "Roll (Computer)")
+        if m.state in ('pick', 'answer'):
+            self.roll_btn.config(state='disabled')
+            if m.tile is not None:
+                idx, tile = m.tile
+                self.tile_lbl.config(text=f"Current tile: {tile.describe_short()} (step {idx+1})")
+            self._show_prompt(m.prompt)
+            return
+        self.ask_frame.grid_remove()
+        if m.state != 'over':
+            self.winner_lbl.config(text="")
+        if m.state == 'roll':
+            self.roll_btn.config(state='normal')
+        elif m.state == 'bots':
+            self.roll_btn.config(state='disabled')
+            self._cancel_bots()
+            self._bot_job = self.root.after(BOT_DELAY_MS, self._bot_action)
         else:
-            self.roll_btn.config(text="Roll (Player 1)" if self.current_turn == 'p1' else "Roll (Player 2)")
+            self._end_and_show_winner(m.result)
+
+    def _timed(self, event, *args):
+        # runs one turn event and the redraw it causes, recording how long the event loop was busy;
+        # returns what the event returned
+        start = time.perf_counter()
+        done = event(*args)
+        self._show_state()
+        self.root.update_idletasks()
+        ms = (time.perf_counter() - start) * 1000
+        self._latency.append(ms)
+        self.latency_lbl.config(text=f"UI latency: {ms:.1f} ms (worst {max(self._latency):.1f} ms over {len(self._latency)} events)")
+        return done
 
     # ---------- info dialogs ----------
     def show_challenges_info(self):
@@ -217,368 +1354,242 @@ class App:
             for t in path.tiles:
                 counts[t.type] = counts.get(t.type, 0) + 1
             lines.append(f"Path {i}: choice {counts.get('choice',0)}, quiz {counts.get('quiz',0)}, gamble {counts.get('gamble',0)}, puzzle {counts.get('puzzle',0)}, route {counts.get('route',0)}")
+        # exact finish times from the Markov analysis (imported here: it imports this module)
+        from luckladder_markov import board_forecast, turns_within
+        lines.append("")
+        lines.append("Turns to finish from the start, playing like the computer:")
+        for i, f in enumerate(board_forecast(self.game), start=1):
+            within = turns_within(f, 0.9)
+            lines.append(f"Path {i}: {f.expected:.1f} on average (± {f.sd:.1f})" + (f", 90% within {within}" if within else ""))
+        if self.game.seed is not None:
+            lines.insert(0, f"Board code: {board_code(self.game.seed)}\n")
         messagebox.showinfo("Paths Summary", "\n".join(lines))
 
+    def board_code_dialog(self):
+        # show this board's code and offer to load another one (restarts the game)
+        current = board_code(self.game.seed) if self.game.seed is not None else "(not shareable)"
+        code = simpledialog.askstring("Board Code", f"This board: {current}\n\nEnter a code to load that board:", parent=self.root)
+        if not code:
+            return
+        try:
+            seed = parse_board_code(code)
+        except ValueError as e:
+            messagebox.showerror("Board Code", str(e))
+            return
+        self._new_board(seed)
+        self._log(f"Loaded board {board_code(seed)}. Choose paths and Start.")
+
     # ---------- start/reset ----------
     def _on_mode_change(self):
-        # toggle the visibility/label for second path selection and right log header
+        # the second path pick is for player 2 (or the computer); the party counts only for mode 3
         if self.mode.get() == 1:
-            # vs computer
-            self.right_label.config(text="Computer Log")
-            # default second path combo to a different path
-            # keep p2 combo enabled so user can pick or leave
-            self.p2_path_combo.set(str((int(self.p1_path_var.get()) % NUM_PATHS) + 1))
-            self.p2_path_combo.config(state='readonly')
-        else:
-            # two-player
-            self.right_label.config(text="Player 2 Log")
-            self.p2_path_combo.config(state='readonly')
+            # vs computer: default the computer to a different path; it is picked again at Start
+            self.p2_path_combo.set(str((int(self.p1_path_var.get()) % self.game.num_paths) + 1))
+        self.p2_path_combo.config(state='readonly')
+        party = 'readonly' if self.mode.get() == 3 else 'disabled'
+        self.humans_spin.config(state=party)
+        self.bots_spin.config(state='normal' if party == 'readonly' else 'disabled')
         self._refresh_ui()
 
+    def _bot_decide(self):
+        if self.difficulty.get() == 'hard':
+            return self._hard_policy().decider(self.game)
+        return computer_decision
+
+    def _bot_path(self, avoid=None):
+        # a bot's start path: the fastest one for the hard computer, else any; `avoid` if possible
+        paths = range(self.game.num_paths)
+        choices = [p for p in paths if p != avoid] or list(paths)
+        if self.difficulty.get() == 'hard':
+            values = self._hard_policy().values
+            return min(choices, key=lambda p: values[p][0])
+        return random.choice(choices)
+
     def start_game(self):
+        if self.machine is not None and self.machine.state != 'over':
+            messagebox.showinfo("Start", "A game is in progress. Reset to start another.")
+            return
+        mode = self.mode.get()
         try:
             p1 = int(self.p1_path_var.get()) - 1
-        except:
-            messagebox.showinfo("Select Path", "Choose player1 path (1-5).")
+            p2 = int(self.p2_path_var.get()) - 1
+        except ValueError:
+            messagebox.showinfo("Select Path", f"Choose the paths (1-{self.game.num_paths}).")
             return
-    
-        # set player1 path
-        self.game.p1_path = p1
-    
-        if self.mode.get() == 1:
-            # vs computer: auto-choose computer path (different from p1 if possible)
-            choices = list(range(NUM_PATHS))
-            if len(choices) > 1:
-                if p1 in choices:
-                    choices.remove(p1)
-            p2 = random.choice(choices)
-            # reflect selection in UI and lock it
-            self.p2_path_var.set(str(p2+1))
-            self.p2_path_combo.config(state='disabled')
-            self._append_p1(f"Player1 chose Path {p1+1}.")
-            self._append_p2(f"Computer chosen Path {p2+1}.")
-            self.game.p2_path = p2
+        if mode == 1:
+            kinds = ['human', 'bot']
+            names = ["Player 1", "Computer"]
+        elif mode == 2:
+            kinds = ['human', 'human']
+            names = None
         else:
-            # two-player: read p2 selection
             try:
-                p2 = int(self.p2_path_var.get()) - 1
-            except:
-                messagebox.showinfo("Select Path", "Choose player2 path (1-5).")
+                humans = int(self.humans_var.get()); bots = int(self.bots_var.get())
+            except (ValueError, tk.TclError):
+                humans = bots = 0
+            if not (1 <= humans <= MAX_HUMANS and 1 <= bots <= MAX_BOTS):
+                messagebox.showinfo("Party", f"Choose 1-{MAX_HUMANS} humans and 1-{MAX_BOTS} bots.")
                 return
-            self.game.p2_path = p2
-            self._append_p1(f"Player1 chose Path {p1+1}.")
-            self._append_p2(f"Player2 chose Path {p2+1}.")
-            # keep p2 combo locked for consistency
-            self.p2_path_combo.config(state='disabled')
-    
-        # lock player1 combo and enable roll button
+            kinds = ['human'] * humans + ['bot'] * bots
+            names = [f"Player {k}" for k in range(1, humans + 1)] + [f"Bot {k}" for k in range(1, bots + 1)]
+        if self.machine is not None:
+            # a finished game: same board, new players
+            self._cancel_bots()
+            self.winner_lbl.config(text="")
+            self._clear_logs()
+        self.game.seat(len(kinds))
+        self.game.path[0] = p1
+        if kinds[1] == 'human':
+            self.game.path[1] = p2
+        else:
+            # vs computer: a different path from player 1's; party bots go anywhere
+            for k in range(2, len(kinds) + 1):
+                self.game.path[k - 1] = self._bot_path(p1 if mode == 1 else None)
+            if mode == 1:
+                self.p2_path_var.set(str(self.game.path[1] + 1))
+        self.machine = TurnMachine(self.game, kinds, self._bot_decide(), names, self._on_event)
+        for k in range(1, min(len(kinds), BOT_LOG_LIMIT) + 1):
+            if self.game.path[k - 1] >= 0:
+                self._log(f"{self._name(k)} chose Path {self.game.path[k - 1] + 1}.")
+        if len(kinds) > BOT_LOG_LIMIT:
+            self._log(f"{len(kinds)} players: {kinds.count('human')} human, {kinds.count('bot')} bots.")
         self.p1_path_combo.config(state='disabled')
-        self.roll_btn.config(state='normal')
-        self.current_turn = 'p1'
-        self._refresh_ui()
+        self.p2_path_combo.config(state='disabled')
+        self._timed(self.machine.start)
 
     def reset_game(self):
         if not messagebox.askyesno("Reset", "Reset game and regenerate paths?"):
             return
-        self.game = LuckLadder()
+        self._new_board(self._board_seed())
+        self._log(f"Game reset (board {board_code(self.game.seed)}). Choose paths and Start.")
+
+    def _board_seed(self):
+        # a pre-balanced board when luckladder_balance.py has made some, else any board
+        if self.balanced:
+            return random.choice(self.balanced)
+        return new_board_seed()
+
+    def _new_board(self, seed):
+        self._cancel_bots()
+        self.game = LuckLadder(seed)
+        self.machine = None
+        self.roll_btn.config(state='disabled')
         self.p1_path_combo.config(state='readonly')
         self.p2_path_combo.config(state='readonly')
+        self.ask_frame.grid_remove()
+        self.winner_lbl.config(text="")
         self._clear_logs()
         self._refresh_ui()
-        self._append_p1("Game reset. Choose paths and Start.")
-        self._append_p2("Game reset.")
 
-    # ---------- turn action ----------
-    def roll_action(self):
-        if self.current_turn == 'p1':
-            self._player1_turn()
-        else:
-            if self.mode.get() == 1:
-                # computer turn
-                self._computer_turn()
-            else:
-                # player2 human turn
-                self._player2_turn()
+    def _cancel_bots(self):
+        if self._bot_job is not None:
+            self.root.after_cancel(self._bot_job)
+            self._bot_job = None
 
-    # ---------- player1 logic ----------
-    def _player1_turn(self):
-        self.roll_btn.config(state='disabled')
-        if self.game.p1_path is None:
+    # ---------- turn events ----------
+    # Each one feeds the TurnMachine a single transition and returns to the event loop; the next
+    # step waits on a button (roll, answer) or, for bots, on a root.after timer.
+    def roll_action(self):
+        if self.machine is None:
             messagebox.showinfo("Start", "Choose paths and Start first.")
             return
-        if self.winner_lbl.cget("text"):
+        if self.machine.state == 'over':
             messagebox.showinfo("Game over", "Match finished. Reset to play again.")
             return
-        d = self.game.roll()
-        self._append_p1(f"Roll: {d}")
-        self.game.p1_pos += d
-        if self.game.p1_pos >= PATH_LENGTH:
-            self._append_p1("Player1 reached destination!")
-            self._end_and_show_winner('player1')
-            return
-        idx = min(PATH_LENGTH - 1, max(0, self.game.p1_pos - 1))
-        tile = self.game.paths[self.game.p1_path].tiles[idx]
-        self.tile_lbl.config(text=f"Current tile: {tile.describe_short()} (step {idx+1})")
-        self._append_p1(f"Landed on tile {idx+1}: {tile.type.upper()}")
-        self._resolve_tile_for_human(player=1, tile=tile, tile_idx=idx)
-        self._refresh_ui()
-        w = self.game.winner()
-        if w:
-            self._end_and_show_winner(w)
+        if self.machine.state == 'roll':
+            self._timed(self.machine.roll)
+
+    def _answer_action(self, value):
+        if self.machine is None:
             return
-        if self.mode.get() == 1:
-            # in vs-computer mode, automatically run computer turn after a short delay
-            self._refresh_ui()
-            self.root.after(500, self._computer_turn)
-        else:
-            # two-player mode: switch to player 2 and wait for their button press
-            self.current_turn = 'p2'
-            self._refresh_ui()
-    # ---------- player2 logic (human) ----------
+        if not self._timed(self.machine.answer, value):
+            self.ask_hint.config(text="Please answer to continue.")
 
-    def _player2_turn(self):
-        if self.game.p2_path is None:
-            messagebox.showinfo("Start", "Choose paths and Start first.")
+    def _bot_action(self):
+        self._bot_job = None
+        if self.machine is None or self.machine.state != 'bots':
             return
-        if self.winner_lbl.cget("text"):
+        # difficulty can change mid-game
+        self.machine.decide = self._bot_decide()
+        self._timed(self.machine.step)
+
+    # ---------- timeline ----------
+    def undo_action(self):
+        if self.machine is not None:
+            self._cancel_bots()
+            if self._timed(self.machine.undo):
+                self._log(f"Undo: back to {self._name(self.machine.turn)}'s turn.")
+
+    def redo_action(self):
+        if self.machine is not None:
+            self._cancel_bots()
+            if self._timed(self.machine.redo):
+                self._log(f"Redo: {self._name(self.machine.turn)}'s turn.")
+
+    def _on_scrub(self, value):
+        m = self.machine
+        if m is None or not m.history:
             return
-        d = self.game.roll()
-        self._append_p2(f"Roll: {d}")
-        self.game.p2_pos += d
-        if self.game.p2_pos >= PATH_LENGTH:
-            self._append_p2("Player2 reached destination!")
-            self._end_and_show_winner('player2')
+        i = min(int(round(float(value))), len(m.history) - 1)
+        if i != m.at:
+            self._cancel_bots()
+            self._timed(m.restore, i)
+
+    def save_action(self):
+        if self.machine is None:
+            messagebox.showinfo("Save", "Start a game first.")
             return
-        idx = min(PATH_LENGTH - 1, max(0, self.game.p2_pos - 1))
-        tile = self.game.paths[self.game.p2_path].tiles[idx]
-        self.tile_lbl.config(text=f"Current tile: {tile.describe_short()} (step {idx+1})")
-        self._append_p2(f"Landed on tile {idx+1}: {tile.type.upper()}")
-        self._resolve_tile_for_human(player=2, tile=tile, tile_idx=idx)
-        self._refresh_ui()
-        w = self.game.winner()
-        if w:
-            self._end_and_show_winner(w)
+        try:
+            size = save_game(self.machine, self.mode.get())
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Save", str(e))
             return
-        # switch back to player1
-        self.current_turn = 'p1'
-        self._refresh_ui()
+        self._log(f"Saved {len(self.machine.history)} turns ({size} bytes) to {os.path.basename(SAVE_FILE)}.")
 
-    # ---------- computer logic ----------
-    def _computer_turn(self):
-        if self.game.p2_path is None:
-            return
-        if self.winner_lbl.cget("text"):
+    def load_action(self):
+        try:
+            game, kinds, mode, key, history, at = load_game()
+        except FileNotFoundError:
+            messagebox.showinfo("Resume", "No saved game yet.")
             return
-        d = self.game.roll()
-        self._append_p2(f"Roll: {d}")
-        self.game.p2_pos += d
-        if self.game.p2_pos >= PATH_LENGTH:
-            self._append_p2("Computer reached destination!")
-            self._end_and_show_winner('player2')
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Resume", str(e))
             return
-        idx = min(PATH_LENGTH - 1, max(0, self.game.p2_pos - 1))
-        tile = self.game.paths[self.game.p2_path].tiles[idx]
-        self._append_p2(f"Landed on tile {idx+1}: {tile.type.upper()}")
-        # explicit computer choices visible in log
-        if tile.type == 'choice':
-            pick = random.randint(1,10)
-            self._append_p2(f"Computer picks {pick} (bad set: {sorted(list(tile.bad_numbers))})")
-            if pick in tile.bad_numbers:
-                self.game.p2_pos = max(0, self.game.p2_pos - pick)
-                self._append_p2(f"Bad -> -{pick} -> {self.game.p2_pos}")
-            else:
-                self.game.p2_pos += pick
-                self._append_p2(f"Good -> +{pick} -> {self.game.p2_pos}")
-        elif tile.type == 'quiz':
-            ok = random.random() < COMP_QUIZ_PROB
-            self._append_p2(f"Computer quiz attempt: {'correct' if ok else 'wrong'}")
-            if ok:
-                self.game.p2_pos += QUIZ_FORWARD
-                self._append_p2(f"+{QUIZ_FORWARD} -> {self.game.p2_pos}")
-            else:
-                self.game.p2_pos = max(0, self.game.p2_pos - QUIZ_BACK)
-                self._append_p2(f"-{QUIZ_BACK} -> {self.game.p2_pos}")
-        elif tile.type == 'route':
-            do_switch = random.random() < COMP_ROUTE_ACCEPT_PROB
-            if do_switch:
-                choices = [i for i in range(NUM_PATHS) if i != self.game.p2_path]
-                newp = random.choice(choices)
-                self.game.p2_path = newp
-                self._append_p2(f"Computer switched to Path {newp+1}.")
-            else:
-                self._append_p2("Computer stayed on path.")
-        elif tile.type == 'gamble':
-            pick = random.randint(1,5)
-            treasure = random.randint(1,5)
-            self._append_p2(f"Computer gambles {pick}; treasure {treasure}")
-            if pick == treasure:
-                gain = pick * GAMBLE_MULTIPLIER
-                self.game.p2_pos += gain
-                self._append_p2(f"Jackpot +{gain} -> {self.game.p2_pos}")
-            else:
-                self.game.p2_pos = max(0, self.game.p2_pos - pick)
-                self._append_p2(f"Lost -{pick} -> {self.game.p2_pos}")
-        elif tile.type == 'puzzle':
-            a = random.randint(2,9); b = random.randint(2,9)
-            ok = random.random() < COMP_PUZZLE_PROB
-            self._append_p2(f"Computer puzzle {a}×{b} -> {'correct' if ok else 'wrong'}")
-            if ok:
-                self.game.p2_pos += PUZZLE_FORWARD
-                self._append_p2(f"+{PUZZLE_FORWARD} -> {self.game.p2_pos}")
-            else:
-                self.game.p2_pos = max(0, self.game.p2_pos - PUZZLE_BACK)
-                self._append_p2(f"-{PUZZLE_BACK} -> {self.game.p2_pos}")
-        # after computer turn, back to p1
-        # enable roll again for player1 (if game not finished)
-        if not self.winner_lbl.cget("text"):
-            self.roll_btn.config(state='normal')
-
-        self._refresh_ui()
-        self.current_turn = 'p1'
-        self._refresh_ui()
-        w = self.game.winner()
-        if w:
-            self._end_and_show_winner(w)
-
-    # ---------- tile resolution for humans (player 1 or 2) ----------
-    def _resolve_tile_for_human(self, player, tile, tile_idx):
-        # player: 1 or 2
-        def append(player_id, text):
-            if player_id == 1:
-                self._append_p1(text)
-            else:
-                self._append_p2(text)
-
-        if tile.type == 'choice':
-            bad = sorted(list(tile.bad_numbers))
-            while True:
-                ans = simpledialog.askstring("Number Choice", f"Bad numbers here: {bad}\nChoose a number 1–10:")
-                if ans is None:
-                    messagebox.showinfo("Required", "Please choose a number to continue.")
-                    continue
-                if ans.isdigit() and 1 <= int(ans) <= 10:
-                    pick = int(ans); break
-                messagebox.showinfo("Invalid", "Enter 1–10.")
-            if player == 1:
-                if pick in tile.bad_numbers:
-                    self.game.p1_pos = max(0, self.game.p1_pos - pick)
-                    append(1, f"You chose {pick} — BAD. Move back {pick} -> {self.game.p1_pos}")
-                else:
-                    self.game.p1_pos += pick
-                    append(1, f"You chose {pick} — GOOD. Move forward {pick} -> {self.game.p1_pos}")
-            else:
-                if pick in tile.bad_numbers:
-                    self.game.p2_pos = max(0, self.game.p2_pos - pick)
-                    append(2, f"You chose {pick} — BAD. Move back {pick} -> {self.game.p2_pos}")
-                else:
-                    self.game.p2_pos += pick
-                    append(2, f"You chose {pick} — GOOD. Move forward {pick} -> {self.game.p2_pos}")
-
-        elif tile.type == 'quiz':
-            q, a = tile.quiz
-            ans = simpledialog.askstring("Quiz", q)
-            if ans is None:
-                messagebox.showinfo("Required", "Please answer the quiz.")
-                return self._resolve_tile_for_human(player, tile, tile_idx)
-            correct = ans.strip().lower() == a.strip().lower()
-            if player == 1:
-                if correct:
-                    self.game.p1_pos += QUIZ_FORWARD
-                    append(1, f"Quiz correct! +{QUIZ_FORWARD} -> {self.game.p1_pos}")
-                else:
-                    self.game.p1_pos = max(0, self.game.p1_pos - QUIZ_BACK)
-                    append(1, f"Quiz wrong. Answer: {a}. -{QUIZ_BACK} -> {self.game.p1_pos}")
-            else:
-                if correct:
-                    self.game.p2_pos += QUIZ_FORWARD
-                    append(2, f"Quiz correct! +{QUIZ_FORWARD} -> {self.game.p2_pos}")
-                else:
-                    self.game.p2_pos = max(0, self.game.p2_pos - QUIZ_BACK)
-                    append(2, f"Quiz wrong. Answer: {a}. -{QUIZ_BACK} -> {self.game.p2_pos}")
-
-        elif tile.type == 'route':
-            do_switch = messagebox.askyesno("Route", "Switch to another path at same step index?")
-            if do_switch:
-                choices = [i for i in range(NUM_PATHS) if i != (self.game.p1_path if player==1 else self.game.p2_path)]
-                pick = simpledialog.askinteger("Switch Path", f"Available: {[c+1 for c in choices]}\nEnter path number:")
-                if pick is None or (pick-1) not in choices:
-                    messagebox.showinfo("Cancelled", "Invalid or cancelled. Staying.")
-                    append(player, "Stayed on same path.")
-                else:
-                    if player == 1:
-                        self.game.p1_path = pick-1
-                    else:
-                        self.game.p2_path = pick-1
-                    append(player, f"Switched to Path {pick}.")
-            else:
-                append(player, "Stayed on same path.")
-
-        elif tile.type == 'gamble':
-            while True:
-                ans = simpledialog.askstring("Gamble", "Pick 1–5:")
-                if ans is None:
-                    messagebox.showinfo("Required", "Please pick a number.")
-                    continue
-                if ans.isdigit() and 1 <= int(ans) <= 5:
-                    pick = int(ans); break
-                messagebox.showinfo("Invalid", "Enter 1–5.")
-            treasure = random.randint(1,5)
-            if player == 1:
-                if pick == treasure:
-                    gain = pick * GAMBLE_MULTIPLIER
-                    self.game.p1_pos += gain
-                    append(1, f"Gamble: picked {pick}; treasure {treasure}. +{gain} -> {self.game.p1_pos}")
-                else:
-                    self.game.p1_pos = max(0, self.game.p1_pos - pick)
-                    append(1, f"Gamble: picked {pick}; treasure {treasure}. -{pick} -> {self.game.p1_pos}")
-            else:
-                if pick == treasure:
-                    gain = pick * GAMBLE_MULTIPLIER
-                    self.game.p2_pos += gain
-                    append(2, f"Gamble: picked {pick}; treasure {treasure}. +{gain} -> {self.game.p2_pos}")
-                else:
-                    self.game.p2_pos = max(0, self.game.p2_pos - pick)
-                    append(2, f"Gamble: picked {pick}; treasure {treasure}. -{pick} -> {self.game.p2_pos}")
+        self._new_board(game.seed)
+        self.game = game
+        self.mode.set(mode)
+        self._on_mode_change()
+        if mode == 1:
+            names = ["Player 1", "Computer"]
+        else:
+            humans = kinds.count('human')
+            names = [f"Player {k}" for k in range(1, humans + 1)] + [f"Bot {k}" for k in range(1, len(kinds) - humans + 1)]
+        self.machine = TurnMachine(game, kinds, self._bot_decide(), names, self._on_event, key)
+        self.machine.history = history
+        self.p1_path_combo.config(state='disabled')
+        self.p2_path_combo.config(state='disabled')
+        self._log(f"Resumed board {board_code(game.seed)} at turn {at} of {len(history) - 1}.")
+        self._timed(self.machine.restore, at)
 
-        elif tile.type == 'puzzle':
-            a = random.randint(2,9); b = random.randint(2,9)
-            ans = simpledialog.askstring("Puzzle (multiplication)", f"What is {a} × {b}?")
-            if ans is None:
-                messagebox.showinfo("Required", "Please answer.")
-                return self._resolve_tile_for_human(player, tile, tile_idx)
-            if ans.isdigit() and int(ans) == a*b:
-                if player == 1:
-                    self.game.p1_pos += PUZZLE_FORWARD
-                    append(1, f"Puzzle correct! +{PUZZLE_FORWARD} -> {self.game.p1_pos}")
-                else:
-                    self.game.p2_pos += PUZZLE_FORWARD
-                    append(2, f"Puzzle correct! +{PUZZLE_FORWARD} -> {self.game.p2_pos}")
-            else:
-                if player == 1:
-                    self.game.p1_pos = max(0, self.game.p1_pos - PUZZLE_BACK)
-                    append(1, f"Puzzle wrong. Correct {a*b}. -{PUZZLE_BACK} -> {self.game.p1_pos}")
-                else:
-                    self.game.p2_pos = max(0, self.game.p2_pos - PUZZLE_BACK)
-                    append(2, f"Puzzle wrong. Correct {a*b}. -{PUZZLE_BACK} -> {self.game.p2_pos}")
+    def _hard_policy(self):
+        # solved once per board, on first use
+        if self._hard is None or self._hard[0] is not self.game.paths:
+            self._hard = (self.game.paths, HardPolicy(self.game.paths))
+        return self._hard[1]
 
     # ---------- end & winner ----------
     def _end_and_show_winner(self, who):
-        if who == 'player1':
-            self.winner_lbl.config(text="Player 1 wins! 🎉", foreground='green')
-            self._append_p1("=== PLAYER 1 WINS ===")
-            self._append_p2("=== OPPONENT LOST ===")
-        elif who == 'player2':
-            if self.mode.get() == 1:
-                self.winner_lbl.config(text="Computer wins.", foreground='red')
-                self._append_p2("=== COMPUTER WINS ===")
-                self._append_p1("=== YOU LOST ===")
-            else:
-                self.winner_lbl.config(text="Player 2 wins!", foreground='red')
-                self._append_p2("=== PLAYER 2 WINS ===")
-                self._append_p1("=== YOU LOST ===")
-        else:
+        if who == 'tie':
             self.winner_lbl.config(text="It's a tie.", foreground='orange')
-            self._append_p1("=== TIE ==="); self._append_p2("=== TIE ===")
+            self._log("=== TIE ===")
+        else:
+            k = int(who[len('player'):])
+            name = self._name(k)
+            if self.machine.kinds[k - 1] == 'human':
+                self.winner_lbl.config(text=f"{name} wins! 🎉", foreground='green')
+            else:
+                self.winner_lbl.config(text=f"{name} wins.", foreground='red')
+            self._log(f"=== {name.upper()} WINS ===")
         # disable roll
         self.roll_btn.config(state='disabled')
 
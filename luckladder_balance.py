@@ -0,0 +1,97 @@
+# luckladder_balance.py
+# Balanced-board search for Luck Ladder. A board is a seed (SeededBoard), so a candidate costs
+# nothing to store; each is scored by its spread: largest minus smallest expected turns to
+# finish across the paths, from the exact Markov analysis (luckladder_markov), lower is fairer.
+# Workers in a process pool each draw random seeds and score them until the time budget runs
+# out, keeping their best few; the overall best are written best-first to luckladder_boards.llb,
+# which the game reads at startup to deal out pre-balanced boards.
+#
+#   python luckladder_balance.py --budget 30 --keep 200
+import argparse
+import heapq
+import os
+import random
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from luckladder import (BALANCED_BOARDS, BALANCED_HEADER, BALANCED_MAGIC, NUM_PATHS, PATH_LENGTH,
+                        SEED_BITS, SeededBoard, board_code, load_balanced_seeds)
+from luckladder_markov import analyze
+
+
+def spread(seed):
+    # largest minus smallest expected finish time (turns) across the paths of a seeded board
+    expected = [f.expected for f in analyze(SeededBoard(seed), horizon=0)]
+    return max(expected) - min(expected)
+
+
+def _search(worker_seed, budget, keep):
+    # one worker: scores random boards until `budget` seconds pass; returns (best, scored), best as
+    # [(spread, seed)] lowest first
+    rng = random.Random(worker_seed)
+    deadline = time.monotonic() + budget
+    best = []                                # max-heap of the `keep` lowest, as (-spread, seed)
+    scored = 0
+    while time.monotonic() < deadline:
+        seed = rng.getrandbits(SEED_BITS)
+        s = spread(seed)
+        scored += 1
+        if len(best) < keep:
+            heapq.heappush(best, (-s, seed))
+        elif s < -best[0][0]:
+            heapq.heapreplace(best, (-s, seed))
+    return sorted((-s, seed) for s, seed in best), scored
+
+
+def generate(budget=30.0, keep=200, workers=None, seed=None):
+    # best `keep` boards found in `budget` seconds over all workers: ([(spread, seed)], boards scored)
+    workers = workers or os.cpu_count() or 1
+    seeds = random.Random(seed)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_search, seeds.getrandbits(64), budget, keep) for _ in range(workers)]
+        results = [f.result() for f in futures]
+    merged = heapq.nsmallest(keep, (b for best, _ in results for b in best))
+    return merged, sum(scored for _, scored in results)
+
+
+def save(boards, path=BALANCED_BOARDS):
+    # boards: [(spread, seed)] best first
+    seeds = array('Q', [seed for _, seed in boards])
+    spreads = array('f', [s for s, _ in boards])
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(BALANCED_HEADER.pack(BALANCED_MAGIC, len(boards), NUM_PATHS, PATH_LENGTH))
+        seeds.tofile(f)
+        spreads.tofile(f)
+    os.replace(tmp, path)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Search for fair Luck Ladder boards and save the best")
+    ap.add_argument('--budget', type=float, default=30.0, help="seconds to search")
+    ap.add_argument('--keep', type=int, default=200, help="boards to save")
+    ap.add_argument('--workers', type=int, default=None)
+    ap.add_argument('--seed', type=int, default=None)
+    ap.add_argument('--out', default=BALANCED_BOARDS)
+    args = ap.parse_args()
+
+    start = time.perf_counter()
+    boards, scored = generate(args.budget, args.keep, args.workers, args.seed)
+    elapsed = time.perf_counter() - start
+    save(boards, args.out)
+    # a random board's spread, for comparison
+    rng = random.Random(args.seed)
+    typical = sorted(spread(rng.getrandbits(SEED_BITS)) for _ in range(200))
+    print(f"{scored} boards scored in {elapsed:.1f}s ({scored / elapsed:.0f}/s)")
+    print(f"random boards: median spread {typical[100]:.2f} turns, worst {typical[-1]:.2f}")
+    print(f"saved {len(boards)} to {args.out}: spread {boards[0][0]:.3f} to {boards[-1][0]:.3f} turns")
+    for s, seed in boards[:5]:
+        print(f"  {board_code(seed)}  spread {s:.3f}")
+    start = time.perf_counter()
+    load_balanced_seeds(args.out)
+    print(f"startup load: {(time.perf_counter() - start) * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+# luckladder_batch.py
+# Headless batch simulator for Luck Ladder: plays many computer-vs-computer games on one board at
+# once as NumPy arrays, to check whether the generated paths are fair and how long games run.
+# Every lane follows the same rules as LuckLadder.play_turn with computer_decision:
+#   - roll 1-6 and move; reaching the end of the path wins before the tile is looked at
+#   - otherwise the tile at step pos resolves with the COMP_* probabilities
+#   - players alternate, player 1 first; the first to reach the end wins
+# The board is encoded as (paths, steps) arrays of tile type codes and bad-number bitmasks (bit
+# k = number k+1 is bad); any board size works, the number of paths and steps come from them.
+# NumPy is only needed for this module; the game itself still runs on pure Python + Tkinter.
+import argparse
+import math
+import random
+import time
+
+from luckladder import (COMP_PUZZLE_PROB, COMP_QUIZ_PROB, COMP_ROUTE_ACCEPT_PROB, DICE_SIDES,
+                        GAMBLE_MULTIPLIER, PUZZLE_BACK, PUZZLE_FORWARD,
+                        QUIZ_BACK, QUIZ_FORWARD, LuckLadder)
+from luckladder_board import TILE_CODES, CompactBoard
+
+
+def _numpy():
+    try:
+        import numpy as np
+    except ImportError:
+        raise RuntimeError("luckladder_batch needs NumPy (pip install numpy)")
+    return np
+
+
+def encode_board(game):
+    # board of a LuckLadder as arrays: types (paths, steps) uint8, bad (paths, steps) uint16.
+    # Route tiles are found by their type code, so no separate route index is kept
+    np = _numpy()
+    if isinstance(game.paths, CompactBoard):
+        # same layout already: just copy the arrays out
+        b = game.paths
+        return {'types': np.frombuffer(b.types, dtype=np.uint8).reshape(b.num_paths, b.length).copy(),
+                'bad': np.frombuffer(b.bad, dtype=np.uint16).reshape(b.num_paths, b.length).copy()}
+    types = np.zeros((game.num_paths, game.length), dtype=np.uint8)
+    bad = np.zeros((game.num_paths, game.length), dtype=np.uint16)
+    for p, path in enumerate(game.paths):
+        for i, tile in enumerate(path.tiles):
+            types[p, i] = TILE_CODES[tile.type]
+            for k in tile.bad_numbers:
+                bad[p, i] |= 1 << (k - 1)
+    return {'types': types, 'bad': bad}
+
+
+def make_board(board_seed=None):
+    # a freshly generated LuckLadder board; the same seed gives the same board
+    state = random.getstate()
+    random.seed(board_seed)
+    game = LuckLadder()
+    random.setstate(state)
+    return game
+
+
+def _start_paths(np, rng, m, num_paths, p1_path, p2_path):
+    # default: player 1 picks any path, player 2 a different one (as the computer does in the GUI)
+    p1 = np.full(m, p1_path) if p1_path is not None else rng.integers(0, num_paths, m)
+    if p2_path is not None:
+        p2 = np.full(m, p2_path)
+    else:
+        p2 = (p1 + rng.integers(1, num_paths, m)) % num_paths
+    return p1.astype(np.int64), p2.astype(np.int64)
+
+
+def simulate(board, n=1000000, seed=None, p1_path=None, p2_path=None, chunk=262144, max_turns=10000):
+    # board: encode_board(...) output; p1_path/p2_path: fixed 0-based start paths or None
+    np = _numpy()
+    rng = np.random.default_rng(seed)
+    types = board['types'].astype(np.int64); bad = board['bad'].astype(np.int64)
+    num_paths = types.shape[0]
+    start = time.perf_counter()
+    winners = []; lengths = []; starts = []
+    done = 0
+    while done < n:
+        m = min(chunk, n - done)
+        p1, p2 = _start_paths(np, rng, m, num_paths, p1_path, p2_path)
+        w, t = _play_lanes(np, rng, m, types, bad, p1, p2, max_turns)
+        winners.append(w); lengths.append(t); starts.append(np.stack([p1, p2]))
+        done += m
+    winner = np.concatenate(winners)
+    turns = np.concatenate(lengths)
+    start_paths = np.concatenate(starts, axis=1)
+    elapsed = time.perf_counter() - start
+
+    finished = winner >= 0
+    # per-path win rate: games won by whoever started on the path / games someone started on it
+    games = np.zeros(num_paths); won = np.zeros(num_paths)
+    for side in (0, 1):
+        games += np.bincount(start_paths[side], minlength=num_paths)
+        won += np.bincount(start_paths[side][winner == side], minlength=num_paths)
+    return {
+        'games': n,
+        'p1_win': float((winner == 0).mean()),
+        'p2_win': float((winner == 1).mean()),
+        'unfinished': int((~finished).sum()),
+        'path_win': (won / np.maximum(games, 1)).tolist(),
+        'path_games': games.astype(np.int64).tolist(),
+        'mean_turns': float(turns[finished].mean()) if finished.any() else 0.0,
+        # histogram indexed by turns taken (both players' turns counted)
+        'turns': np.bincount(turns[finished]),
+        'elapsed': elapsed,
+    }
+
+
+def _play_lanes(np, rng, m, types, bad, p1, p2, max_turns):
+    # returns (winner 0/1 or -1 if max_turns ran out, turns taken) for m games
+    num_paths, end = types.shape
+    winner = np.full(m, -1, dtype=np.int8)
+    turns = np.full(m, max_turns, dtype=np.int32)
+    lane = np.arange(m)
+    pos = np.zeros((2, m), dtype=np.int64)
+    path = np.stack([p1, p2])
+    for turn in range(1, max_turns + 1):
+        if not lane.size:
+            break
+        side = (turn - 1) % 2
+        k = lane.size
+        p = pos[side] + rng.integers(1, DICE_SIDES + 1, size=k, dtype=np.int64)
+        cur = path[side]
+        arrived = p >= end
+
+        idx = np.minimum(np.maximum(p - 1, 0), end - 1)
+        typ = types[cur, idx]
+        # one draw of each kind for every lane; each lane uses the ones for its tile type
+        r = rng.random((5, k))
+        u = r[0]
+        pick = (r[1] * 10).astype(np.int64) + 1
+        gamble = (r[2] * 5).astype(np.int64) + 1
+        treasure = (r[3] * 5).astype(np.int64) + 1
+        other = (cur + 1 + (r[4] * (num_paths - 1)).astype(np.int64)) % num_paths
+
+        is_bad = (bad[cur, idx] >> (pick - 1)) & 1 == 1
+        moved = np.select(
+            [typ == 0, typ == 1, typ == 3, typ == 4],
+            [np.where(is_bad, p - pick, p + pick),
+             np.where(u < COMP_QUIZ_PROB, p + QUIZ_FORWARD, p - QUIZ_BACK),
+             np.where(gamble == treasure, p + gamble * GAMBLE_MULTIPLIER, p - gamble),
+             np.where(u < COMP_PUZZLE_PROB, p + PUZZLE_FORWARD, p - PUZZLE_BACK)],
+            default=p)
+        moved = np.maximum(moved, 0)
+        switch = (typ == 2) & (u < COMP_ROUTE_ACCEPT_PROB) & ~arrived
+        path[side] = np.where(switch, other, cur)
+        p = np.where(arrived, p, moved)
+        pos[side] = p
+
+        fin = p >= end
+        if fin.any():
+            winner[lane[fin]] = side
+            turns[lane[fin]] = turn
+            keep = ~fin
+            lane = lane[keep]; pos = pos[:, keep]; path = path[:, keep]
+    return winner, turns
+
+
+def simulate_scalar(game, n=20000, seed=None, p1_path=None, p2_path=None, max_turns=10000):
+    # reference run through LuckLadder.play_bot_game on the same board
+    if seed is not None:
+        random.seed(seed)
+    start = time.perf_counter()
+    wins = {'player1': 0, 'player2': 0, None: 0}
+    total_turns = 0
+    for _ in range(n):
+        a = p1_path if p1_path is not None else random.randrange(game.num_paths)
+        b = p2_path if p2_path is not None else (a + random.randrange(1, game.num_paths)) % game.num_paths
+        w, t = game.play_bot_game(a, b, max_turns=max_turns)
+        wins[w] += 1
+        total_turns += t if w else 0
+    elapsed = time.perf_counter() - start
+    finished = n - wins[None]
+    return {
+        'games': n,
+        'p1_win': wins['player1'] / n,
+        'p2_win': wins['player2'] / n,
+        'unfinished': wins[None],
+        'mean_turns': total_turns / finished if finished else 0.0,
+        'elapsed': elapsed,
+    }
+
+
+def compare(board_seed=None, n_batch=1000000, n_scalar=20000, seed=None, p1_path=None, p2_path=None):
+    # runs both engines on the same board and checks the win rates agree within 4 standard errors
+    game = make_board(board_seed)
+    batch = simulate(encode_board(game), n_batch, seed=seed, p1_path=p1_path, p2_path=p2_path)
+    scalar = simulate_scalar(game, n_scalar, seed=seed, p1_path=p1_path, p2_path=p2_path)
+    report = {'batch': batch, 'scalar': scalar, 'agree': True}
+    for key in ('p1_win', 'p2_win'):
+        p = batch[key]
+        se = math.sqrt(max(p * (1 - p), 1e-12) * (1 / n_batch + 1 / n_scalar))
+        if abs(p - scalar[key]) > 4 * se:
+            report['agree'] = False
+    report['speedup'] = (scalar['elapsed'] / n_scalar) / (batch['elapsed'] / n_batch)
+    return report
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Batch-simulate computer-vs-computer Luck Ladder games on one board")
+    ap.add_argument('-n', type=int, default=1000000, help="games for the NumPy engine")
+    ap.add_argument('--scalar', type=int, default=20000, help="games for the LuckLadder reference run")
+    ap.add_argument('--board-seed', type=int, default=None, help="seed for generating the board")
+    ap.add_argument('--seed', type=int, default=None)
+    ap.add_argument('--p1-path', type=int, default=None, help="fix player 1's start path (1-5)")
+    ap.add_argument('--p2-path', type=int, default=None, help="fix player 2's start path (1-5)")
+    args = ap.parse_args()
+
+    p1 = None if args.p1_path is None else args.p1_path - 1
+    p2 = None if args.p2_path is None else args.p2_path - 1
+    rep = compare(args.board_seed, args.n, args.scalar, args.seed, p1, p2)
+    for name in ('batch', 'scalar'):
+        r = rep[name]
+        print(f"{name:>6}: {r['games']} games in {r['elapsed']:.2f}s | player 1 (moves first) {r['p1_win']:.4f} "
+              f"player 2 {r['p2_win']:.4f} | avg turns {r['mean_turns']:.2f}"
+              + (f" | unfinished {r['unfinished']}" if r['unfinished'] else ""))
+    b = rep['batch']
+    print("win rate by start path: " + "  ".join(f"path {i + 1} {w:.4f}" for i, w in enumerate(b['path_win'])))
+    print(f"first-mover advantage: {b['p1_win'] - b['p2_win']:+.4f}")
+    hist = b['turns']
+    total = hist.sum()
+    cum = 0
+    lines = []
+    for t, c in enumerate(hist):
+        if not c:
+            continue
+        cum += c
+        lines.append(f"{t:>4} turns {c / total:7.4f}  (cum {cum / total:.4f})")
+        if cum / total > 0.999:
+            break
+    print("game length:")
+    print("\n".join(lines))
+    print(f"agree within 4 SE: {rep['agree']} | per-game speedup x{rep['speedup']:.0f}")
+
+
+if __name__ == "__main__":
+    main()
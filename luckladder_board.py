@@ -0,0 +1,231 @@
+# luckladder_board.py
+# Compact Luck Ladder board for very large variants (thousands of paths, tens of thousands of
+# steps). Instead of a Tile object per step (its own dict, a set of bad numbers, a quiz tuple
+# reference) every tile is a few bytes in flat typed arrays, path-major (tile = path * length + step):
+#   types  uint8   index into TILE_TYPES
+#   bad    uint16  bad-number bitmask for choice tiles, bit k = number k+1 is bad
+#   quiz   uint32  index into QUIZ_BANK for quiz tiles, or into the external bank when the game
+#                  uses one (luckladder_quiz.py)
+#   routes         route tile step for each path
+# board[p] gives a PathView and board[p].tiles[i] a TileView; both are made on demand and act
+# like Path / Tile, so LuckLadder, TILE_RULES and computer_decision run on a CompactBoard of any
+# size as they do on a list of Paths; the game reads the number of paths and steps from the board.
+#
+#   python luckladder_board.py --paths 1000 --length 10000
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+from array import array
+
+from luckladder import (BAD_NUMBERS_PER_TILE, CHOICE_TILE_RATIO, GAMBLE_TILE_RATIO, NUM_PATHS,
+                        PATH_LENGTH, QUIZ_BANK, QUIZ_TILE_RATIO, Path, draw_quiz, quiz_source)
+
+TILE_TYPES = ('choice', 'quiz', 'route', 'gamble', 'puzzle')
+TILE_CODES = {typ: code for code, typ in enumerate(TILE_TYPES)}
+_QUIZ_INDEX = {q: i for i, q in enumerate(QUIZ_BANK)}
+
+
+def _quiz_number(quiz):
+    # QUIZ_BANK position of a built-in question, bank position of an external one
+    return quiz.number if len(quiz) > 2 else _QUIZ_INDEX[quiz]
+
+
+class TileView:
+    # read-only stand-in for a Tile at (path, step) of a CompactBoard
+    __slots__ = ('board', 'at')
+
+    def __init__(self, board, at):
+        self.board = board
+        self.at = at
+
+    @property
+    def type(self):
+        return TILE_TYPES[self.board.types[self.at]]
+
+    @property
+    def bad_numbers(self):
+        mask = self.board.bad[self.at]
+        return {k + 1 for k in range(10) if mask >> k & 1}
+
+    @property
+    def quiz(self):
+        if self.board.types[self.at] != TILE_CODES['quiz']:
+            return None
+        source = quiz_source()
+        return source[0][self.board.quiz[self.at]] if source else QUIZ_BANK[self.board.quiz[self.at]]
+
+    @property
+    def route_id(self):
+        return self.at % self.board.length if self.board.types[self.at] == TILE_CODES['route'] else None
+
+    def describe_short(self):
+        return self.type.upper()
+
+
+class _TileSeq:
+    # path.tiles of a PathView: indexable and iterable, TileViews made per access
+    __slots__ = ('board', 'base')
+
+    def __init__(self, board, base):
+        self.board = board
+        self.base = base
+
+    def __len__(self):
+        return self.board.length
+
+    def __getitem__(self, i):
+        n = self.board.length
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("tile index out of range")
+        return TileView(self.board, self.base + i)
+
+    def __iter__(self):
+        for i in range(self.board.length):
+            yield TileView(self.board, self.base + i)
+
+
+class PathView:
+    __slots__ = ('index', 'tiles')
+
+    def __init__(self, board, index):
+        self.index = index
+        self.tiles = _TileSeq(board, index * board.length)
+
+
+class CompactBoard:
+    def __init__(self, num_paths, length):
+        self.num_paths = num_paths
+        self.length = length
+        n = num_paths * length
+        self.types = array('B', bytes(n))
+        self.bad = array('H', bytes(2 * n))
+        self.quiz = array('I', bytes(4 * n))
+        self.routes = array('i', bytes(4 * num_paths))
+
+    @classmethod
+    def generate(cls, num_paths=NUM_PATHS, length=PATH_LENGTH, rng=random):
+        # same draws in the same order as Path(), so a seeded rng gives the board LuckLadder would
+        board = cls(num_paths, length)
+        types = board.types; bad = board.bad; quiz = board.quiz
+        choice_code = TILE_CODES['choice']; quiz_code = TILE_CODES['quiz']
+        gamble_code = TILE_CODES['gamble']; puzzle_code = TILE_CODES['puzzle']
+        quiz_cut = CHOICE_TILE_RATIO + QUIZ_TILE_RATIO
+        gamble_cut = quiz_cut + GAMBLE_TILE_RATIO
+        numbers = range(1, 11)
+        for p in range(num_paths):
+            base = p * length
+            route_pos = rng.randint(2, max(2, length - 1))
+            board.routes[p] = route_pos
+            for i in range(length):
+                at = base + i
+                if i == route_pos:
+                    types[at] = TILE_CODES['route']
+                    continue
+                r = rng.random()
+                if r < CHOICE_TILE_RATIO:
+                    mask = 0
+                    for k in rng.sample(numbers, BAD_NUMBERS_PER_TILE):
+                        mask |= 1 << (k - 1)
+                    types[at] = choice_code; bad[at] = mask
+                elif r < quiz_cut:
+                    types[at] = quiz_code; quiz[at] = _quiz_number(draw_quiz(rng))
+                elif r < gamble_cut:
+                    types[at] = gamble_code
+                else:
+                    types[at] = puzzle_code
+        return board
+
+    @classmethod
+    def from_paths(cls, paths):
+        # pack an existing board (a list of Paths)
+        board = cls(len(paths), len(paths[0].tiles))
+        for p, path in enumerate(paths):
+            base = p * board.length
+            for i, tile in enumerate(path.tiles):
+                at = base + i
+                board.types[at] = TILE_CODES[tile.type]
+                if tile.type == 'choice':
+                    board.bad[at] = sum(1 << (k - 1) for k in tile.bad_numbers)
+                elif tile.type == 'quiz':
+                    board.quiz[at] = _quiz_number(tile.quiz)
+                elif tile.type == 'route':
+                    board.routes[p] = i
+        return board
+
+    def __len__(self):
+        return self.num_paths
+
+    def __getitem__(self, p):
+        if p < 0:
+            p += self.num_paths
+        if not 0 <= p < self.num_paths:
+            raise IndexError("path index out of range")
+        return PathView(self, p)
+
+    def __iter__(self):
+        for p in range(self.num_paths):
+            yield PathView(self, p)
+
+    def tile(self, path, step):
+        return TileView(self, path * self.length + step)
+
+    def nbytes(self):
+        return sum(a.itemsize * len(a) for a in (self.types, self.bad, self.quiz, self.routes))
+
+
+def _traced(build):
+    # (result, bytes allocated while building it and still held)
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = build()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return result, after - before
+
+
+def memory_report(num_paths, length, seed=0):
+    # builds the same board both ways and measures what each holds
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    board, compact = _traced(lambda: CompactBoard.generate(num_paths, length, rng))
+    compact_time = time.perf_counter() - start
+    state = random.getstate()
+    random.seed(seed)
+    try:
+        start = time.perf_counter()
+        paths, objects = _traced(lambda: [Path(length, i) for i in range(num_paths)])
+        objects_time = time.perf_counter() - start
+    finally:
+        random.setstate(state)
+    return {
+        'tiles': num_paths * length,
+        'objects': objects, 'objects_time': objects_time,
+        'compact': compact, 'compact_time': compact_time,
+        'same': all(t.type == v.type and t.bad_numbers == v.bad_numbers and t.quiz == v.quiz
+                    for path, view in zip(paths, board) for t, v in zip(path.tiles, view.tiles)),
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Compare memory of Tile-object and compact Luck Ladder boards")
+    ap.add_argument('--paths', type=int, default=200)
+    ap.add_argument('--length', type=int, default=5000)
+    ap.add_argument('--seed', type=int, default=0)
+    args = ap.parse_args()
+
+    r = memory_report(args.paths, args.length, args.seed)
+    n = r['tiles']
+    print(f"{args.paths} paths x {args.length} steps = {n} tiles (Python {sys.version.split()[0]})")
+    print(f"Tile objects: {r['objects'] / 2**20:8.1f} MiB  {r['objects'] / n:6.1f} B/tile  built in {r['objects_time']:.2f}s")
+    print(f"compact     : {r['compact'] / 2**20:8.1f} MiB  {r['compact'] / n:6.1f} B/tile  built in {r['compact_time']:.2f}s")
+    print(f"{r['objects'] / max(r['compact'], 1):.0f}x smaller, same board: {r['same']}")
+
+
+if __name__ == "__main__":
+    main()
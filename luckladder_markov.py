@@ -0,0 +1,487 @@
+# luckladder_markov.py
+# Exact finish-time analysis for Luck Ladder paths, for one player driven by the computer's
+# decisions (COMP_* probabilities, choice/gamble numbers picked uniformly).
+# A turn only depends on where the player stands, so the game is an absorbing Markov chain:
+#   - states are (step 0..length-1, path); reaching the length finishes and absorbs
+#   - one transition is a whole turn: roll 1-6, then the tile's effect, route switches included
+#     (an accepted switch moves to one of the other paths at the same step)
+# A tile's effect only depends on the tile, so the turn matrix factors as Q = R M: R spreads a
+# state over the six tiles it can land on, M sends each tile to where its effect leaves the
+# player. Expected turns t solve (I - Q) t = 1 and second moments m solve (I - Q) m = 1 + 2 Q t.
+# Only route tiles move the player to another path, so with SciPy each path is solved on its own
+# as a banded system (a few steps back, a few more ahead) and the switches are added back with
+# the Woodbury identity, one row per route tile; boards with more than BANDED_PATHS paths take
+# a sparse LU of the whole chain instead. The finish-time distribution runs backwards: g(k), the
+# chance of finishing on turn k from each state, is Q g(k - 1), and a turn only reaches back
+# a few dozen steps, so on long paths each push is a short tail of R and M.
+# Solvers, best available first: SciPy, NumPy dense (small boards), pure Python;
+# standard-size boards go dense straight away when NumPy is there.
+import argparse
+import math
+import time
+from collections import namedtuple
+
+from luckladder import (COMP_PUZZLE_PROB, COMP_QUIZ_PROB, COMP_ROUTE_ACCEPT_PROB, DICE_SIDES,
+                        GAMBLE_MULTIPLIER, PUZZLE_BACK, PUZZLE_FORWARD, QUIZ_BACK, QUIZ_FORWARD)
+from luckladder_board import TILE_CODES, CompactBoard
+
+DENSE_MAX = 3000           # largest chain solved densely when SciPy is missing
+DENSE_FIRST = 200          # up to this a dense solve beats setting up SciPy
+BANDED_PATHS = 32          # up to this many paths SciPy solves path by path (banded), else sparse LU
+HORIZON = 100              # turns covered by the finish-time distribution
+SLOTS = 10                 # outcome columns per tile (choice: one per number 1-10); boards with
+                           # more paths get one per path instead (route: stay or switch to any other)
+
+# per start path: expected turns, standard deviation, finish[t] = chance of finishing on turn t+1
+PathForecast = namedtuple('PathForecast', 'expected sd finish')
+
+_cache = {}
+
+
+def tile_moves(tile, step, path, num_paths):
+    # [(step, path, chance)] where the tile at `step` can leave the player; steps past the end
+    # are left as they are
+    typ = tile.type
+    if typ == 'choice':
+        return [(max(0, step - k) if k in tile.bad_numbers else step + k, path, 0.1) for k in range(1, 11)]
+    if typ == 'quiz':
+        return [(step + QUIZ_FORWARD, path, COMP_QUIZ_PROB), (max(0, step - QUIZ_BACK), path, 1 - COMP_QUIZ_PROB)]
+    if typ == 'route':
+        each = COMP_ROUTE_ACCEPT_PROB / (num_paths - 1)
+        return [(step, path, 1 - COMP_ROUTE_ACCEPT_PROB)] + [(step, p, each) for p in range(num_paths) if p != path]
+    if typ == 'gamble':
+        # pick g and treasure are both uniform 1-5: jackpot 1 time in 25 per pick
+        moves = []
+        for g in range(1, 6):
+            moves.append((step + g * GAMBLE_MULTIPLIER, path, 1 / 25))
+            moves.append((max(0, step - g), path, 4 / 25))
+        return moves
+    return [(step + PUZZLE_FORWARD, path, COMP_PUZZLE_PROB), (max(0, step - PUZZLE_BACK), path, 1 - COMP_PUZZLE_PROB)]
+
+
+def slots(num_paths):
+    return max(SLOTS, num_paths)
+
+
+def _check_rows(worst):
+    # every tile must send the player somewhere: a row of M that doesn't sum to 1 loses (or makes)
+    # probability and every answer built on it is wrong. worst: largest |row sum - 1|
+    if worst > 1e-9:
+        raise ValueError(f"tile outcome chances don't sum to 1 (off by {worst:.3g})")
+
+
+def tile_table(paths):
+    # M as slots(num_paths) columns per tile: (dest, prob), dest -1 = finished; tile i of path p is
+    # row i * num_paths + p and sits at step i + 1, so a state's own number is also step * num_paths + path
+    num_paths = len(paths)
+    length = len(paths[0].tiles)
+    width = slots(num_paths)
+    dest = []; prob = []
+    for i in range(length):
+        for p in range(num_paths):
+            moves = tile_moves(paths[p].tiles[i], i + 1, p, num_paths)
+            moves += [(length, p, 0.0)] * (width - len(moves))
+            dest.append([s * num_paths + q if s < length else -1 for s, q, _ in moves])
+            prob.append([c for _, _, c in moves])
+    _check_rows(max(abs(sum(row) - 1.0) for row in prob))
+    return dest, prob
+
+
+def _scipy():
+    try:
+        import numpy as np
+        import scipy.sparse as sp
+        from scipy.linalg import lapack
+        from scipy.sparse.linalg import splu
+    except ImportError:
+        return None
+    return np, sp, splu, lapack
+
+
+def _numpy():
+    try:
+        import numpy as np
+    except ImportError:
+        return None
+    return np
+
+
+def _rolls(np, length, num_paths):
+    # R as six tile numbers per state (-1 where the roll reaches the end)
+    step = np.arange(length)[:, None, None]
+    path = np.arange(num_paths)[None, :, None]
+    land = step + np.arange(1, DICE_SIDES + 1)
+    tile = np.where(land < length, (land - 1) * num_paths + path, -1)
+    return tile.reshape(length * num_paths, DICE_SIDES)
+
+
+def _chain_numpy(np, paths):
+    # (roll tiles, tile dest, tile prob, finish chance per state) as arrays; same layout as
+    # tile_table, built from tile type codes and bad-number bitmasks (read straight from a
+    # CompactBoard, else in one pass over the Tiles)
+    num_paths = len(paths)
+    length = len(paths[0].tiles)
+    if isinstance(paths, CompactBoard):
+        # already packed path-major; transpose to step-major
+        typ = np.frombuffer(paths.types, dtype=np.uint8).reshape(num_paths, length).T.astype(np.int64)
+        bad = np.frombuffer(paths.bad, dtype=np.uint16).reshape(num_paths, length).T.astype(np.int64)
+    else:
+        typ = np.array([[TILE_CODES[paths[p].tiles[i].type] for p in range(num_paths)] for i in range(length)])
+        bad = np.array([[sum(1 << (k - 1) for k in paths[p].tiles[i].bad_numbers) for p in range(num_paths)]
+                        for i in range(length)])
+    typ = typ.reshape(-1, 1); bad = bad.reshape(-1, 1)
+    step = np.repeat(np.arange(1, length + 1), num_paths)[:, None]
+    path = np.tile(np.arange(num_paths), length)[:, None]
+
+    j = np.arange(slots(num_paths))
+    numbers = j < 10                     # choice and gamble: ten outcomes, the rest stay empty
+    pick = j + 1
+    g = j // 2 + 1                       # gamble: even slots jackpot, odd slots miss, for pick g
+    first = j == 0; second = j == 1
+    choice = np.where((bad >> j) & 1 == 1, -pick, pick)
+    delta = np.select([typ == 0, typ == 1, typ == 3, typ == 4],
+                      [choice,
+                       np.where(first, QUIZ_FORWARD, np.where(second, -QUIZ_BACK, 0)),
+                       np.where(j % 2 == 0, g * GAMBLE_MULTIPLIER, -g),
+                       np.where(first, PUZZLE_FORWARD, np.where(second, -PUZZLE_BACK, 0))], 0)
+    accept = COMP_ROUTE_ACCEPT_PROB
+    prob = np.select([typ == 0, typ == 1, typ == 2, typ == 3, typ == 4],
+                     [np.where(numbers, 0.1, 0.0),
+                      np.where(first, COMP_QUIZ_PROB, np.where(second, 1 - COMP_QUIZ_PROB, 0.0)),
+                      np.where(first, 1 - accept, np.where(j < num_paths, accept / (num_paths - 1), 0.0)),
+                      np.where(numbers, np.where(j % 2 == 0, 1 / 25, 4 / 25), 0.0),
+                      np.where(first, COMP_PUZZLE_PROB, np.where(second, 1 - COMP_PUZZLE_PROB, 0.0))])
+    # route slot j moves to the j-th path after this one, every other tile stays on its path
+    to_path = np.where((typ == 2) & (j < num_paths), (path + j) % num_paths, path)
+    to = np.maximum(step + delta, 0)
+    dest = np.where((to < length) & (prob > 0), to * num_paths + to_path, -1)
+    _check_rows(float(np.abs(prob.sum(1) - 1.0).max()))
+
+    rolls = _rolls(np, length, num_paths)
+    tile_done = np.where(dest < 0, prob, 0.0).sum(1)
+    landed = rolls >= 0
+    finish = ((~landed).sum(1) + np.where(landed, tile_done[np.maximum(rolls, 0)], 0.0).sum(1)) / DICE_SIDES
+    return rolls, dest, prob, finish
+
+
+def _banded_solver(np, lapack, rolls, dest, prob, num_paths):
+    # solve(b) for (I - Q) x = b. Q0 is Q with every route tile keeping the player on its own
+    # path: nothing changes path then, so with states numbered path-major I - Q0 is banded (a few
+    # steps back, a few more ahead) and LAPACK factors it in O(n). The switches put back,
+    # Q - Q0 = U D, have one row in D per route tile; the Woodbury identity adds them with a
+    # solve of that size
+    n = len(rolls)
+    length = n // num_paths
+    row = np.arange(n) // num_paths
+    order = np.arange(n) % num_paths * length + row          # path-major number of a state or tile
+    # M0 by diagonals, filed under the column of the destination: w[o, j] = chance of moving o
+    # steps past a tile onto state j (path-major, on the tile's own path). A roll of d onto that
+    # tile is entry (j - o - d, j) of Q0, in the same column, so each roll adds w to the band d
+    # rows further up (rolls stop short of the last step, so its tiles are never landed on)
+    live = (dest >= 0) & (prob > 0) & (row[:, None] < length - 1)
+    off = (dest // num_paths - row[:, None] - 1)[live]
+    col = np.broadcast_to(order[:, None], live.shape)[live] + off + 1
+    lo = int(off.min(initial=0))
+    chance = prob[live] / DICE_SIDES
+    w = np.bincount((off - lo) * n + col, weights=chance,
+                    minlength=(int(off.max(initial=0)) - lo + 1) * n).reshape(-1, n)[::-1]
+    # LAPACK's layout, band[top + i - j, j] = (I - Q0)[i, j], with `back` more rows above for
+    # the factorization's fill
+    back = max(0, -(lo + 1)); ahead = DICE_SIDES + len(w) - 1 + lo
+    top = back + ahead
+    band = np.zeros((2 * back + ahead + 1, n))
+    for d in range(1, DICE_SIDES + 1):
+        band[top - lo - d - len(w) + 1:top - lo - d + 1] -= w
+        # but no roll of d reaches the tiles less than d steps in, the first entries of `live`
+        k = int(live[:(d - 1) * num_paths].sum())
+        np.add.at(band, (top - d - off[:k], col[:k]), chance[:k])
+    band[top] += 1.0
+    lu, piv, info = lapack.dgbtrf(band, back, ahead)
+    if info:
+        raise ValueError("I - Q is singular: some state can never finish")
+
+    # route tiles: the ones that can move the player to another path
+    routes = np.nonzero((live & (dest % num_paths != np.arange(n)[:, None] % num_paths)).any(1))[0]
+    u = np.zeros((n, len(routes)))
+    d = np.zeros((len(routes), n))
+    for roll in range(1, DICE_SIDES + 1):
+        # a roll of `roll` lands on tile t from state t + num_paths - roll * num_paths
+        k = np.nonzero(routes // num_paths + 1 >= roll)[0]
+        u[order[routes[k] + (1 - roll) * num_paths], k] = 1 / DICE_SIDES
+    for k, t in enumerate(routes):
+        np.add.at(d[k], order[dest[t][live[t]]], prob[t][live[t]])
+        d[k, order[t + num_paths]] -= 1.0        # Q0 keeps it all on the tile's own path
+    z = lapack.dgbtrs(lu, back, ahead, u, piv)[0]
+    small = np.eye(len(routes)) - d @ z
+
+    def solve(b):
+        y = np.empty(n)
+        y[order] = b
+        y = lapack.dgbtrs(lu, back, ahead, y, piv)[0]
+        if len(routes):
+            y = y + z @ np.linalg.solve(small, d @ y)
+        return y[order]
+
+    return solve
+
+
+def _csr(np, sp, keep, cols, data):
+    # the n x n matrix with data[i, j] at (i, cols[i, j]) where keep[i, j]; entries come row by row
+    n = len(cols)
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(keep.sum(1), out=indptr[1:])
+    a = sp.csr_matrix((data[keep], cols[keep], indptr), shape=(n, n))
+    a.sum_duplicates()
+    return a
+
+
+def _tail(sp, a, k, cache):
+    # last k rows of a CSR matrix, sharing its arrays; k is rounded up to a power of two so a
+    # few matrices serve every call
+    k = min(a.shape[0], 1 << (k - 1).bit_length())
+    tail = cache.get(k)
+    if tail is None:
+        e = a.indptr[-k - 1]
+        tail = cache[k] = sp.csr_matrix((a.data[e:], a.indices[e:], a.indptr[-k - 1:] - e), shape=(k, a.shape[1]))
+    return tail
+
+
+def _solve_scipy(lib, paths, horizon):
+    np, sp, splu, lapack = lib
+    rolls, dest, prob, finish = _chain_numpy(np, paths)
+    n = len(finish)
+    r = _csr(np, sp, rolls >= 0, rolls, np.full(rolls.shape, 1 / DICE_SIDES))
+    m = _csr(np, sp, (dest >= 0) & (prob > 0), dest, prob)
+    if len(paths) <= BANDED_PATHS:
+        solve = _banded_solver(np, lapack, rolls, dest, prob, len(paths))
+    else:
+        # I - Q is diagonally dominant, so the LU needs no row pivoting
+        a = (sp.identity(n, format='csr') - r @ m).tocsc()
+        solve = splu(a, permc_spec='MMD_AT_PLUS_A', diag_pivot_thresh=0.0).solve
+    t = solve(np.ones(n))
+    m2 = solve(1 + 2 * (r @ (m @ t)))
+
+    # a push only touches the rows of M that can move onto the states where g is nonzero (tiles
+    # i with m_reach[i] > lo, g being zero below lo), then the rows of R that can land on those.
+    # On long paths those are short tails for most of the horizon; and if g cannot reach the
+    # start states within the horizon, no path can finish in time and there is nothing to push
+    r_reach = np.maximum.accumulate(rolls.max(1)) + 1
+    m_reach = np.maximum.accumulate(dest.max(1)) + 1
+    start = low = int(np.argmax(finish > 0))
+    for _ in range(1, horizon):
+        low = int(np.searchsorted(r_reach, np.searchsorted(m_reach, low, side='right'), side='right'))
+    if low >= len(paths):
+        return t, m2, [[0.0] * horizon for _ in paths]
+    r_tails = {}; m_tails = {}
+    low = [start]
+
+    def step(g):
+        lo = int(np.searchsorted(m_reach, low[0], side='right'))
+        a = _tail(sp, m, n - lo, m_tails)
+        w = np.zeros(n)
+        w[n - a.shape[0]:] = a @ g
+        low[0] = lo = int(np.searchsorted(r_reach, lo, side='right'))
+        a = _tail(sp, r, n - lo, r_tails)
+        g = np.zeros(n)
+        g[n - a.shape[0]:] = a @ w
+        return g
+
+    return t, m2, _push(np, step, finish, len(paths), horizon)
+
+
+def _solve_dense(np, paths, horizon):
+    rolls, dest, prob, finish = _chain_numpy(np, paths)
+    n = len(finish)
+    landed = np.nonzero(rolls >= 0)
+    tiles = rolls[landed]
+    # every (state, roll) pair picks up its tile's outcomes
+    src = np.repeat(landed[0], dest.shape[1])
+    to = dest[tiles].ravel(); c = prob[tiles].ravel() / DICE_SIDES
+    live = to >= 0
+    q = np.zeros((n, n))
+    np.add.at(q, (src[live], to[live]), c[live])
+    a = np.eye(n) - q
+    t = np.linalg.solve(a, np.ones(n))
+    m2 = np.linalg.solve(a, 1 + 2 * (q @ t))
+    return t, m2, _push(np, lambda g: q @ g, finish, len(paths), horizon)
+
+
+def _push(np, step, finish, num_paths, horizon):
+    # finish[t] per start path over `horizon` turns; path p starts in state p (step 0).
+    # Worked backwards from the end so one vector serves every start path: g[s] is the chance of
+    # finishing on exactly turn t from state s, starting from g = finish, and step(g) = Q g
+    # is the same for turn t + 1
+    g = finish
+    dist = []
+    done = np.zeros(num_paths)
+    for _ in range(horizon):
+        d = g[:num_paths]
+        dist.append(d)
+        done += d
+        if done.min() > 1 - 1e-12:
+            break
+        g = step(g)
+    return [[float(d[p]) for d in dist] for p in range(num_paths)]
+
+
+def _solve_python(paths, horizon):
+    num_paths = len(paths)
+    length = len(paths[0].tiles)
+    n = length * num_paths
+    dest, prob = tile_table(paths)
+    # rows of Q as dicts, plus the chance of finishing this turn
+    q = [{} for _ in range(n)]
+    finish = [0.0] * n
+    roll = 1 / DICE_SIDES
+    for s in range(n):
+        step = s // num_paths; row = q[s]
+        for d in range(1, DICE_SIDES + 1):
+            if step + d >= length:
+                finish[s] += roll
+                continue
+            tile = s + (d - 1) * num_paths
+            for to, c in zip(dest[tile], prob[tile]):
+                if to < 0:
+                    finish[s] += roll * c
+                elif c:
+                    row[to] = row.get(to, 0.0) + roll * c
+    solve = _eliminate(q)
+    t = solve([1.0] * n)
+    m2 = solve([1 + 2 * sum(c * t[to] for to, c in q[s].items()) for s in range(n)])
+    dist = []
+    for p in range(num_paths):
+        v = {p: 1.0}
+        finished = []
+        for _ in range(horizon):
+            finished.append(sum(m * finish[s] for s, m in v.items()))
+            nv = {}
+            for s, m in v.items():
+                for to, c in q[s].items():
+                    nv[to] = nv.get(to, 0.0) + m * c
+            v = nv
+            if sum(v.values()) < 1e-12:
+                break
+        dist.append(finished)
+    return t, m2, dist
+
+
+def _eliminate(q):
+    # LU of I - Q on sparse dict rows; returns solve(b). No pivoting needed: each row of I - Q has
+    # a diagonal at least as large as the rest of the row put together.
+    n = len(q)
+    a = [{to: -c for to, c in row.items()} for row in q]
+    for s in range(n):
+        a[s][s] = a[s].get(s, 0.0) + 1.0
+    # rows below k holding column k, so elimination only visits those
+    below = [set() for _ in range(n)]
+    for s in range(n):
+        for c in a[s]:
+            if c < s:
+                below[c].add(s)
+    mult = [[] for _ in range(n)]
+    for k in range(n):
+        pivot = a[k]; pk = pivot[k]
+        upper = [(c, v) for c, v in pivot.items() if c > k]
+        for s in sorted(below[k]):
+            f = a[s].pop(k) / pk
+            mult[k].append((s, f))
+            row = a[s]
+            for c, v in upper:
+                if c not in row and c < s:
+                    below[c].add(s)
+                row[c] = row.get(c, 0.0) - f * v
+
+    def solve(b):
+        b = b[:]
+        for k in range(n):
+            for s, f in mult[k]:
+                b[s] -= f * b[k]
+        x = [0.0] * n
+        for k in range(n - 1, -1, -1):
+            row = a[k]
+            acc = b[k]
+            for c, v in row.items():
+                if c > k:
+                    acc -= v * x[c]
+            x[k] = acc / row[k]
+        return x
+
+    return solve
+
+
+def analyze(paths, horizon=HORIZON, solver=None):
+    # PathForecast for each start path (step 0) of a board; solver None picks the best available,
+    # or force 'scipy', 'dense' or 'python'
+    num_paths = len(paths)
+    if solver is None:
+        n = len(paths[0].tiles) * num_paths
+        if _numpy() is not None and n <= DENSE_FIRST:
+            solver = 'dense'
+        elif _scipy() is not None:
+            solver = 'scipy'
+        elif _numpy() is not None and n <= DENSE_MAX:
+            solver = 'dense'
+        else:
+            solver = 'python'
+    if solver == 'scipy':
+        t, m2, dist = _solve_scipy(_scipy(), paths, horizon)
+    elif solver == 'dense':
+        t, m2, dist = _solve_dense(_numpy(), paths, horizon)
+    else:
+        t, m2, dist = _solve_python(paths, horizon)
+    return [PathForecast(float(t[p]), math.sqrt(max(0.0, m2[p] - t[p] * t[p])), dist[p])
+            for p in range(num_paths)]
+
+
+def board_forecast(game, horizon=HORIZON):
+    # analyze() for a LuckLadder's current board, remembered until the board is regenerated
+    # (reset_all builds a new paths list)
+    key = (id(game.paths), horizon)
+    hit = _cache.get(key)
+    if hit is not None and hit[0] is game.paths:
+        return hit[1]
+    if len(_cache) >= 8:
+        _cache.clear()
+    result = analyze(game.paths, horizon)
+    _cache[key] = (game.paths, result)
+    return result
+
+
+def turns_within(forecast, chance):
+    # fewest turns that finish with at least `chance`, or None past the horizon
+    total = 0.0
+    for t, c in enumerate(forecast.finish, start=1):
+        total += c
+        if total >= chance - 1e-12:
+            return t
+    return None
+
+
+def main():
+    import random
+    from luckladder import NUM_PATHS
+    from luckladder_batch import make_board
+    ap = argparse.ArgumentParser(description="Exact expected finish times for each Luck Ladder path")
+    ap.add_argument('--board-seed', type=int, default=None, help="seed for generating the board")
+    ap.add_argument('--length', type=int, default=None, help="generate paths of this many steps instead")
+    ap.add_argument('--horizon', type=int, default=HORIZON, help="turns covered by the distribution")
+    ap.add_argument('--solver', choices=['scipy', 'dense', 'python'], default=None)
+    args = ap.parse_args()
+
+    if args.length:
+        paths = CompactBoard.generate(NUM_PATHS, args.length, random.Random(args.board_seed))
+    else:
+        paths = make_board(args.board_seed).paths
+    _scipy()                             # keep the one-off library import out of the timing
+    start = time.perf_counter()
+    forecast = analyze(paths, args.horizon, args.solver)
+    elapsed = time.perf_counter() - start
+    for i, f in enumerate(forecast, start=1):
+        within = turns_within(f, 0.9)
+        print(f"path {i}: {f.expected:.2f} turns on average (sd {f.sd:.2f})"
+              + (f", 90% finish within {within}" if within else ""))
+    print(f"{len(paths) * len(paths[0].tiles)} states solved in {elapsed * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
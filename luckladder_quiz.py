@@ -0,0 +1,251 @@
+# luckladder_quiz.py
+# External quiz banks for Luck Ladder, for banks far too big to load whole (100k+ questions).
+# The bank is a UTF-8 text file, one question per line:
+#   question<TAB>answer[<TAB>alias...]        (blank lines and lines starting with # are skipped)
+# build_index() scans it once and writes FILE.idx:
+#   header   magic, count, source size and mtime (a changed source is re-indexed)
+#   q_off    uint64 per question: byte offset of its line in the source
+#   q_len    uint32 per question: line length in bytes
+#   a_off    uint32 per question + 1: slices of the answer blob
+#   blob     every question's accepted answers, already normalized, joined by \x1f
+# Opening a bank reads only the header and the three offset arrays; question text and accepted
+# answers are read through memory maps when a question is actually asked.
+# QuizDeck deals question numbers without repeats, in O(1) memory: a keyed Feistel network
+# shuffles the smallest power-of-four range covering the bank, and numbers that land past the end
+# are put through it again (cycle-walking) until they land inside, so every question comes up
+# once before any comes back.
+#
+#   python luckladder_quiz.py build questions.tsv
+#   python luckladder_quiz.py bench --make 100000
+import argparse
+import mmap
+import os
+import random
+import re
+import struct
+import time
+import unicodedata
+from array import array
+from collections import namedtuple
+
+MAGIC = b'LLQ2'                         # LLQ1 indexes normalized away signs and decimal points
+HEADER = struct.Struct('<4sIQQ')        # magic, count, source size, source mtime_ns
+SEP = '\x1f'
+MASK64 = (1 << 64) - 1
+
+# question, answer to show, accepted answers (normalized), position in the bank
+QuizEntry = namedtuple('QuizEntry', 'question answer accepted number')
+
+_ARTICLES = ('the ', 'a ', 'an ')
+# punctuation, except a minus sign before a number and a decimal point inside one
+_PUNCT = re.compile(r"(?P<minus>(?<!\w)[-\u2212](?=\d))|(?P<point>(?<=\d)\.(?=\d))|[^\w\s]")
+_SPACE = re.compile(r"\s+")
+
+
+def _punct(m):
+    return '-' if m['minus'] else '.' if m['point'] else ' '
+
+
+def normalize(text):
+    # what answers are compared on: case-folded, accents and punctuation dropped, single spaces,
+    # no leading article ("The Nile" == "nile"); numbers keep their sign and decimal point
+    # ("-3.5" stays "-3.5", not "3 5")
+    text = unicodedata.normalize('NFKD', text)
+    text = ''.join(c for c in text if not unicodedata.combining(c)).casefold()
+    text = _SPACE.sub(' ', _PUNCT.sub(_punct, text)).strip()
+    for article in _ARTICLES:
+        if text.startswith(article) and len(text) > len(article):
+            text = text[len(article):]
+            break
+    return text
+
+
+def answer_ok(quiz, reply):
+    # quiz: a QuizEntry, or a (question, answer) pair like QUIZ_BANK's
+    if reply is None:
+        return False
+    if len(quiz) > 2:
+        return normalize(reply) in quiz.accepted
+    return normalize(reply) == normalize(quiz[1])
+
+
+def index_path(src):
+    return src + '.idx'
+
+
+def build_index(src, idx=None):
+    # scans the source once; returns the number of questions indexed
+    idx = idx or index_path(src)
+    q_off = array('Q'); q_len = array('I'); a_off = array('I', [0])
+    blob = bytearray()
+    with open(src, 'rb') as f:
+        pos = 0
+        for raw in f:
+            line = raw.rstrip(b'\r\n')
+            text = line.decode('utf-8')
+            if text.strip() and not text.lstrip().startswith('#'):
+                fields = text.split('\t')
+                if len(fields) >= 2 and fields[0].strip() and fields[1].strip():
+                    accepted = []
+                    for a in fields[1:]:
+                        n = normalize(a)
+                        if n and n not in accepted:
+                            accepted.append(n)
+                    q_off.append(pos); q_len.append(len(line))
+                    blob += SEP.join(accepted).encode('utf-8')
+                    a_off.append(len(blob))
+            pos += len(raw)
+    st = os.stat(src)
+    tmp = idx + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, len(q_off), st.st_size, st.st_mtime_ns))
+        q_off.tofile(f); q_len.tofile(f); a_off.tofile(f)
+        f.write(blob)
+    os.replace(tmp, idx)
+    return len(q_off)
+
+
+class QuizFile:
+    def __init__(self, src, idx=None):
+        self.src = src
+        self.idx = idx or index_path(src)
+        st = os.stat(src)
+        if not self._read_index(st):
+            build_index(src, self.idx)
+            if not self._read_index(os.stat(src)):
+                raise ValueError(f"Could not index {src}")
+        if not self.count:
+            raise ValueError(f"No questions in {src}")
+        self._src_file = open(src, 'rb')
+        self._src_map = mmap.mmap(self._src_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._idx_file = open(self.idx, 'rb')
+        self._idx_map = mmap.mmap(self._idx_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _read_index(self, st):
+        # loads the offset arrays if the index exists and matches the source; False otherwise
+        try:
+            with open(self.idx, 'rb') as f:
+                magic, count, size, mtime = HEADER.unpack(f.read(HEADER.size))
+                if magic != MAGIC or size != st.st_size or mtime != st.st_mtime_ns:
+                    return False
+                self.q_off = array('Q'); self.q_len = array('I'); self.a_off = array('I')
+                self.q_off.fromfile(f, count)
+                self.q_len.fromfile(f, count)
+                self.a_off.fromfile(f, count + 1)
+                self._blob = f.tell()
+        except (OSError, EOFError, struct.error):
+            return False
+        self.count = count
+        return True
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        if not 0 <= i < self.count:
+            raise IndexError("question index out of range")
+        start = self.q_off[i]
+        fields = self._src_map[start:start + self.q_len[i]].decode('utf-8').split('\t')
+        a, b = self._blob + self.a_off[i], self._blob + self.a_off[i + 1]
+        accepted = frozenset(self._idx_map[a:b].decode('utf-8').split(SEP))
+        return QuizEntry(fields[0].strip(), fields[1].strip(), accepted, i)
+
+    def close(self):
+        self._src_map.close(); self._src_file.close()
+        self._idx_map.close(); self._idx_file.close()
+
+
+def _mix(x):
+    # splitmix64's finalizer: every input bit reaches every output bit
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & MASK64
+    return x ^ (x >> 31)
+
+
+class QuizDeck:
+    # question numbers 0..n-1 in a random order with no repeats until all n have been dealt
+    ROUNDS = 4
+
+    def __init__(self, n, rng=None):
+        self.n = n
+        self.rng = rng or random.Random()
+        # two halves of `half` bits each; 2 ** (2 * half) <= 4n, so a walk averages 4 steps at most
+        self.half = max(1, ((n - 1).bit_length() + 1) // 2)
+        self._shuffle()
+
+    def _shuffle(self):
+        self.keys = [self.rng.getrandbits(64) for _ in range(self.ROUNDS)]
+        self.dealt = 0
+
+    def _permute(self, i):
+        # one pass of the Feistel network, a bijection on 0..4 ** half - 1
+        mask = (1 << self.half) - 1
+        left, right = i >> self.half, i & mask
+        for key in self.keys:
+            left, right = right, left ^ (_mix(right ^ key) & mask)
+        return left << self.half | right
+
+    def next(self):
+        if not self.n:
+            raise IndexError("no questions to deal")
+        if self.dealt == self.n:
+            self._shuffle()
+        i = self._permute(self.dealt)
+        while i >= self.n:
+            i = self._permute(i)
+        self.dealt += 1
+        return i
+
+
+def _make_bank(path, n, seed=0):
+    # synthetic bank for benchmarking: arithmetic with the answer in digits and words as aliases
+    words = ['zero', 'one', 'two', 'three', 'four', 'five', 'six', 'seven', 'eight', 'nine', 'ten']
+    rng = random.Random(seed)
+    with open(path, 'w', encoding='utf-8', newline='\n') as f:
+        f.write("# synthetic Luck Ladder quiz bank\n")
+        for k in range(n):
+            a = rng.randint(0, 5); b = rng.randint(0, 5)
+            f.write(f"Question {k + 1}: what is {a} + {b}?\t{a + b}\t{words[a + b]}\n")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Build and check Luck Ladder quiz bank indexes")
+    sub = ap.add_subparsers(dest='cmd', required=True)
+    b = sub.add_parser('build', help="index a quiz file")
+    b.add_argument('file')
+    bench = sub.add_parser('bench', help="time opening a bank and dealing questions")
+    bench.add_argument('file', nargs='?', default='quiz_bench.tsv')
+    bench.add_argument('--make', type=int, default=None, help="first write a synthetic bank this big")
+    bench.add_argument('--deal', type=int, default=1000)
+    args = ap.parse_args()
+
+    if args.cmd == 'build':
+        start = time.perf_counter()
+        n = build_index(args.file)
+        print(f"{n} questions indexed in {time.perf_counter() - start:.2f}s -> {index_path(args.file)}")
+        return
+    if args.make:
+        _make_bank(args.file, args.make)
+    if not os.path.exists(index_path(args.file)):
+        start = time.perf_counter()
+        build_index(args.file)
+        print(f"index built in {time.perf_counter() - start:.2f}s")
+    start = time.perf_counter()
+    bank = QuizFile(args.file)
+    opened = time.perf_counter() - start
+    deck = QuizDeck(len(bank))
+    start = time.perf_counter()
+    seen = set()
+    for _ in range(args.deal):
+        i = deck.next()
+        seen.add(i)
+        entry = bank[i]
+    dealt = time.perf_counter() - start
+    print(f"{len(bank)} questions, opened in {opened * 1000:.1f} ms (index only)")
+    print(f"{args.deal} questions dealt in {dealt * 1000:.1f} ms, {len(seen)} distinct")
+    print(f"last: {entry.question} -> {entry.answer} (accepts {sorted(entry.accepted)})")
+    bank.close()
+
+
+if __name__ == "__main__":
+    main()